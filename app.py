@@ -1,22 +1,28 @@
 # In app.py
 
 import os
-from dash import dcc, html, Input, Output
+import uuid
+from dash import dcc, html, Input, Output, State, no_update
 import dash_mantine_components as dmc
 import fastf1
+from flask import jsonify
 
 from app_instance import app, server
 from pages import home, lap_comparison, race_comparison, year_analysis
+from utils.data_loader import session_cache, CACHE_DIR
+from utils.cancellation import request_generations
+from utils.figure_cache import figure_cache
 
 # Enable FastF1 cache - use /tmp for cloud deployments, local folder otherwise
-cache_dir = '/tmp/f1_cache' if os.environ.get('RENDER') else 'data/cache'
-os.makedirs(cache_dir, exist_ok=True)
-fastf1.Cache.enable_cache(cache_dir)
+os.makedirs(CACHE_DIR, exist_ok=True)
+fastf1.Cache.enable_cache(CACHE_DIR)
 
 # Define the main layout of the app wrapped in MantineProvider
 app.layout = dmc.MantineProvider(
     children=[
         dcc.Location(id='url', refresh=False),
+        # Per-tab id, so a graph request can be abandoned once the same tab sends a newer one
+        dcc.Store(id='client-id', storage_type='session'),
         html.Div(id='page-content')
     ],
     forceColorScheme="dark"
@@ -36,6 +42,19 @@ def display_page(pathname):
         # The default page is the home page
         return home.layout
 
+@app.callback(Output('client-id', 'data'),
+              Input('url', 'pathname'),
+              State('client-id', 'data'))
+def assign_client_id(pathname, client_id):
+    if client_id:
+        return no_update
+    return uuid.uuid4().hex
+
+# Cache counters (hits, loads, coalesced concurrent loads), figure cache hit rates and abandoned graph requests for monitoring
+@server.route('/cache-stats')
+def cache_stats():
+    return jsonify(sessions=session_cache.stats(), figures=figure_cache.stats(), requests=request_generations.stats())
+
 # Run the app
 if __name__ == '__main__':
     # Get port from environment variable (for Render) or default to 8050
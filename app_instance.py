@@ -1,9 +1,21 @@
 # In app_instance.py
 #print("--- PYTHON IS EXECUTING THE app_instance.py FILE ---")
+import os
+
 import dash
 import dash_bootstrap_components as dbc
+import diskcache
+
+from utils.data_loader import CACHE_DIR
+
+# Slow chart builds run as background callbacks in their own process. Job state and
+# progress live in a diskcache next to the FastF1 cache, so no broker is needed and
+# every gunicorn worker can poll any job.
+BACKGROUND_CACHE_DIR = os.path.join(CACHE_DIR, 'background')
+background_callback_manager = dash.DiskcacheManager(diskcache.Cache(BACKGROUND_CACHE_DIR))
 
 # This is the central app object that other modules will import
-app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.CYBORG])
+app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.CYBORG],
+                background_callback_manager=background_callback_manager)
 app.title = "F1 Analytics Dashboard"
 server = app.server
\ No newline at end of file
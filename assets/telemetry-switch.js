@@ -0,0 +1,29 @@
+// Switch the telemetry overlay between metrics without a server round trip.
+// The server ships every overlay metric's downsampled traces in telemetry-channels-store on Sketch.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    telemetry: {
+        switch_metric: function(metric, payload, figure, view) {
+            const noUpdate = window.dash_clientside.no_update;
+            // Delta and Track Dominance (or a stale sketch) still need the Sketch button
+            if (!payload || !figure || !view || !payload.channels[metric] || view.metric === metric) {
+                return [noUpdate, noUpdate];
+            }
+
+            const traces = payload.channels[metric];
+            const data = figure.data.map(function(trace, i) {
+                return Object.assign({}, trace, {x: traces[i].x, y: traces[i].y});
+            });
+            const layout = Object.assign({}, figure.layout, {
+                title: Object.assign({}, figure.layout.title, {text: metric + payload.title_suffix}),
+                yaxis: Object.assign({}, figure.layout.yaxis, {
+                    title: Object.assign({}, figure.layout.yaxis.title, {text: metric})
+                }),
+                // New axis ranges for the new metric
+                uirevision: payload.sketch + '-' + metric
+            });
+            // The new axis ranges drop any zoom, and with it the zoomed window
+            return [{data: data, layout: layout}, Object.assign({}, view, {metric: metric, window: null})];
+        }
+    }
+});
@@ -0,0 +1,74 @@
+# In benchmarks/bench_figures.py
+"""Build and serialization cost of the chart figures, as dicts and as validated go.Figure.
+
+Each chart is built by its page builder from a synthetic 20-car session,
+then serialized with to_json_plotly as Dash does. The go.Figure column
+wraps the same figure in plotly's graph objects, paying the per-property
+validation the builders did before they emitted plain dicts.
+Run from the repository root: python benchmarks/bench_figures.py
+"""
+
+import os
+import sys
+import time
+
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.synthetic import make_session, synthetic_team_colors
+from pages import lap_comparison, race_comparison
+from utils.data_loader import get_roster
+from utils.lap_table import build_lap_table, group_quick_laps
+from utils.lap_tensor import build_lap_tensor
+from utils.visuals import empty_figure
+
+
+REPEATS = 20
+# Keys are built from the event name, so nothing is looked up online
+RACE, YEAR = 'Synthetic Grand Prix', 2024
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    return (time.perf_counter() - start) / REPEATS, result
+
+
+def main():
+    qualifying = make_session(20, 6, 'Qualifying')
+    race = make_session(20, 30, 'Race', seed=1)
+    tensor = build_lap_tensor(qualifying)
+    quick_laps = group_quick_laps(build_lap_table(race, with_speeds=False))
+    drivers = get_roster(qualifying).abbreviations
+    colors = {abbr: info.color for abbr, info in get_roster(race).drivers.items()}
+
+    cases = {
+        'Speed all': lambda: lap_comparison.create_overlay_graph(
+            qualifying, tensor, drivers, 'Speed', RACE, YEAR, 'svg', 1)[0],
+        'Delta all': lambda: lap_comparison.create_delta_graph(
+            qualifying, tensor, drivers, RACE, YEAR, render_mode='svg')[0],
+        'Dominance 200': lambda: lap_comparison.create_track_dominance(
+            qualifying, tensor, [], RACE, YEAR, 200, 'svg'),
+        'Lap Times all': lambda: race_comparison.create_laptime_graph(
+            race, quick_laps, drivers, RACE, YEAR, colors)[0],
+        'Violin all': lambda: race_comparison.create_violin_graph(
+            race, quick_laps, drivers, RACE, YEAR, colors),
+        'Placeholder': lambda: empty_figure("Please select at least one Driver to sketch the graph."),
+    }
+
+    print(f"{'chart':15s} {'build':>9} {'dict json':>10} {'go.Figure':>10} {'size':>9}")
+    for label, build in cases.items():
+        build()
+        t_build, fig = timed(build)
+        t_json, payload = timed(lambda: to_json_plotly(fig))
+        t_validated, _ = timed(lambda: to_json_plotly(go.Figure(fig)))
+        print(f"{label:15s} {t_build * 1e3:7.2f}ms {t_json * 1e3:8.2f}ms {t_validated * 1e3:8.2f}ms "
+              f"{len(payload) / 1024:7.1f}KB")
+
+
+if __name__ == '__main__':
+    with synthetic_team_colors():
+        main()
@@ -0,0 +1,50 @@
+# In benchmarks/bench_lap_deltas.py
+"""Vectorized Delta engine against the per-driver sector correction it replaced.
+
+Run from the repository root: python benchmarks/bench_lap_deltas.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.synthetic import make_session, synthetic_team_colors
+from tests.test_lap_deltas import grid_points, reference_lap_deltas, vectorized_lap_deltas
+from utils.lap_tensor import build_lap_tensor
+from utils.telemetry import DELTA_RESOLUTIONS
+
+
+REPEATS = 20
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn(*args)
+    return (time.perf_counter() - start) / REPEATS, result
+
+
+def main():
+    tensor = build_lap_tensor(make_session(20, 6, 'Qualifying'))
+    missing = tensor.sector_times.copy()
+    missing[[2, 5], 1] = np.nan
+
+    for label, sector_times in (('all sectors', tensor.sector_times.copy()), ('2 missing S2', missing)):
+        tensor.sector_times[:] = sector_times
+        print(f"--- 20 drivers, {label} ---")
+        print(f"{'points':>7} {'old':>9} {'new':>9} {'speed-up':>9} {'max |diff|':>11}")
+        for n_points in DELTA_RESOLUTIONS:
+            # Resolutions past the grid are capped, as the Delta chart does
+            n_points = min(n_points, grid_points(tensor))
+            t_old, (_, old) = timed(reference_lap_deltas, tensor, tensor.drivers, n_points)
+            t_new, (_, new) = timed(vectorized_lap_deltas, tensor, tensor.drivers, n_points)
+            print(f"{n_points:7d} {t_old * 1e3:7.2f}ms {t_new * 1e3:7.2f}ms {t_old / t_new:8.1f}x {np.abs(old - new).max():11.1e}")
+
+
+if __name__ == '__main__':
+    with synthetic_team_colors():
+        main()
@@ -0,0 +1,52 @@
+# In benchmarks/bench_lap_telemetry.py
+"""Channel-aware lap telemetry against FastF1's Lap.get_telemetry.
+
+Extracts the fastest lap of every driver in a 20-car synthetic session.
+Run from the repository root: python benchmarks/bench_lap_telemetry.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.synthetic import make_session, synthetic_team_colors
+from utils.telemetry import get_lap_telemetry
+
+
+REPEATS = 3
+
+
+def fastest_laps(session):
+    laps = session.laps
+    return [laps.pick_drivers(abbr).pick_fastest() for abbr in session.results['Abbreviation']]
+
+
+def timed(label, extract, laps):
+    extract(laps[0])  # warm up FastF1's lazy state
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        results = [extract(lap) for lap in laps]
+    elapsed = (time.perf_counter() - start) / REPEATS
+    print(f"{label:32s} {elapsed * 1e3:8.1f} ms")
+    return results
+
+
+def main():
+    laps = fastest_laps(make_session(20, 6, 'Qualifying'))
+    full = timed('Lap.get_telemetry()', lambda lap: lap.get_telemetry(), laps)
+    position = timed('X/Y (position merge)', lambda lap: get_lap_telemetry(lap, ['X', 'Y']), laps)
+    timed('car data only (Speed)', lambda lap: get_lap_telemetry(lap, ['Speed']), laps)
+
+    # The position path must keep FastF1's merged X/Y/Distance values
+    diff = max(np.nanmax(np.abs(a[c].to_numpy(dtype=float) - b[c].to_numpy(dtype=float)))
+               for a, b in zip(full, position) for c in ('X', 'Y', 'Distance'))
+    print(f"max |diff| of X/Y/Distance against Lap.get_telemetry(): {diff:.1e}")
+
+
+if __name__ == '__main__':
+    with synthetic_team_colors():
+        main()
@@ -1,16 +1,24 @@
 # In pages/lap_comparison.py
 
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, no_update
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 from dash_iconify import DashIconify
 import fastf1
 from fastf1 import plotting
-import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
 
 from app_instance import app
+from utils.data_loader import load_session, get_event_index, get_roster, is_session_final, session_store_key, LOAD_LAPS
+from utils.cancellation import CancelToken, RequestCancelled, request_generations
+from utils.circuit import get_circuit_geometry
+from utils.figure_cache import figure_cache, figure_key
+from utils.lap_tensor import get_lap_tensor, warm_lap_tensor
+from utils.visuals import (
+    empty_figure, encode_arrays, lttb_rows, make_figure, patch_keyed_list, patched_order, teammate_dashes, use_webgl,
+    WEBGL_POINT_THRESHOLD,
+)
+from utils.telemetry import compute_lap_deltas, interp_grid_rows, DELTA_RESOLUTIONS, DEFAULT_DELTA_RESOLUTION
 
 
 # --- Flag icon mapping for Grand Prix (using Iconify flag icons) ---
@@ -126,6 +134,17 @@ navbar = dbc.NavbarSimple(
 # --- Dropdown options ---
 years = [2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025]
 metrics = ['Speed', 'Throttle', 'Brake', 'RPM', 'nGear', 'Delta', 'Track Dominance']
+# Metrics drawn as a telemetry overlay; switching between them happens in the browser after a sketch
+OVERLAY_METRICS = ['Speed', 'Throttle', 'Brake', 'RPM', 'nGear']
+
+# Track Dominance mini-sector counts offered in the UI
+MINI_SECTOR_OPTIONS = [50, 100, 150, 200]
+DEFAULT_MINI_SECTORS = 100
+# Mini-sector boundary ticks are only drawn up to this many sectors
+MAX_BOUNDARY_MARKERS = 50
+
+# Points per telemetry trace when an overlay is sketched; zooming re-sends the visible window in full
+TELEMETRY_POINT_BUDGET = 150
 
 
 # --- Page Header ---
@@ -202,6 +221,48 @@ controls = dbc.Card(
                 dbc.Col(html.Label("Metric", className="control-label"), width=12),
                 dbc.Col(dcc.Dropdown(metrics, 'Speed', id='metric-dropdown', clearable=False), width=12),
             ]),
+
+            # Delta resolution (shown when Delta is selected)
+            html.Div(id='delta-resolution-container', children=[
+                dbc.Row([
+                    dbc.Col(html.Label("Delta Resolution", className="control-label"), width=12),
+                    dbc.Col(dcc.Dropdown(
+                        options=[{'label': f"{n} points", 'value': n} for n in DELTA_RESOLUTIONS],
+                        value=DEFAULT_DELTA_RESOLUTION,
+                        id='delta-resolution-dropdown',
+                        clearable=False
+                    ), width=12),
+                ]),
+            ], style={'display': 'none'}),
+
+            # Mini-sector count (shown when Track Dominance is selected)
+            html.Div(id='mini-sectors-container', children=[
+                dbc.Row([
+                    dbc.Col(html.Label("Mini-Sectors", className="control-label"), width=12),
+                    dbc.Col(dcc.Dropdown(
+                        options=[{'label': f"{n} mini-sectors", 'value': n} for n in MINI_SECTOR_OPTIONS],
+                        value=DEFAULT_MINI_SECTORS,
+                        id='mini-sectors-dropdown',
+                        clearable=False
+                    ), width=12),
+                ]),
+            ], style={'display': 'none'}),
+
+            # Scatter rendering, remembered in the browser
+            dbc.Row([
+                dbc.Col(html.Label("Rendering", className="control-label"), width=12),
+                dbc.Col(dcc.Dropdown(
+                    options=[
+                        {'label': f"Auto (WebGL above {WEBGL_POINT_THRESHOLD} points)", 'value': 'auto'},
+                        {'label': "SVG", 'value': 'svg'},
+                        {'label': "WebGL", 'value': 'webgl'},
+                    ],
+                    value='auto',
+                    id='render-mode-dropdown',
+                    clearable=False,
+                    persistence=True
+                ), width=12),
+            ], className="mt-3"),
         ], className="control-section"),
 
         dbc.Button('Sketch Graph', id='sketch-button', n_clicks=0, color="primary", className="w-100 mt-2"),
@@ -246,8 +307,19 @@ layout = html.Div([
                     dcc.Loading(
                         id="loading-graph",
                         type="default",
+                        # Background builds report their stage under the spinner
+                        custom_spinner=html.Div([
+                            dbc.Spinner(color="light"),
+                            html.Div(id='graph-progress', className='graph-progress', style={'display': 'none'})
+                        ], className='graph-progress-spinner'),
                         children=dcc.Graph(id='telemetry-graph', style={'height': '80vh', 'display': 'none'})
-                    )
+                    ),
+                    # What the telemetry overlay currently shows, for re-fetching zoomed windows
+                    dcc.Store(id='telemetry-view-store', data=None),
+                    # Downsampled traces of every overlay metric, for switching metrics client-side
+                    dcc.Store(id='telemetry-channels-store', data=None),
+                    # Track Dominance sketch handed to its background build
+                    dcc.Store(id='dominance-job-store', data=None)
                 ])
             ], md=8)
         ])
@@ -265,8 +337,7 @@ layout = html.Div([
 def update_race_options(selected_year):
     if not selected_year:
         return [], []
-    schedule = fastf1.get_event_schedule(selected_year)
-    races = schedule['EventName'].tolist()
+    races = get_event_index(selected_year)['names']
     
     # Store race -> flag mapping for clientside injection
     options = []
@@ -385,22 +456,19 @@ def update_driver_options(selected_race, selected_year):
     if not selected_race or not selected_year:
         return [], {}
     try:
-        session = fastf1.get_session(selected_year, selected_race, 'Q')
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
+        session = load_session(selected_year, selected_race, 'Q', LOAD_LAPS)
         plotting.setup_mpl()
         
-        drivers = session.drivers
+        # Resample the fastest laps onto the distance grid before the first graph request
+        warm_lap_tensor(selected_year, selected_race, 'Q')
+        
+        roster = get_roster(session)
         driver_colors = {}
         options = []
         
-        for d in drivers:
-            driver_info = session.get_driver(d)
-            abbr = driver_info['Abbreviation']
-            full_name = driver_info['FullName']
-            team = driver_info['TeamName']
-            color = plotting.get_team_color(team, session)
-            driver_colors[abbr] = color
-            options.append({'label': full_name, 'value': abbr})
+        for abbr, info in roster.drivers.items():
+            driver_colors[abbr] = info.color
+            options.append({'label': info.full_name, 'value': abbr})
         
         # Add "All Drivers" option at the top
         all_drivers_option = {'label': '⭐ All Drivers', 'value': 'ALL_DRIVERS'}
@@ -456,6 +524,19 @@ def display_driver_tags(selected_drivers, driver_colors):
         )
     return tags
 
+@app.callback(
+    Output('delta-resolution-container', 'style'),
+    Output('mini-sectors-container', 'style'),
+    Input('metric-dropdown', 'value')
+)
+def toggle_metric_options(metric):
+    """Show the Delta resolution and Track Dominance mini-sector selectors for their metric only."""
+    shown = {'display': 'block', 'marginTop': '12px'}
+    hidden = {'display': 'none'}
+    return (shown if metric == 'Delta' else hidden,
+            shown if metric == 'Track Dominance' else hidden)
+
+
 @app.callback(
     Output('delta-modal', 'is_open'),
     Input('sketch-button', 'n_clicks'),
@@ -479,21 +560,22 @@ def toggle_delta_modal(sketch_clicks, close_clicks, drivers, metric, is_open):
     Output('telemetry-graph', 'figure'),
     Output('telemetry-graph', 'style'),
     Output('graph-empty-state', 'style'),
+    Output('telemetry-view-store', 'data'),
+    Output('telemetry-channels-store', 'data'),
+    Output('dominance-job-store', 'data'),
     Input('sketch-button', 'n_clicks'),
     State('driver-dropdown', 'value'),
     State('year-dropdown', 'value'),
     State('race-dropdown', 'value'),
-    State('metric-dropdown', 'value')
+    State('metric-dropdown', 'value'),
+    State('delta-resolution-dropdown', 'value'),
+    State('mini-sectors-dropdown', 'value'),
+    State('render-mode-dropdown', 'value'),
+    State('telemetry-view-store', 'data'),
+    State('client-id', 'data')
 )
-def update_graph(n_clicks, drivers, year, race, metric):
-    empty_layout = dict(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        yaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        font=dict(color='white')
-    )
-    
+def update_graph(n_clicks, drivers, year, race, metric, delta_resolution=DEFAULT_DELTA_RESOLUTION,
+                 mini_sectors=DEFAULT_MINI_SECTORS, render_mode='auto', plotted_view=None, client_id=None):
     # Styles for showing/hiding
     graph_hidden = {'height': '80vh', 'display': 'none'}
     graph_visible = {'height': '80vh', 'display': 'block'}
@@ -501,454 +583,465 @@ def update_graph(n_clicks, drivers, year, race, metric):
     empty_visible = {}
     
     if n_clicks is None or n_clicks == 0:
-        fig = go.Figure()
-        fig.update_layout(title="", **empty_layout)
-        return fig, graph_hidden, empty_visible
+        return empty_figure(), graph_hidden, empty_visible, None, None, no_update
     if not race or not year:
-        fig = go.Figure()
-        fig.update_layout(title="Please select Year and Race to sketch the graph.", **empty_layout)
-        return fig, graph_visible, empty_hidden
+        return empty_figure("Please select Year and Race to sketch the graph."), graph_visible, empty_hidden, None, None, no_update
     
     # For non-Track Dominance metrics, require at least one driver
     if metric != 'Track Dominance' and (not drivers or len(drivers) == 0):
-        fig = go.Figure()
-        fig.update_layout(title="Please select at least one Driver to sketch the graph.", **empty_layout)
-        return fig, graph_visible, empty_hidden
+        return empty_figure("Please select at least one Driver to sketch the graph."), graph_visible, empty_hidden, None, None, no_update
     
     # Check for Delta with insufficient drivers
     if metric == 'Delta' and len(drivers) < 2:
-        fig = go.Figure()
-        fig.update_layout(title="Please select two or more drivers for Delta comparison.", **empty_layout)
-        return fig, graph_visible, empty_hidden
+        return empty_figure("Please select two or more drivers for Delta comparison."), graph_visible, empty_hidden, None, None, no_update
     
-    # Track Dominance can work with no selection (uses all drivers)
+    drivers = drivers or []
+    delta_resolution = delta_resolution or DEFAULT_DELTA_RESOLUTION
+    mini_sectors = mini_sectors or DEFAULT_MINI_SECTORS
+    key = figure_key('lap-comparison', year, race, 'Q', drivers, metric, render_mode=render_mode,
+                     delta_resolution=delta_resolution if metric == 'Delta' else None,
+                     mini_sectors=mini_sectors if metric == 'Track Dominance' else None)
     
+    # A sketch that only changes the drivers of the plotted chart is patched instead
+    chart = _chart(year, race, metric, render_mode, delta_resolution)
+    patchable = plotted_view is not None and plotted_view.get('chart') == chart and plotted_view.get('metric') == metric
+    cached = None if patchable else figure_cache.get(key)
+    if cached is not None:
+        fig, view, channels = cached
+        if channels is not None:
+            # Fresh axis ranges for this sketch, as a rebuilt figure would have
+            fig['layout']['uirevision'] = n_clicks
+            channels['sketch'] = n_clicks
+        return fig, graph_visible, empty_hidden, view, channels, no_update
+    
+    # Track Dominance can work with no selection (uses all drivers); it is built in the background
+    if metric == 'Track Dominance':
+        job = {'sketch': n_clicks, 'drivers': drivers, 'year': year, 'race': race,
+               'mini_sectors': mini_sectors, 'render_mode': render_mode, 'key': key}
+        return no_update, graph_visible, empty_hidden, None, None, job
+    
+    # A newer sketch from this tab makes this one stale
+    token = request_generations.start(client_id, 'lap-comparison')
     try:
-        session = fastf1.get_session(year, race, 'Q')
-        session.load(laps=True, telemetry=True, weather=True, messages=True)
+        session = load_session(year, race, 'Q', LOAD_LAPS)
+        token.check()
+        tensor = get_lap_tensor(year, race, 'Q')
+        token.check()
         plotting.setup_mpl()
-        fig = go.Figure()
         
         # Handle Delta metric separately
         if metric == 'Delta':
-            result = create_delta_graph(session, drivers, race, year, empty_layout)
-            return result, graph_visible, empty_hidden
-        
-        # Handle Track Dominance separately
-        if metric == 'Track Dominance':
-            result = create_track_dominance(session, drivers, race, year, empty_layout)
-            return result, graph_visible, empty_hidden
+            result, view = create_delta_graph(session, tensor, drivers, race, year,
+                                              delta_resolution, render_mode, plotted_view, token)
+            channels = None
+        else:
+            result, view, channels = create_overlay_graph(session, tensor, drivers, metric, race, year,
+                                                          render_mode, n_clicks, plotted_view, token)
         
-        team_color_used_solid = {}
-        for d_abbr in drivers:
-            driver_data = session.get_driver(d_abbr)
-            if driver_data is None: continue
-            team = driver_data['TeamName']
-            color = plotting.get_team_color(team, session)
-            laps = session.laps.pick_drivers(d_abbr)
-            if laps.empty: continue
-            fastest = laps.pick_fastest()
-            if fastest.empty: continue
-            telemetry = fastest.get_telemetry()
-            if metric not in telemetry.columns: continue
-            line_dash = 'solid'
-            if team in team_color_used_solid: line_dash = 'dash'
-            else: team_color_used_solid[team] = True
-            fig.add_trace(go.Scatter(
-                x=telemetry['Distance'],
-                y=telemetry[metric],
-                mode='lines',
-                name=f"{d_abbr} ({team})",
-                line=dict(color=color, dash=line_dash, width=2)
-            ))
-        fig.update_layout(
-            title=dict(
-                text=f"{metric} Comparison - {race} {year}",
-                font=dict(color='white', size=20)
-            ),
-            xaxis_title='Distance (m)',
-            yaxis_title=metric,
-            legend_title="Driver (Team)",
-            showlegend=True,
-            # Transparent background
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            # White axes
-            xaxis=dict(
-                color='white',
-                gridcolor='rgba(255,255,255,0.1)',
-                linecolor='white',
-                tickfont=dict(color='white'),
-                title_font=dict(color='white')
-            ),
-            yaxis=dict(
-                color='white',
-                gridcolor='rgba(255,255,255,0.1)',
-                linecolor='white',
-                tickfont=dict(color='white'),
-                title_font=dict(color='white')
-            ),
-            # White legend text
-            legend=dict(
-                font=dict(color='white'),
-                title_font=dict(color='white')
-            )
-        )
-        return fig, graph_visible, empty_hidden
+        # Live sessions keep changing, so only figures of finished sessions are cached
+        if not isinstance(result, Patch) and is_session_final(session):
+            figure_cache.put(key, (result, view, channels))
+        return result, graph_visible, empty_hidden, view, channels, no_update
+    except RequestCancelled:
+        # The browser discards this response anyway
+        return no_update, no_update, no_update, no_update, no_update, no_update
     except Exception as e:
         print(f"Error generating graph: {e}")
-        fig = go.Figure()
-        fig.update_layout(
-            title=f"Error sketching graph: {e}",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white')
-        )
-        return fig, graph_visible, empty_hidden
+        return empty_figure(f"Error sketching graph: {e}"), graph_visible, empty_hidden, None, None, no_update
 
 
-def create_delta_graph(session, drivers, race, year, empty_layout):
-    """Create a delta time comparison graph with sector-based corrections."""
-    fig = go.Figure()
-    
-    # Collect telemetry data and sector times for all drivers
-    driver_telemetry = {}
-    driver_laptimes = {}
-    driver_sector_times = {}  # Cumulative sector times
-    driver_laps = {}  # Store the lap object for sector info
-    team_color_used_solid = {}
-    
-    for d_abbr in drivers:
-        driver_data = session.get_driver(d_abbr)
-        if driver_data is None:
-            continue
-        laps = session.laps.pick_drivers(d_abbr)
-        if laps.empty:
-            continue
-        fastest = laps.pick_fastest()
-        if fastest.empty:
-            continue
-        
-        telemetry = fastest.get_telemetry()
-        if telemetry.empty:
-            continue
-        
-        # Store telemetry and lap time
-        driver_telemetry[d_abbr] = telemetry
-        driver_laptimes[d_abbr] = fastest['LapTime'].total_seconds()
-        driver_laps[d_abbr] = fastest
-        
-        # Get sector times (cumulative)
-        try:
-            s1 = fastest['Sector1Time'].total_seconds() if pd.notna(fastest['Sector1Time']) else None
-            s2 = fastest['Sector2Time'].total_seconds() if pd.notna(fastest['Sector2Time']) else None
-            s3 = fastest['Sector3Time'].total_seconds() if pd.notna(fastest['Sector3Time']) else None
-            
-            if s1 and s2 and s3:
-                driver_sector_times[d_abbr] = {
-                    'S1': s1,           # Cumulative time at end of S1
-                    'S2': s1 + s2,      # Cumulative time at end of S2
-                    'S3': s1 + s2 + s3  # Cumulative time at end of S3 (lap time)
-                }
-            else:
-                driver_sector_times[d_abbr] = None
-        except:
-            driver_sector_times[d_abbr] = None
-    
-    if len(driver_telemetry) < 2:
-        fig.update_layout(title="Not enough valid telemetry data for Delta comparison.", **empty_layout)
-        return fig
-    
-    # Find the fastest driver (reference)
-    fastest_driver = min(driver_laptimes, key=driver_laptimes.get)
-    ref_telemetry = driver_telemetry[fastest_driver]
-    ref_sectors = driver_sector_times.get(fastest_driver)
-    
-    # Create common distance array for interpolation
-    max_distance = min(tel['Distance'].max() for tel in driver_telemetry.values())
-    common_distance = np.linspace(0, max_distance, 500)
-    
-    # Calculate reference time at each distance point
-    ref_time = np.interp(common_distance, ref_telemetry['Distance'], ref_telemetry['Time'].dt.total_seconds())
-    
-    # Find sector boundary distances from reference telemetry
-    sector_distances = {}
-    if ref_sectors:
-        ref_times_array = ref_telemetry['Time'].dt.total_seconds().values
-        ref_dist_array = ref_telemetry['Distance'].values
-        
-        for sector_name, sector_time in ref_sectors.items():
-            # Find the distance where cumulative time equals sector time
-            idx = np.searchsorted(ref_times_array, sector_time)
-            if idx < len(ref_dist_array):
-                sector_distances[sector_name] = ref_dist_array[min(idx, len(ref_dist_array)-1)]
+@app.callback(
+    Output('telemetry-graph', 'figure', allow_duplicate=True),
+    Input('dominance-job-store', 'data'),
+    background=True,
+    progress=Output('graph-progress', 'children'),
+    running=[(Output('graph-progress', 'style'), {'display': 'block'}, {'display': 'none'})],
+    # A new selection makes the running build useless
+    cancel=[
+        Input('year-dropdown', 'value'),
+        Input('race-dropdown', 'value'),
+        Input('driver-dropdown', 'value'),
+        Input('metric-dropdown', 'value'),
+    ],
+    prevent_initial_call=True
+)
+def build_dominance_graph(set_progress, job):
+    """Build a Track Dominance sketch as a background job, reporting each stage."""
+    if not job:
+        return no_update
+    try:
+        set_progress("Loading session...")
+        session = load_session(job['year'], job['race'], 'Q', LOAD_LAPS)
+        set_progress("Extracting telemetry...")
+        tensor = get_lap_tensor(job['year'], job['race'], 'Q')
+        plotting.setup_mpl()
+        set_progress("Building figure...")
+        result = create_track_dominance(session, tensor, job['drivers'], job['race'], job['year'],
+                                        job['mini_sectors'], job['render_mode'])
+        if is_session_final(session):
+            figure_cache.put(job['key'], (result, None, None))
+        return result
+    except Exception as e:
+        print(f"Error generating track dominance graph: {e}")
+        return empty_figure(f"Error sketching graph: {e}")
+
+
+# --- Incremental updates ---
+# The view store records what the graph plots. When a sketch only changes the drivers
+# of the chart already shown, the graph is patched: removed drivers' traces are
+# deleted and only the added drivers are computed and sent.
+
+def _chart(year, race, metric, render_mode, delta_resolution):
+    """What a plotted chart shows apart from its drivers, for telling whether it can be patched."""
+    chart = {'year': year, 'race': race, 'render_mode': render_mode}
+    if metric == 'Delta':
+        chart['n_points'] = delta_resolution
+    return chart
+
+
+def _can_patch(plotted_view, view):
+    """Whether the plotted chart differs from `view` in its drivers only."""
+    return (plotted_view is not None and bool(plotted_view.get('drivers'))
+            and all(plotted_view.get(key) == view[key] for key in ('chart', 'metric', 'webgl')))
+
+
+def _driver_trace(d_abbr, driver_info, x, y, dash, webgl=False):
+    """Line trace of one driver in their team color, dashed for the second driver of a team."""
+    return dict(
+        type='scattergl' if webgl else 'scatter',
+        x=x,
+        y=y,
+        mode='lines',
+        name=f"{d_abbr} ({driver_info.team})",
+        line=dict(color=driver_info.color, dash=dash, width=2)
+    )
+
+
+def _patch_dashes(patched, plotted_view, order, dashes):
+    """Restyle kept traces whose teammate dash changed (a team's solid driver was removed)."""
+    old_dashes = dict(zip(plotted_view['drivers'], plotted_view['dashes']))
+    for i, (d_abbr, dash) in enumerate(zip(order, dashes)):
+        if old_dashes.get(d_abbr, dash) != dash:
+            patched['data'][i]['line']['dash'] = dash
+
+
+def create_overlay_graph(session, tensor, drivers, metric, race, year, render_mode, sketch, plotted_view=None,
+                         token=None):
+    """Telemetry overlay of one metric, as (figure, view, channels).
+
+    When `plotted_view` is the same overlay with other drivers, the figure
+    and channels are Patches of the plotted ones. `token` (a CancelToken) is
+    checked between stages; all drivers are downsampled in one batch.
+    """
+    token = token or CancelToken()
+    roster = get_roster(session)
+    plotted = [d for d in drivers if roster.get(d) is not None and d in tensor]
+    # Every trace is downsampled to at most TELEMETRY_POINT_BUDGET points
+    n_points = int(np.minimum(tensor.last_index(tensor.rows(plotted)) + 1, TELEMETRY_POINT_BUDGET).sum())
+    webgl = use_webgl(n_points, render_mode)
+    # 'metric' is kept up to date by the client-side metric switch
+    view = {'chart': _chart(year, race, metric, render_mode, None),
+            'webgl': webgl, 'year': year, 'race': race, 'metric': metric}
     
-    # Plot delta for each driver
-    for d_abbr in drivers:
-        if d_abbr not in driver_telemetry:
-            continue
-            
-        driver_data = session.get_driver(d_abbr)
-        team = driver_data['TeamName']
-        color = plotting.get_team_color(team, session)
+    if _can_patch(plotted_view, view):
+        order = patched_order(plotted_view['drivers'], plotted)
+        added = [d for d in plotted if d not in plotted_view['drivers']]
+        dashes = teammate_dashes([roster.get(d).team for d in order])
+        added_dashes = dashes[len(order) - len(added):]
         
-        tel = driver_telemetry[d_abbr]
-        driver_time = np.interp(common_distance, tel['Distance'], tel['Time'].dt.total_seconds())
-        
-        # Calculate raw delta from telemetry
-        raw_delta = ref_time - driver_time
-        
-        # Get driver's sector times for correction
-        drv_sectors = driver_sector_times.get(d_abbr)
-        
-        # Apply sector-based corrections if we have sector data for both drivers
-        if ref_sectors and drv_sectors and sector_distances:
-            delta = apply_sector_corrections(
-                raw_delta, common_distance, 
-                ref_sectors, drv_sectors, sector_distances,
-                driver_laptimes[d_abbr], driver_laptimes[fastest_driver]
-            )
-        else:
-            # Fallback to simple linear correction
-            expected_final_delta = driver_laptimes[d_abbr] - driver_laptimes[fastest_driver]
-            current_final_delta = raw_delta[-1] if len(raw_delta) > 0 else 0
-            correction_needed = expected_final_delta - current_final_delta
-            correction = np.linspace(0, correction_needed, len(common_distance))
-            delta = raw_delta + correction
-        
-        line_dash = 'solid'
-        if team in team_color_used_solid:
-            line_dash = 'dash'
-        else:
-            team_color_used_solid[team] = True
+        points = channel_points(tensor, added, OVERLAY_METRICS)
+        # While zoomed in, added drivers match the refined traces of the kept ones
+        window = plotted_view.get('window')
+        trace_points = points[metric] if window is None else overlay_points(tensor, added, metric, window)
+        token.check()
+        patched = Patch()
+        traces = [
+            encode_arrays(_driver_trace(d_abbr, roster.get(d_abbr), distance, values, dash, webgl))
+            for d_abbr, dash, (distance, values) in zip(added, added_dashes, trace_points)
+        ]
+        patch_keyed_list(patched['data'], plotted_view['drivers'], plotted, traces)
+        _patch_dashes(patched, plotted_view, order, dashes)
         
-        fig.add_trace(go.Scatter(
-            x=common_distance,
-            y=delta,
-            mode='lines',
-            name=f"{d_abbr} ({team})",
-            line=dict(color=color, dash=line_dash, width=2)
-        ))
-    
-    # Add vertical lines for sector boundaries
-    if sector_distances:
-        if 'S1' in sector_distances:
-            fig.add_vline(
-                x=sector_distances['S1'],
-                line=dict(color='rgba(255,255,255,0.4)', width=1, dash='dash'),
-                annotation_text="S1",
-                annotation_position="top",
-                annotation_font=dict(color='white', size=12)
-            )
-        if 'S2' in sector_distances:
-            fig.add_vline(
-                x=sector_distances['S2'],
-                line=dict(color='rgba(255,255,255,0.4)', width=1, dash='dash'),
-                annotation_text="S2",
-                annotation_position="top",
-                annotation_font=dict(color='white', size=12)
-            )
+        channels = Patch()
+        for channel, entries in overlay_channel_entries(points).items():
+            patch_keyed_list(channels['channels'][channel], plotted_view['drivers'], plotted, entries)
+        return patched, dict(view, drivers=order, dashes=dashes, window=window), channels
     
-    fig.update_layout(
-        title=dict(
-            text=f"Delta Comparison - {race} {year} (Reference: {fastest_driver})",
-            font=dict(color='white', size=20)
-        ),
+    points = channel_points(tensor, plotted, OVERLAY_METRICS)
+    token.check()
+    dashes = teammate_dashes([roster.get(d).team for d in plotted])
+    traces = [
+        _driver_trace(d_abbr, roster.get(d_abbr), distance, values, dash)
+        for d_abbr, dash, (distance, values) in zip(plotted, dashes, points[metric])
+    ]
+    fig = make_figure(
+        traces,
+        f"{metric} Comparison - {race} {year}",
         xaxis_title='Distance (m)',
-        yaxis_title='Delta Time (s)',
+        yaxis_title=metric,
         legend_title="Driver (Team)",
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        ),
-        yaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white'),
-            zeroline=True,
-            zerolinecolor='rgba(255,255,255,0.5)',
-            zerolinewidth=2
-        ),
-        legend=dict(
-            font=dict(color='white'),
-            title_font=dict(color='white')
-        )
+        render_mode='webgl' if webgl else 'svg',
+        # Keep the user's zoom while zoomed windows are patched in
+        uirevision=sketch
     )
-    
-    return fig
+    return fig, dict(view, drivers=plotted, dashes=dashes), overlay_channels(points, race, year, sketch)
+
 
+def channel_points(tensor, drivers, metrics, window=None):
+    """{metric: [(distance, values) of each driver]}, LTTB-downsampled to TELEMETRY_POINT_BUDGET.
 
-def apply_sector_corrections(raw_delta, common_distance, ref_sectors, drv_sectors, sector_distances, drv_laptime, ref_laptime):
+    Every metric and driver is downsampled in one batched sweep. Inside
+    `window` (a distance range) every grid point is kept, plus one on each
+    side so the line runs to the plot edges.
     """
-    Apply piecewise linear corrections based on sector times.
-    Corrects delta at each sector boundary to match official sector time differences.
+    rows = tensor.rows(drivers)
+    lengths = np.tile(tensor.last_index(rows) + 1, len(metrics))
+    if len(rows) == 0:
+        return {metric: [] for metric in metrics}
+    values = np.concatenate([tensor.channel(metric, rows) for metric in metrics])
+    points = []
+    for row_values, n, indices in zip(values, lengths, lttb_rows(tensor.distance, values, lengths, TELEMETRY_POINT_BUDGET)):
+        if window is not None:
+            lo, hi = np.searchsorted(tensor.distance[:n], window)
+            indices = np.union1d(indices, np.arange(max(lo - 1, 0), min(hi + 1, n)))
+        points.append((tensor.distance[indices], row_values[indices]))
+    return {metric: points[i * len(rows):(i + 1) * len(rows)] for i, metric in enumerate(metrics)}
+
+
+def overlay_points(tensor, drivers, metric, window=None):
+    """(distance, values) of each driver's metric trace; see channel_points."""
+    return channel_points(tensor, drivers, [metric], window)[metric]
+
+
+def overlay_channel_entries(points):
+    """Store entries of every overlay metric from channel_points: {metric: [{'x', 'y'} per driver]}.
+
+    Arrays are sent as plotly.js typed arrays, with distances as whole
+    metres in int16, so the browser can drop them into the figure as-is.
     """
-    delta = raw_delta.copy()
-    n_points = len(common_distance)
-    max_dist = common_distance[-1]
-    
-    # Define correction points: start, S1 end, S2 end, S3 end (lap end)
-    # Expected delta at each point based on official times
-    correction_points = [
-        (0, 0),  # Start of lap: delta = 0
-    ]
+    return {
+        channel: [encode_arrays({'x': np.round(distance).astype(np.int16), 'y': values})
+                  for distance, values in points[channel]]
+        for channel in OVERLAY_METRICS
+    }
+
+
+def overlay_channels(points, race, year, sketch):
+    """Contents of the telemetry-channels-store for an overlay sketch."""
+    return {'sketch': sketch, 'title_suffix': f" Comparison - {race} {year}",
+            'channels': overlay_channel_entries(points)}
+
+
+# Switching between overlay metrics after a sketch swaps the traces in the browser (assets/telemetry-switch.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='telemetry', function_name='switch_metric'),
+    Output('telemetry-graph', 'figure', allow_duplicate=True),
+    Output('telemetry-view-store', 'data', allow_duplicate=True),
+    Input('metric-dropdown', 'value'),
+    State('telemetry-channels-store', 'data'),
+    State('telemetry-graph', 'figure'),
+    State('telemetry-view-store', 'data'),
+    prevent_initial_call=True
+)
+
+
+@app.callback(
+    Output('telemetry-graph', 'figure', allow_duplicate=True),
+    Output('telemetry-view-store', 'data', allow_duplicate=True),
+    Input('telemetry-graph', 'relayoutData'),
+    State('telemetry-view-store', 'data'),
+    prevent_initial_call=True
+)
+def refine_zoomed_traces(relayout_data, view):
+    """Patch the overlay traces to full resolution inside the zoomed distance window.
+
+    The window is recorded in the view store, so drivers added to the zoomed
+    overlay are refined the same way.
+    """
+    if not view or not relayout_data or view['metric'] not in OVERLAY_METRICS:
+        return no_update, no_update
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        window = sorted((float(relayout_data['xaxis.range[0]']), float(relayout_data['xaxis.range[1]'])))
+    elif 'xaxis.range' in relayout_data:
+        window = sorted(float(v) for v in relayout_data['xaxis.range'])
+    elif relayout_data.get('xaxis.autorange'):
+        # Zoomed back out: return to the downsampled traces
+        window = None
+    else:
+        return no_update, no_update
     
-    # S1 boundary
-    if 'S1' in sector_distances and 'S1' in drv_sectors and 'S1' in ref_sectors:
-        s1_dist = sector_distances['S1']
-        expected_s1_delta = drv_sectors['S1'] - ref_sectors['S1']
-        correction_points.append((s1_dist, expected_s1_delta))
+    try:
+        tensor = get_lap_tensor(view['year'], view['race'], 'Q')
+        points = overlay_points(tensor, view['drivers'], view['metric'], window)
+    except Exception as e:
+        print(f"Error refining zoomed graph: {e}")
+        return no_update, no_update
     
-    # S2 boundary
-    if 'S2' in sector_distances and 'S2' in drv_sectors and 'S2' in ref_sectors:
-        s2_dist = sector_distances['S2']
-        expected_s2_delta = drv_sectors['S2'] - ref_sectors['S2']
-        correction_points.append((s2_dist, expected_s2_delta))
+    patched = Patch()
+    for i, (distance, values) in enumerate(points):
+        patched['data'][i].update(encode_arrays({'x': distance, 'y': values}))
+    patched_view = Patch()
+    patched_view['window'] = window
+    return patched, patched_view
+
+
+def _sector_markers(sector_distances):
+    """Dashed vertical lines and labels at the S1 and S2 boundaries of the reference lap."""
+    shapes, annotations = [], []
+    for sector in ('S1', 'S2'):
+        if sector not in sector_distances:
+            continue
+        shapes.append(dict(
+            type='line', xref='x', yref='y domain',
+            x0=sector_distances[sector], x1=sector_distances[sector], y0=0, y1=1,
+            line=dict(color='rgba(255,255,255,0.4)', width=1, dash='dash')
+        ))
+        annotations.append(dict(
+            x=sector_distances[sector], xref='x', y=1, yref='y domain',
+            xanchor='center', yanchor='bottom', showarrow=False,
+            text=sector, font=dict(color='white', size=12)
+        ))
+    return shapes, annotations
+
+
+def create_delta_graph(session, tensor, drivers, race, year, n_points=DEFAULT_DELTA_RESOLUTION, render_mode='auto',
+                       plotted_view=None, token=None):
+    """Create a delta time comparison graph with sector-based corrections, as (figure, view).
+
+    When `plotted_view` is the same Delta chart with other drivers, the figure
+    is a Patch of the plotted one. Kept drivers are only recomputed and re-sent
+    when the reference (fastest) driver or the common distance grid changes.
+    `token` (a CancelToken) is checked between stages.
+    """
+    token = token or CancelToken()
+    roster = get_roster(session)
     
-    # End of lap (S3)
-    expected_final_delta = drv_laptime - ref_laptime
-    correction_points.append((max_dist, expected_final_delta))
+    # Drivers with a timed fastest lap in the lap tensor
+    delta_drivers = []
+    for d_abbr in drivers:
+        if roster.get(d_abbr) is None or d_abbr not in tensor:
+            continue
+        if np.isnan(tensor.lap_time[tensor.rows([d_abbr])[0]]):
+            continue
+        delta_drivers.append(d_abbr)
     
-    # Sort by distance
-    correction_points.sort(key=lambda x: x[0])
+    if len(delta_drivers) < 2:
+        return empty_figure("Not enough valid telemetry data for Delta comparison."), None
     
-    # Find raw delta values at correction points
-    raw_at_points = []
-    for dist, _ in correction_points:
-        idx = np.searchsorted(common_distance, dist)
-        idx = min(idx, n_points - 1)
-        raw_at_points.append(raw_delta[idx])
+    # The fastest driver is the reference; the grid runs to the end of the shortest lap
+    rows = tensor.rows(delta_drivers)
+    fastest_driver = delta_drivers[int(np.argmin(tensor.lap_time[rows]))]
+    shortest_driver = delta_drivers[int(np.argmin(tensor.last_index(rows)))]
+    webgl = use_webgl(n_points * len(delta_drivers), render_mode)
+    view = {'chart': _chart(year, race, 'Delta', render_mode, n_points),
+            'webgl': webgl, 'year': year, 'race': race, 'metric': 'Delta',
+            'reference': fastest_driver, 'shortest': shortest_driver}
     
-    # Calculate corrections needed at each point
-    corrections_at_points = []
-    for i, (dist, expected) in enumerate(correction_points):
-        correction = expected - raw_at_points[i]
-        corrections_at_points.append((dist, correction))
+    patch = _can_patch(plotted_view, view)
+    if patch:
+        order = patched_order(plotted_view['drivers'], delta_drivers)
+        added = [d for d in delta_drivers if d not in plotted_view['drivers']]
+        # Kept deltas only change with the reference lap or the grid
+        refresh = (plotted_view['reference'], plotted_view['shortest']) != (fastest_driver, shortest_driver)
+        computed = order if refresh else list(dict.fromkeys([fastest_driver, shortest_driver] + added))
+    else:
+        order = computed = delta_drivers
     
-    # Apply piecewise linear correction
-    correction_array = np.zeros(n_points)
-    for i in range(len(corrections_at_points) - 1):
-        dist_start, corr_start = corrections_at_points[i]
-        dist_end, corr_end = corrections_at_points[i + 1]
-        
-        # Find indices for this segment
-        idx_start = np.searchsorted(common_distance, dist_start)
-        idx_end = np.searchsorted(common_distance, dist_end)
-        
-        if idx_end > idx_start:
-            # Linear interpolation of correction within this segment
-            segment_correction = np.linspace(corr_start, corr_end, idx_end - idx_start)
-            correction_array[idx_start:idx_end] = segment_correction
+    # Compute the deltas to the reference in one pass
+    rows = tensor.rows(computed)
+    lap_times = tensor.lap_time[rows]
+    common_distance, deltas, sector_distances = compute_lap_deltas(
+        tensor.step, tensor.channel('Time', rows), tensor.lap_distance[rows],
+        lap_times, tensor.sector_times[rows], computed.index(fastest_driver), n_points
+    )
+    token.check()
+    deltas = dict(zip(computed, deltas))
+    dashes = teammate_dashes([roster.get(d).team for d in order])
+    title = f"Delta Comparison - {race} {year} (Reference: {fastest_driver})"
+    shapes, annotations = _sector_markers(sector_distances)
+    view = dict(view, drivers=order, dashes=dashes)
     
-    # Handle the last point
-    if len(corrections_at_points) > 0:
-        correction_array[-1] = corrections_at_points[-1][1]
+    if patch:
+        patched = Patch()
+        n_kept = len(order) - len(added)
+        traces = [
+            encode_arrays(_driver_trace(d_abbr, roster.get(d_abbr), common_distance, deltas[d_abbr], dash, webgl))
+            for d_abbr, dash in zip(added, dashes[n_kept:])
+        ]
+        patch_keyed_list(patched['data'], plotted_view['drivers'], delta_drivers, traces)
+        _patch_dashes(patched, plotted_view, order, dashes)
+        if refresh:
+            for i, d_abbr in enumerate(order[:n_kept]):
+                patched['data'][i].update(encode_arrays({'x': common_distance, 'y': deltas[d_abbr]}))
+            patched['layout']['title']['text'] = title
+            patched['layout']['shapes'] = shapes
+            patched['layout']['annotations'] = annotations
+        return patched, view
     
-    delta = raw_delta + correction_array
-    return delta
+    # Plot delta for each driver
+    traces = [
+        _driver_trace(d_abbr, roster.get(d_abbr), common_distance, deltas[d_abbr], dash)
+        for d_abbr, dash in zip(order, dashes)
+    ]
+    fig = make_figure(
+        traces,
+        title,
+        xaxis_title='Distance (m)',
+        yaxis_title='Delta Time (s)',
+        legend_title="Driver (Team)",
+        render_mode='webgl' if webgl else 'svg',
+        yaxis=dict(zeroline=True, zerolinecolor='rgba(255,255,255,0.5)', zerolinewidth=2),
+        shapes=shapes,
+        annotations=annotations
+    )
+    return fig, view
 
 
-def create_track_dominance(session, drivers, race, year, empty_layout):
+def create_track_dominance(session, tensor, drivers, race, year, num_sectors=DEFAULT_MINI_SECTORS, render_mode='auto'):
     """Create a track dominance visualization showing which driver was fastest in each mini-sector."""
-    fig = go.Figure()
-    
-    NUM_SECTORS = 10  # Number of mini-sectors
+    roster = get_roster(session)
     
     # If no drivers selected, use all drivers from the session
     if not drivers or len(drivers) == 0:
-        all_driver_nums = session.drivers
-        drivers = [session.get_driver(d)['Abbreviation'] for d in all_driver_nums]
-    
-    # Collect data for all drivers
-    driver_data = {}
+        drivers = roster.abbreviations
     
+    # Drivers with position data in the lap tensor
+    dominance_drivers = []
     for d_abbr in drivers:
-        drv_info = session.get_driver(d_abbr)
-        if drv_info is None:
-            continue
-        
-        laps = session.laps.pick_drivers(d_abbr)
-        if laps.empty:
+        if roster.get(d_abbr) is None or d_abbr not in tensor:
             continue
-        
-        fastest = laps.pick_fastest()
-        if fastest.empty:
-            continue
-        
-        telemetry = fastest.get_telemetry()
-        if telemetry.empty or 'X' not in telemetry.columns or 'Y' not in telemetry.columns:
+        _, x_values = tensor.driver_channel(d_abbr, 'X')
+        if np.all(np.isnan(x_values)):
             continue
-        
-        team = drv_info['TeamName']
-        color = plotting.get_team_color(team, session)
-        
-        driver_data[d_abbr] = {
-            'telemetry': telemetry,
-            'color': color,
-            'team': team,
-            'fastest': fastest,
-            'laptime': fastest['LapTime'].total_seconds()
-        }
-    
-    if len(driver_data) < 2:
-        fig.update_layout(title="Not enough valid data for Track Dominance.", **empty_layout)
-        return fig
+        dominance_drivers.append(d_abbr)
     
-    # Use the first driver's telemetry as reference for track shape
-    ref_driver = list(driver_data.keys())[0]
-    ref_tel = driver_data[ref_driver]['telemetry']
+    if len(dominance_drivers) < 2:
+        return empty_figure("Not enough valid data for Track Dominance.")
     
-    # Get X, Y coordinates and distance
-    x_coords = ref_tel['X'].values
-    y_coords = ref_tel['Y'].values
-    distances = ref_tel['Distance'].values
-    ref_times = ref_tel['Time'].dt.total_seconds().values
+    # Track shape and mini-sector layout come from the circuit's cached geometry
+    geometry = get_circuit_geometry(session, tensor, session_store_key(year, race, 'Q'))
+    if geometry is None:
+        return empty_figure("Not enough valid data for Track Dominance.")
+    x_coords, y_coords = geometry.x, geometry.y
+    sector_indices = geometry.mini_sectors(num_sectors)
     
-    max_distance = distances[-1]
+    # Mini-sectors split each lap into equal fractions of the selected drivers' typical lap distance
+    rows = tensor.rows(dominance_drivers)
+    sector_boundaries = np.linspace(0, np.median(tensor.lap_distance[rows]), num_sectors + 1)
     
-    # Create mini-sector boundaries based on distance
-    sector_boundaries = np.linspace(0, max_distance, NUM_SECTORS + 1)
+    # Time at each sector boundary for every driver (drivers x boundaries), then per-sector times
+    boundary_times = interp_grid_rows(tensor.step, tensor.channel('Time', rows), sector_boundaries, tensor.last_index(rows))
+    sector_times = np.diff(boundary_times, axis=1)
     
-    # Find index for each sector boundary
-    sector_indices = []
-    for dist in sector_boundaries:
-        idx = np.searchsorted(distances, dist)
-        idx = min(idx, len(x_coords) - 1)
-        sector_indices.append(idx)
-    
-    # Calculate time at each sector boundary for each driver
-    driver_sector_times = {}
-    for d_abbr, data in driver_data.items():
-        tel = data['telemetry']
-        tel_distances = tel['Distance'].values
-        tel_times = tel['Time'].dt.total_seconds().values
-        
-        # Interpolate time at each sector boundary
-        times_at_boundaries = np.interp(sector_boundaries, tel_distances, tel_times)
-        driver_sector_times[d_abbr] = times_at_boundaries
-    
-    # Determine winner for each mini-sector
-    sector_winners = []
-    for i in range(NUM_SECTORS):
-        best_time = float('inf')
-        winner = None
-        for d_abbr, times in driver_sector_times.items():
-            sector_time = times[i + 1] - times[i]  # Time for this sector
-            if sector_time < best_time:
-                best_time = sector_time
-                winner = d_abbr
-        sector_winners.append({'winner': winner, 'time': best_time})
+    # Winner of each mini-sector: the fastest driver, ties going to the first selected
+    sector_times = np.where(np.isnan(sector_times), np.inf, sector_times)
+    winner_rows = np.argmin(sector_times, axis=0)
+    has_winner = np.isfinite(sector_times.min(axis=0))
     
     # First, add a dark background outline for the entire track (shadow effect)
-    fig.add_trace(go.Scatter(
+    traces = []
+    traces.append(dict(
+        type='scatter',
         x=x_coords,
         y=y_coords,
         mode='lines',
@@ -959,7 +1052,8 @@ def create_track_dominance(session, drivers, race, year, empty_layout):
     ))
     
     # Add a subtle grey outline for depth
-    fig.add_trace(go.Scatter(
+    traces.append(dict(
+        type='scatter',
         x=x_coords,
         y=y_coords,
         mode='lines',
@@ -969,159 +1063,124 @@ def create_track_dominance(session, drivers, race, year, empty_layout):
         showlegend=False
     ))
     
-    # Track which drivers have been added to legend
-    legend_added = set()
-    
     # Determine which drivers need stripes (second driver from same team)
     team_drivers = {}
-    for d_abbr, data in driver_data.items():
-        team = data['team']
+    for d_abbr in dominance_drivers:
+        team = roster.get(d_abbr).team
         if team not in team_drivers:
             team_drivers[team] = []
         team_drivers[team].append(d_abbr)
     
     # Mark drivers who need alternate color (not the first one from their team)
-    drivers_with_alt_color = {}
+    drivers_with_alt_color = set()
     for team, team_driver_list in team_drivers.items():
         if len(team_driver_list) > 1:
             # All except the first driver get alternate color
-            for d in team_driver_list[1:]:
-                drivers_with_alt_color[d] = team
+            drivers_with_alt_color.update(team_driver_list[1:])
     
-    # Secondary team colors - distinct colors that don't clash with other teams
-    secondary_team_colors = {
-        'Red Bull Racing': '#FFD700',       # Gold
-        'Red Bull': '#FFD700',              # Gold
-        'Ferrari': '#FFF200',               # Yellow
-        'Mercedes': '#00A19C',              # Petronas Teal variant
-        'McLaren': '#47C7FC',               # Cyan/Light Blue
-        'Aston Martin': '#00594F',          # Dark Teal
-        'Alpine': '#FF87BC',                # Pink
-        'Williams': '#64C4FF',              # Light Blue
-        'Haas F1 Team': '#B6BABD',          # Silver
-        'MoneyGram Haas F1 Team': '#B6BABD',
-        'RB': '#1E5BC6',                    # Different Blue
-        'Kick Sauber': '#00E701',           # Bright Green
-        'Sauber': '#00E701',
-        'Alfa Romeo': '#4CBB17',            # Kelly Green
-        'AlphaTauri': '#4E7C9B',            # Steel Blue
-    }
+    # Lay out every mini-sector's points on the reference path, followed by a gap point.
+    # Gaps between consecutive sectors won by the same driver are dropped.
+    lengths = sector_indices[1:] - sector_indices[:-1] + 2
+    point_sector = np.repeat(np.arange(num_sectors), lengths)
+    point_offset = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    point_index = np.minimum(sector_indices[:-1][point_sector] + point_offset, len(x_coords) - 1)
+    is_gap = point_offset == lengths[point_sector] - 1
+    same_next = np.append(winner_rows[1:] == winner_rows[:-1], False)
+    keep = has_winner[point_sector] & ~(is_gap & same_next[point_sector])
+    point_sector, point_index, is_gap = point_sector[keep], point_index[keep], is_gap[keep]
+    point_winner = winner_rows[point_sector]
     
-    def get_secondary_color(team_name):
-        """Get secondary color for a team."""
-        for team_key, sec_color in secondary_team_colors.items():
-            if team_key.lower() in team_name.lower() or team_name.lower() in team_key.lower():
-                return sec_color
-        return '#FFFF00'  # Yellow as fallback
+    # One glow and one main trace per driver, holding all of their winning mini-sectors
+    seg_x_all = np.where(is_gap, np.nan, x_coords[point_index])
+    seg_y_all = np.where(is_gap, np.nan, y_coords[point_index])
+    for row, winner in enumerate(dominance_drivers):
+        mask = point_winner == row
+        if not np.any(mask):
+            continue
+        
+        # Use secondary color for second teammate
+        drv_info = roster.get(winner)
+        color = drv_info.secondary_color if winner in drivers_with_alt_color else drv_info.color
+        
+        seg_x = seg_x_all[mask]
+        seg_y = seg_y_all[mask]
+        
+        # Add glow layer (wider, semi-transparent)
+        traces.append(dict(
+            type='scatter',
+            x=seg_x,
+            y=seg_y,
+            mode='lines',
+            line=dict(color=color, width=14),
+            opacity=0.3,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        
+        # Add main colored track
+        traces.append(dict(
+            type='scatter',
+            x=seg_x,
+            y=seg_y,
+            mode='lines',
+            name=winner,
+            line=dict(color=color, width=10),
+            customdata=point_sector[mask] + 1,
+            hovertemplate=f"Sector %{{customdata}}: {winner}<extra></extra>",
+            showlegend=True,
+            legendgroup=winner
+        ))
     
-    # Plot each mini-sector with the winning driver's color
-    for i in range(NUM_SECTORS):
-        start_idx = sector_indices[i]
-        end_idx = sector_indices[i + 1]
-        winner = sector_winners[i]['winner']
+    # Add start/finish marker
+    perp_x, perp_y = geometry.normal_x[0], geometry.normal_y[0]
+    if np.isfinite(perp_x) and np.isfinite(perp_y):
+        # Keep line within track width
+        line_length = 350
         
-        if winner and winner in driver_data:
-            # Use secondary color for second teammate
-            if winner in drivers_with_alt_color:
-                team = drivers_with_alt_color[winner]
-                color = get_secondary_color(team)
-            else:
-                color = driver_data[winner]['color']
-            
-            # Get segment coordinates
-            seg_x = x_coords[start_idx:end_idx+1]
-            seg_y = y_coords[start_idx:end_idx+1]
+        traces.append(dict(
+            type='scatter',
+            x=[x_coords[0] - perp_x * line_length, x_coords[0] + perp_x * line_length],
+            y=[y_coords[0] - perp_y * line_length, y_coords[0] + perp_y * line_length],
+            mode='lines',
+            name='Start/Finish',
+            line=dict(color='white', width=4),
+            showlegend=True
+        ))
+    
+    # Add mini-sector boundary markers (white lines within track width) as one trace;
+    # above MAX_BOUNDARY_MARKERS they would crowd the map, so only the sector colors remain
+    if num_sectors <= MAX_BOUNDARY_MARKERS:
+        idx = sector_indices[1:-1]
+        idx = idx[(idx > 0) & (idx < len(x_coords) - 1)]
+        idx = idx[np.isfinite(geometry.normal_x[idx])]
+        if len(idx):
+            perp_x = geometry.normal_x[idx]
+            perp_y = geometry.normal_y[idx]
+            # Short line that stays within track borders
+            line_length = 300
+            gaps = np.full(len(idx), np.nan)
             
-            # Add glow layer (wider, semi-transparent)
-            fig.add_trace(go.Scatter(
-                x=seg_x,
-                y=seg_y,
+            traces.append(dict(
+                type='scatter',
+                x=np.column_stack((x_coords[idx] - perp_x * line_length, x_coords[idx] + perp_x * line_length, gaps)).ravel(),
+                y=np.column_stack((y_coords[idx] - perp_y * line_length, y_coords[idx] + perp_y * line_length, gaps)).ravel(),
                 mode='lines',
-                line=dict(color=color, width=14),
-                opacity=0.3,
+                line=dict(color='white', width=2),
                 hoverinfo='skip',
                 showlegend=False
             ))
-            
-            # Only add to legend once per driver
-            show_legend = winner not in legend_added
-            if show_legend:
-                legend_added.add(winner)
-            
-            # Add main colored track
-            fig.add_trace(go.Scatter(
-                x=seg_x,
-                y=seg_y,
-                mode='lines',
-                name=winner,
-                line=dict(color=color, width=10),
-                hovertemplate=f"Sector {i+1}: {winner}<extra></extra>",
-                showlegend=show_legend,
-                legendgroup=winner
-            ))
-    
-    # Add start/finish marker
-    if len(x_coords) > 1:
-        dx = x_coords[1] - x_coords[0]
-        dy = y_coords[1] - y_coords[0]
-        length = np.sqrt(dx**2 + dy**2)
-        if length > 0:
-            perp_x = -dy / length
-            perp_y = dx / length
-            # Keep line within track width
-            line_length = 350
-            
-            fig.add_trace(go.Scatter(
-                x=[x_coords[0] - perp_x * line_length, x_coords[0] + perp_x * line_length],
-                y=[y_coords[0] - perp_y * line_length, y_coords[0] + perp_y * line_length],
-                mode='lines',
-                name='Start/Finish',
-                line=dict(color='white', width=4),
-                showlegend=True
-            ))
-    
-    # Add mini-sector boundary markers (white lines within track width)
-    for i in range(1, NUM_SECTORS):
-        idx = sector_indices[i]
-        if idx > 0 and idx < len(x_coords) - 1:
-            dx = x_coords[idx + 1] - x_coords[idx - 1]
-            dy = y_coords[idx + 1] - y_coords[idx - 1]
-            length = np.sqrt(dx**2 + dy**2)
-            if length > 0:
-                perp_x = -dy / length
-                perp_y = dx / length
-                # Short line that stays within track borders
-                line_length = 300
-                
-                fig.add_trace(go.Scatter(
-                    x=[x_coords[idx] - perp_x * line_length, x_coords[idx] + perp_x * line_length],
-                    y=[y_coords[idx] - perp_y * line_length, y_coords[idx] + perp_y * line_length],
-                    mode='lines',
-                    line=dict(color='white', width=2),
-                    hoverinfo='skip',
-                    showlegend=False
-                ))
     
     # Create summary of sectors won by each driver
-    driver_sectors_won = {}
-    for sw in sector_winners:
-        winner = sw['winner']
-        if winner:
-            driver_sectors_won[winner] = driver_sectors_won.get(winner, 0) + 1
+    sectors_won = np.bincount(winner_rows[has_winner], minlength=len(dominance_drivers))
     
     legend_text = "<b>Mini-Sectors Won:</b><br>"
-    for d_abbr in sorted(driver_sectors_won.keys(), key=lambda x: driver_sectors_won[x], reverse=True):
-        count = driver_sectors_won[d_abbr]
-        legend_text += f"{d_abbr}: {count}/{NUM_SECTORS}<br>"
+    for row in sorted(np.flatnonzero(sectors_won), key=lambda r: sectors_won[r], reverse=True):
+        legend_text += f"{dominance_drivers[row]}: {sectors_won[row]}/{num_sectors}<br>"
     
-    fig.update_layout(
-        title=dict(
-            text=f"Track Dominance - {race} {year}",
-            font=dict(color='white', size=20)
-        ),
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
+    return make_figure(
+        traces,
+        f"Track Dominance - {race} {year}",
+        render_mode=render_mode,
         xaxis=dict(
             visible=False,
             scaleanchor='y',
@@ -1131,7 +1190,6 @@ def create_track_dominance(session, drivers, race, year, empty_layout):
             visible=False
         ),
         legend=dict(
-            font=dict(color='white'),
             bgcolor='rgba(0,0,0,0.5)',
             bordercolor='rgba(255,255,255,0.3)',
             borderwidth=1
@@ -1152,6 +1210,4 @@ def create_track_dominance(session, drivers, race, year, empty_layout):
                 borderpad=8
             )
         ]
-    )
-    
-    return fig
\ No newline at end of file
+    )
\ No newline at end of file
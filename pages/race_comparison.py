@@ -1,16 +1,24 @@
 # In pages/race_comparison.py
 
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch, no_update
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 from dash_iconify import DashIconify
 import fastf1
 from fastf1 import plotting
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
 from app_instance import app
+from utils.data_loader import load_session, get_event_index, get_event_info, get_roster, is_session_final, LOAD_LAPS
+from utils.lap_table import get_lap_table, get_quick_laps, warm_lap_table
+from utils.aero import team_speed_summary
+from utils.cancellation import CancelToken, RequestCancelled, request_generations
+from utils.figure_cache import figure_cache, figure_key
+from utils.visuals import (
+    beeswarm_offsets, empty_figure, encode_arrays, make_figure, patch_keyed_list, patched_order, teammate_dashes,
+    use_webgl,
+)
 
 
 # --- Flag icon mapping for Grand Prix (using Iconify flag icons) ---
@@ -262,8 +270,17 @@ layout = html.Div([
                     dcc.Loading(
                         id="race-loading-graph",
                         type="default",
+                        # Background builds report their stage under the spinner
+                        custom_spinner=html.Div([
+                            dbc.Spinner(color="light"),
+                            html.Div(id='race-graph-progress', className='graph-progress', style={'display': 'none'})
+                        ], className='graph-progress-spinner'),
                         children=dcc.Graph(id='race-graph', style={'height': '80vh', 'display': 'none'})
-                    )
+                    ),
+                    # What race-graph plots, for patching driver changes into it
+                    dcc.Store(id='race-view-store', data=None),
+                    # Aero Performance sketch handed to its background build
+                    dcc.Store(id='race-aero-job-store', data=None)
                 ])
             ], md=8)
         ])
@@ -280,8 +297,7 @@ layout = html.Div([
 def update_race_options(selected_year):
     if not selected_year:
         return [], []
-    schedule = fastf1.get_event_schedule(selected_year)
-    races = schedule['EventName'].tolist()
+    races = get_event_index(selected_year)['names']
     options = [{'label': r, 'value': r} for r in races]
     return options, options
 
@@ -394,18 +410,13 @@ def update_session_options(selected_race, selected_year):
     if not selected_race or not selected_year:
         return [], None
     try:
-        # Get the event schedule to check if it's a sprint weekend
-        schedule = fastf1.get_event_schedule(selected_year)
-        event = schedule[schedule['EventName'] == selected_race]
+        # Look up the event in the cached schedule index to check if it's a sprint weekend
+        event = get_event_info(selected_year, selected_race)
         
-        if event.empty:
+        if event is None:
             return [], None
         
-        # Check if it's a sprint weekend by looking at EventFormat
-        event_format = event['EventFormat'].values[0]
-        is_sprint = 'sprint' in str(event_format).lower()
-        
-        if is_sprint:
+        if event['is_sprint']:
             # Sprint weekend: FP1, Sprint, Race
             options = [
                 {'label': 'Free Practice 1', 'value': 'FP1'},
@@ -461,22 +472,12 @@ def update_team_options(selected_session, selected_race, selected_year):
     if not selected_race or not selected_year or not selected_session:
         return [], {}
     try:
-        session = fastf1.get_session(selected_year, selected_race, selected_session)
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
+        session = load_session(selected_year, selected_race, selected_session, LOAD_LAPS)
         plotting.setup_mpl()
         
-        teams = set()
-        team_colors = {}
+        team_colors = dict(get_roster(session).team_colors)
         
-        for d in session.drivers:
-            driver_info = session.get_driver(d)
-            team = driver_info['TeamName']
-            if team not in teams:
-                teams.add(team)
-                color = plotting.get_team_color(team, session)
-                team_colors[team] = color
-        
-        options = [{'label': t, 'value': t} for t in sorted(teams)]
+        options = [{'label': t, 'value': t} for t in sorted(team_colors)]
         return options, team_colors
     except Exception as e:
         print(f"Error loading teams: {e}")
@@ -521,22 +522,19 @@ def update_driver_options(selected_session, selected_race, selected_year):
     if not selected_race or not selected_year or not selected_session:
         return [], {}
     try:
-        session = fastf1.get_session(selected_year, selected_race, selected_session)
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
+        session = load_session(selected_year, selected_race, selected_session, LOAD_LAPS)
         plotting.setup_mpl()
         
-        drivers = session.drivers
+        # Build the lap summary table (incl. telemetry speeds) before the first graph request
+        warm_lap_table(selected_year, selected_race, selected_session)
+        
+        roster = get_roster(session)
         driver_colors = {}
         options = []
         
-        for d in drivers:
-            driver_info = session.get_driver(d)
-            abbr = driver_info['Abbreviation']
-            full_name = driver_info['FullName']
-            team = driver_info['TeamName']
-            color = plotting.get_team_color(team, session)
-            driver_colors[abbr] = color
-            options.append({'label': full_name, 'value': abbr})
+        for abbr, info in roster.drivers.items():
+            driver_colors[abbr] = info.color
+            options.append({'label': info.full_name, 'value': abbr})
         
         # Add "All Drivers" option at the top
         all_drivers_option = {'label': '⭐ All Drivers', 'value': 'ALL_DRIVERS'}
@@ -597,6 +595,8 @@ def display_driver_tags(selected_drivers, driver_colors):
     Output('race-graph', 'figure'),
     Output('race-graph', 'style'),
     Output('race-graph-empty-state', 'style'),
+    Output('race-view-store', 'data'),
+    Output('race-aero-job-store', 'data'),
     Input('race-sketch-button', 'n_clicks'),
     State('race-driver-dropdown', 'value'),
     State('race-team-dropdown', 'value'),
@@ -605,17 +605,12 @@ def display_driver_tags(selected_drivers, driver_colors):
     State('race-session-dropdown', 'value'),
     State('race-chart-dropdown', 'value'),
     State('race-driver-colors-store', 'data'),
-    State('race-team-colors-store', 'data')
+    State('race-team-colors-store', 'data'),
+    State('race-view-store', 'data'),
+    State('client-id', 'data')
 )
-def update_graph(n_clicks, drivers, teams, year, race, session_type, chart_type, driver_colors, team_colors):
-    empty_layout = dict(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        yaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        font=dict(color='white')
-    )
-    
+def update_graph(n_clicks, drivers, teams, year, race, session_type, chart_type, driver_colors, team_colors,
+                 plotted_view=None, client_id=None):
     # Styles for showing/hiding
     graph_hidden = {'height': '80vh', 'display': 'none'}
     graph_visible = {'height': '80vh', 'display': 'block'}
@@ -623,231 +618,231 @@ def update_graph(n_clicks, drivers, teams, year, race, session_type, chart_type,
     empty_visible = {}
     
     if n_clicks is None or n_clicks == 0:
-        fig = go.Figure()
-        fig.update_layout(title="", **empty_layout)
-        return fig, graph_hidden, empty_visible
+        return empty_figure(), graph_hidden, empty_visible, None, no_update
     
     # Handle Aero Performance - uses all teams automatically
     if chart_type == 'Aero Performance':
         if not race or not year or not session_type:
-            fig = go.Figure()
-            fig.update_layout(title="Please select Year, Race, and Session to sketch the graph.", **empty_layout)
-            return fig, graph_visible, empty_hidden
+            return empty_figure("Please select Year, Race, and Session to sketch the graph."), graph_visible, empty_hidden, None, no_update
         
-        try:
-            session = fastf1.get_session(year, race, session_type)
-            session.load(laps=True, telemetry=True, weather=False, messages=False)
-            plotting.setup_mpl()
-            
-            # Get all teams from the session
-            all_teams = set()
-            all_team_colors = {}
-            for d in session.drivers:
-                driver_info = session.get_driver(d)
-                team = driver_info['TeamName']
-                if team not in all_teams:
-                    all_teams.add(team)
-                    all_team_colors[team] = plotting.get_team_color(team, session)
-            
-            session_names = {'FP1': 'FP1', 'FP2': 'FP2', 'FP3': 'FP3', 'R': 'Race', 'S': 'Sprint'}
-            session_name = session_names.get(session_type, session_type)
-            
-            result = create_aero_performance_graph(session, list(all_teams), race, year, all_team_colors, empty_layout, session_name)
-            return result, graph_visible, empty_hidden
-        except Exception as e:
-            print(f"Error generating aero performance graph: {e}")
-            fig = go.Figure()
-            fig.update_layout(title=f"Error: {e}", **empty_layout)
-            return fig, graph_visible, empty_hidden
+        key = figure_key('race-comparison', year, race, session_type, (), chart_type)
+        cached = figure_cache.get(key)
+        if cached is not None:
+            return cached, graph_visible, empty_hidden, None, no_update
+        
+        # Telemetry speeds can take a while on a cold session, so the chart is built in the background
+        job = {'sketch': n_clicks, 'year': year, 'race': race, 'session_type': session_type, 'key': key}
+        return no_update, graph_visible, empty_hidden, None, job
     
     if not drivers or not race or not year or not session_type:
-        fig = go.Figure()
-        fig.update_layout(title="Please select Year, Race, Session, and at least one Driver to sketch the graph.", **empty_layout)
-        return fig, graph_visible, empty_hidden
+        return empty_figure("Please select Year, Race, Session, and at least one Driver to sketch the graph."), graph_visible, empty_hidden, None, no_update
     
     # Get session name for title
     session_names = {'FP1': 'FP1', 'FP2': 'FP2', 'FP3': 'FP3', 'R': 'Race', 'S': 'Sprint'}
     session_name = session_names.get(session_type, session_type)
     
+    chart = {'year': year, 'race': race, 'session_type': session_type, 'chart_type': chart_type}
+    key = figure_key('race-comparison', year, race, session_type, drivers, chart_type)
+    
+    # A sketch that only changes the drivers of the plotted chart is patched instead
+    patchable = plotted_view is not None and plotted_view.get('chart') == chart
+    cached = None if patchable else figure_cache.get(key)
+    if cached is not None:
+        fig, view = cached
+        return fig, graph_visible, empty_hidden, view, no_update
+    
+    # A newer sketch from this tab makes this one stale
+    token = request_generations.start(client_id, 'race-comparison')
     try:
-        session = fastf1.get_session(year, race, session_type)
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
+        session = load_session(year, race, session_type, LOAD_LAPS)
+        token.check()
+        quick_laps = get_quick_laps(year, race, session_type)
+        token.check()
         plotting.setup_mpl()
         
+        # Lap Times and Box Plot only send the traces of added drivers when nothing else changed
         if chart_type == 'Lap Times':
-            result = create_laptime_graph(session, drivers, race, year, driver_colors, empty_layout, session_name)
-            return result, graph_visible, empty_hidden
+            result, view = create_laptime_graph(session, quick_laps, drivers, race, year, driver_colors, session_name,
+                                                chart, plotted_view)
         elif chart_type == 'Box Plot':
-            result = create_boxplot_graph(session, drivers, race, year, driver_colors, empty_layout, session_name)
-            return result, graph_visible, empty_hidden
+            result, view = create_boxplot_graph(session, quick_laps, drivers, race, year, driver_colors, session_name,
+                                                chart, plotted_view)
         elif chart_type == 'Violin Plot':
-            result = create_violin_graph(session, drivers, race, year, driver_colors, empty_layout, session_name)
-            return result, graph_visible, empty_hidden
+            result = create_violin_graph(session, quick_laps, drivers, race, year, driver_colors, session_name, token)
+            view = None
         else:
-            fig = go.Figure()
-            fig.update_layout(title="Unknown chart type selected.", **empty_layout)
-            return fig, graph_visible, empty_hidden
+            return empty_figure("Unknown chart type selected."), graph_visible, empty_hidden, None, no_update
+        
+        # Live sessions keep changing, so only figures of finished sessions are cached
+        if not isinstance(result, Patch) and is_session_final(session):
+            figure_cache.put(key, (result, view))
+        return result, graph_visible, empty_hidden, view, no_update
             
+    except RequestCancelled:
+        # The browser discards this response anyway
+        return no_update, no_update, no_update, no_update, no_update
     except Exception as e:
         print(f"Error generating graph: {e}")
-        fig = go.Figure()
-        fig.update_layout(
-            title=f"Error sketching graph: {e}",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white')
-        )
-        return fig, graph_visible, empty_hidden
+        return empty_figure(f"Error sketching graph: {e}"), graph_visible, empty_hidden, None, no_update
 
 
-def create_laptime_graph(session, drivers, race, year, driver_colors, empty_layout, session_name='Race'):
-    """Create a lap times comparison graph across the session."""
-    fig = go.Figure()
-    team_color_used_solid = {}
-    
-    for d_abbr in drivers:
-        driver_data = session.get_driver(d_abbr)
-        if driver_data is None:
-            continue
-        
-        team = driver_data['TeamName']
-        color = driver_colors.get(d_abbr, plotting.get_team_color(team, session))
-        
-        # Get all laps for this driver
-        driver_laps = session.laps.pick_drivers(d_abbr).pick_quicklaps()
-        
-        if driver_laps.empty:
-            continue
-        
-        # Extract lap numbers and lap times
-        lap_numbers = driver_laps['LapNumber'].values
-        lap_times = driver_laps['LapTime'].dt.total_seconds().values
-        
-        # Filter out any NaN values
-        valid_mask = ~np.isnan(lap_times)
-        lap_numbers = lap_numbers[valid_mask]
-        lap_times = lap_times[valid_mask]
+@app.callback(
+    Output('race-graph', 'figure', allow_duplicate=True),
+    Input('race-aero-job-store', 'data'),
+    background=True,
+    progress=Output('race-graph-progress', 'children'),
+    running=[(Output('race-graph-progress', 'style'), {'display': 'block'}, {'display': 'none'})],
+    # A new selection makes the running build useless
+    cancel=[
+        Input('race-year-dropdown', 'value'),
+        Input('race-event-dropdown', 'value'),
+        Input('race-session-dropdown', 'value'),
+        Input('race-chart-dropdown', 'value'),
+    ],
+    prevent_initial_call=True
+)
+def build_aero_graph(set_progress, job):
+    """Build an Aero Performance sketch as a background job, reporting each stage."""
+    if not job:
+        return no_update
+    year, race, session_type = job['year'], job['race'], job['session_type']
+    try:
+        set_progress("Loading session...")
+        session = load_session(year, race, session_type, LOAD_LAPS)
+        set_progress("Extracting telemetry...")
+        lap_table = get_lap_table(year, race, session_type, with_speeds=True)
+        plotting.setup_mpl()
+        set_progress("Building figure...")
         
-        if len(lap_numbers) == 0:
-            continue
+        # Get all teams from the session
+        roster = get_roster(session)
         
-        line_dash = 'solid'
-        if team in team_color_used_solid:
-            line_dash = 'dash'
-        else:
-            team_color_used_solid[team] = True
+        session_names = {'FP1': 'FP1', 'FP2': 'FP2', 'FP3': 'FP3', 'R': 'Race', 'S': 'Sprint'}
+        session_name = session_names.get(session_type, session_type)
         
-        fig.add_trace(go.Scatter(
-            x=lap_numbers,
-            y=lap_times,
+        result = create_aero_performance_graph(session, lap_table, roster.teams, race, year, roster.team_colors, session_name)
+        if is_session_final(session):
+            figure_cache.put(job['key'], result)
+        return result
+    except Exception as e:
+        print(f"Error generating aero performance graph: {e}")
+        return empty_figure(f"Error: {e}")
+
+
+# --- Incremental updates ---
+# Lap Times and Box Plot draw one trace per driver. The race-view-store records the
+# chart and its drivers in trace order, so a sketch that only changes the drivers
+# deletes and appends traces with a Patch instead of re-sending the figure.
+
+def _patch_driver_chart(plotted_view, view, make_trace, teams=None):
+    """(Patch, view) taking the plotted chart to the drivers of `view`, or None for another chart.
+
+    `make_trace(d_abbr, dash)` builds the trace of an added driver. With
+    `teams` (driver -> team), teammates are dashed and kept traces restyled
+    when their team's solid line was removed.
+    """
+    if (plotted_view is None or not plotted_view.get('drivers') or plotted_view.get('chart') != view['chart']
+            or plotted_view.get('webgl') != view['webgl']):
+        return None
+    order = patched_order(plotted_view['drivers'], view['drivers'])
+    added = [d for d in view['drivers'] if d not in plotted_view['drivers']]
+    dashes = teammate_dashes([teams[d] for d in order]) if teams else ['solid'] * len(order)
+    
+    patched = Patch()
+    traces = [encode_arrays(make_trace(d_abbr, dash)) for d_abbr, dash in zip(added, dashes[len(order) - len(added):])]
+    patch_keyed_list(patched['data'], plotted_view['drivers'], view['drivers'], traces)
+    old_dashes = dict(zip(plotted_view['drivers'], plotted_view['dashes']))
+    for i, (d_abbr, dash) in enumerate(zip(order, dashes)):
+        if old_dashes.get(d_abbr, dash) != dash:
+            patched['data'][i]['line']['dash'] = dash
+    return patched, dict(view, drivers=order, dashes=dashes)
+
+
+def create_laptime_graph(session, quick_laps, drivers, race, year, driver_colors, session_name='Race', chart=None,
+                         plotted_view=None):
+    """Create a lap times comparison graph across the session, as (figure, view).
+
+    The figure is a Patch when `plotted_view` shows the same `chart` with other drivers.
+    """
+    roster = get_roster(session)
+    # Drivers with quick laps (lap times are never NaN)
+    plotted = [d for d in drivers if roster.get(d) is not None and d in quick_laps]
+    teams = {d_abbr: roster.get(d_abbr).team for d_abbr in plotted}
+    webgl = use_webgl(sum(len(quick_laps[d_abbr].lap_numbers) for d_abbr in plotted), 'auto')
+    
+    def make_trace(d_abbr, dash):
+        driver_laps = quick_laps[d_abbr]
+        return dict(
+            type='scattergl' if webgl else 'scatter',
+            x=driver_laps.lap_numbers,
+            y=driver_laps.lap_times,
             mode='lines+markers',
-            name=f"{d_abbr} ({team})",
-            line=dict(color=color, dash=line_dash, width=2),
+            name=f"{d_abbr} ({teams[d_abbr]})",
+            line=dict(color=driver_colors.get(d_abbr, roster.get(d_abbr).color), dash=dash, width=2),
             marker=dict(size=4)
-        ))
+        )
+    
+    view = {'chart': chart, 'webgl': webgl, 'drivers': plotted}
+    patched = _patch_driver_chart(plotted_view, view, make_trace, teams)
+    if patched is not None:
+        return patched
     
-    fig.update_layout(
-        title=dict(
-            text=f"Lap Times - {race} {year} ({session_name})",
-            font=dict(color='white', size=20)
-        ),
+    dashes = teammate_dashes([teams[d_abbr] for d_abbr in plotted])
+    fig = make_figure(
+        [make_trace(d_abbr, dash) for d_abbr, dash in zip(plotted, dashes)],
+        f"Lap Times - {race} {year} ({session_name})",
         xaxis_title='Lap Number',
         yaxis_title='Lap Time (s)',
-        legend_title="Driver (Team)",
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        ),
-        yaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        ),
-        legend=dict(
-            font=dict(color='white'),
-            title_font=dict(color='white')
-        )
+        legend_title="Driver (Team)"
     )
-    
-    return fig
+    return fig, dict(view, dashes=dashes)
 
 
-def create_boxplot_graph(session, drivers, race, year, driver_colors, empty_layout, session_name='Race'):
-    """Create a box and whisker plot comparing lap time distributions."""
-    fig = go.Figure()
+def create_boxplot_graph(session, quick_laps, drivers, race, year, driver_colors, session_name='Race', chart=None,
+                         plotted_view=None):
+    """Create a box and whisker plot comparing lap time distributions, as (figure, view).
+
+    The figure is a Patch when `plotted_view` shows the same `chart` with other drivers.
+    """
+    roster = get_roster(session)
+    # Quick laps of each driver (excluding pit laps and slow laps)
+    plotted = [d for d in drivers if roster.get(d) is not None and d in quick_laps]
     
-    for d_abbr in drivers:
-        driver_data = session.get_driver(d_abbr)
-        if driver_data is None:
-            continue
-        
-        team = driver_data['TeamName']
-        color = driver_colors.get(d_abbr, plotting.get_team_color(team, session))
-        
-        # Get all laps for this driver (excluding pit laps and slow laps)
-        driver_laps = session.laps.pick_drivers(d_abbr).pick_quicklaps()
-        
-        if driver_laps.empty:
-            continue
-        
-        # Extract lap times
-        lap_times = driver_laps['LapTime'].dt.total_seconds().values
-        
-        # Filter out any NaN values
-        lap_times = lap_times[~np.isnan(lap_times)]
-        
-        if len(lap_times) == 0:
-            continue
-        
-        fig.add_trace(go.Box(
-            y=lap_times,
+    def make_trace(d_abbr, dash):
+        color = driver_colors.get(d_abbr, roster.get(d_abbr).color)
+        return dict(
+            type='box',
+            y=quick_laps[d_abbr].lap_times,
             name=d_abbr,
-            marker_color=color,
-            line_color=color,
+            marker=dict(color=color),
+            line=dict(color=color),
             boxmean=True,  # Show mean as dashed line
             boxpoints='outliers'
-        ))
+        )
+    
+    view = {'chart': chart, 'webgl': False, 'drivers': plotted}
+    patched = _patch_driver_chart(plotted_view, view, make_trace)
+    if patched is not None:
+        return patched
     
-    fig.update_layout(
-        title=dict(
-            text=f"Lap Time Distribution - {race} {year} ({session_name})",
-            font=dict(color='white', size=20)
-        ),
+    fig = make_figure(
+        [make_trace(d_abbr, 'solid') for d_abbr in plotted],
+        f"Lap Time Distribution - {race} {year} ({session_name})",
         xaxis_title='Driver',
         yaxis_title='Lap Time (s)',
-        showlegend=False,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        ),
-        yaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        )
+        showlegend=False
     )
-    
-    return fig
+    return fig, dict(view, dashes=['solid'] * len(plotted))
+
 
+def create_violin_graph(session, quick_laps, drivers, race, year, driver_colors, session_name='Race', token=None):
+    """Create a violin plot comparing lap time distributions with tire compound colors.
 
-def create_violin_graph(session, drivers, race, year, driver_colors, empty_layout, session_name='Race'):
-    """Create a violin plot comparing lap time distributions with tire compound colors."""
-    fig = go.Figure()
+    `token` (a CancelToken) is checked before each driver's beeswarm.
+    """
+    token = token or CancelToken()
+    roster = get_roster(session)
+    traces = []
     
     # Tire compound colors
     compound_colors = {
@@ -865,30 +860,20 @@ def create_violin_graph(session, drivers, race, year, driver_colors, empty_layou
     driver_data_map = {}
     
     for d_abbr in drivers:
-        driver_data = session.get_driver(d_abbr)
-        if driver_data is None:
+        driver_info = roster.get(d_abbr)
+        if driver_info is None:
             continue
         
-        team = driver_data['TeamName']
-        color = driver_colors.get(d_abbr, plotting.get_team_color(team, session))
+        color = driver_colors.get(d_abbr, driver_info.color)
         
-        # Get all laps for this driver (excluding pit laps and slow laps)
-        driver_laps = session.laps.pick_drivers(d_abbr).pick_quicklaps()
+        # Quick laps of this driver (excluding pit laps and slow laps)
+        driver_laps = quick_laps.get(d_abbr)
         
-        if driver_laps.empty:
+        if driver_laps is None:
             continue
         
-        # Extract lap times and compounds
-        lap_times = driver_laps['LapTime'].dt.total_seconds().values
-        compounds = driver_laps['Compound'].values
-        
-        # Filter out any NaN values
-        valid_mask = ~np.isnan(lap_times)
-        lap_times_valid = lap_times[valid_mask]
-        compounds_valid = compounds[valid_mask]
-        
-        if len(lap_times_valid) == 0:
-            continue
+        lap_times_valid = driver_laps.lap_times
+        compounds_valid = driver_laps.compounds
         
         x_pos = driver_positions[d_abbr]
         
@@ -900,16 +885,17 @@ def create_violin_graph(session, drivers, race, year, driver_colors, empty_layou
         }
         
         # Add violin trace using numerical x position
-        fig.add_trace(go.Violin(
+        traces.append(dict(
+            type='violin',
             x0=x_pos,
             y=lap_times_valid,
             name=d_abbr,
-            line_color=color,
+            line=dict(color=color),
             fillcolor=color,
             opacity=0.6,
-            meanline_visible=True,
+            meanline=dict(visible=True),
             points=False,
-            box_visible=False,
+            box=dict(visible=False),
             showlegend=False,
             scalemode='width',
             width=0.8,
@@ -922,58 +908,15 @@ def create_violin_graph(session, drivers, race, year, driver_colors, empty_layou
     for d_abbr in drivers:
         if d_abbr not in driver_data_map:
             continue
+        token.check()
         
         data = driver_data_map[d_abbr]
         lap_times_valid = data['lap_times']
         compounds_valid = data['compounds']
         x_pos = data['x_pos']
         
-        # Calculate beeswarm positions for all points of this driver
-        all_times = lap_times_valid
-        all_compounds = compounds_valid
-        
-        # Sort by lap time for beeswarm algorithm
-        sort_idx = np.argsort(all_times)
-        sorted_times = all_times[sort_idx]
-        sorted_compounds = all_compounds[sort_idx]
-        
-        # Beeswarm positioning
-        x_offsets = np.zeros(len(sorted_times))
-        point_radius = 0.03  # Relative size of each point for collision detection
-        y_range = np.ptp(sorted_times) if len(sorted_times) > 1 else 1
-        y_tolerance = y_range * 0.015  # Points within this y-range are considered "neighbors"
-        
-        for i in range(len(sorted_times)):
-            # Find nearby points that have already been placed
-            nearby_offsets = []
-            for j in range(i):
-                if abs(sorted_times[i] - sorted_times[j]) < y_tolerance:
-                    nearby_offsets.append(x_offsets[j])
-            
-            if not nearby_offsets:
-                # No nearby points, place at center
-                x_offsets[i] = 0
-            else:
-                # Find a position that doesn't overlap with nearby points
-                # Try alternating left and right from center
-                for offset in [0, -point_radius, point_radius, -2*point_radius, 2*point_radius, 
-                              -3*point_radius, 3*point_radius, -4*point_radius, 4*point_radius,
-                              -5*point_radius, 5*point_radius]:
-                    collision = False
-                    for existing in nearby_offsets:
-                        if abs(offset - existing) < point_radius * 1.8:
-                            collision = True
-                            break
-                    if not collision:
-                        x_offsets[i] = offset
-                        break
-                else:
-                    # If no non-colliding position found, use small random jitter
-                    x_offsets[i] = np.random.uniform(-0.15, 0.15)
-        
-        # Unsort to get original order
-        unsort_idx = np.argsort(sort_idx)
-        x_offsets = x_offsets[unsort_idx]
+        # Spread laps with similar times side by side (deterministic beeswarm)
+        x_offsets = beeswarm_offsets(lap_times_valid)
         
         # Group by compound and add scatter points
         for compound in compound_colors.keys():
@@ -990,7 +933,8 @@ def create_violin_graph(session, drivers, race, year, driver_colors, empty_layou
             if show_legend:
                 legend_added.add(compound)
             
-            fig.add_trace(go.Scatter(
+            traces.append(dict(
+                type='scatter',
                 x=x_values,
                 y=compound_times,
                 mode='markers',
@@ -1006,63 +950,35 @@ def create_violin_graph(session, drivers, race, year, driver_colors, empty_layou
             ))
     
     # Update layout with custom x-axis ticks
-    fig.update_layout(
-        title=dict(
-            text=f"Lap Time Distribution (Violin) - {race} {year} ({session_name})",
-            font=dict(color='white', size=20)
-        ),
+    return make_figure(
+        traces,
+        f"Lap Time Distribution (Violin) - {race} {year} ({session_name})",
         xaxis_title='Driver',
         yaxis_title='Lap Time (s)',
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
+        legend_title='Compound',
         xaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white'),
             tickmode='array',
             tickvals=list(range(len(drivers))),
             ticktext=list(drivers),
             range=[-0.5, len(drivers) - 0.5]
-        ),
-        yaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.1)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white')
-        ),
-        legend=dict(
-            font=dict(color='white'),
-            title=dict(text='Compound', font=dict(color='white'))
         )
     )
-    
-    return fig
 
 
-def create_aero_performance_graph(session, teams, race, year, team_colors, empty_layout, session_name='Race'):
+def create_aero_performance_graph(session, lap_table, teams, race, year, team_colors, session_name='Race'):
     """Create an aero performance graph comparing teams' average speed vs top speed."""
-    fig = go.Figure()
+    roster = get_roster(session)
+    quick_laps = lap_table[lap_table['IsQuickLap']]
     
     team_data = []
-    
     for team_name in teams:
         team_avg_speeds = []
         team_top_speeds = []
         
         # Get all drivers from this team
-        for d in session.drivers:
-            driver_info = session.get_driver(d)
-            if driver_info['TeamName'] != team_name:
-                continue
-            
-            abbr = driver_info['Abbreviation']
-            
+        for abbr in roster.team_drivers.get(team_name, []):
             # Get the 10 fastest laps for this driver
-            driver_laps = session.laps.pick_drivers(abbr).pick_quicklaps()
+            driver_laps = quick_laps[quick_laps['Driver'] == abbr]
             
             if driver_laps.empty:
                 continue
@@ -1070,56 +986,15 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
             # Sort by lap time and take top 10
             driver_laps = driver_laps.sort_values('LapTime').head(10)
             
-            # Get telemetry for each lap to calculate average and top speeds
-            for _, lap in driver_laps.iterrows():
-                try:
-                    telemetry = lap.get_telemetry()
-                    if telemetry is None or telemetry.empty:
-                        continue
-                    
-                    if 'Speed' not in telemetry.columns:
-                        continue
-                    
-                    speeds = telemetry['Speed'].dropna()
-                    if len(speeds) == 0:
-                        continue
-                    
-                    avg_speed = speeds.mean()
-                    top_speed = speeds.max()
-                    
-                    if avg_speed > 0 and top_speed > 0:
-                        team_avg_speeds.append(avg_speed)
-                        team_top_speeds.append(top_speed)
-                except Exception as e:
-                    continue
+            # Average and top speed of each lap, precomputed from telemetry in the lap table
+            team_avg_speeds.extend(driver_laps['AvgSpeed'].values)
+            team_top_speeds.extend(driver_laps['TopSpeed'].values)
         
-        if len(team_avg_speeds) == 0:
+        summary = team_speed_summary(team_avg_speeds, team_top_speeds)
+        if summary is None:
             continue
         
-        # Remove outliers using IQR method
-        avg_speeds_arr = np.array(team_avg_speeds)
-        top_speeds_arr = np.array(team_top_speeds)
-        
-        # Remove outliers for average speed
-        q1_avg, q3_avg = np.percentile(avg_speeds_arr, [25, 75])
-        iqr_avg = q3_avg - q1_avg
-        avg_mask = (avg_speeds_arr >= q1_avg - 1.5 * iqr_avg) & (avg_speeds_arr <= q3_avg + 1.5 * iqr_avg)
-        
-        # Remove outliers for top speed
-        q1_top, q3_top = np.percentile(top_speeds_arr, [25, 75])
-        iqr_top = q3_top - q1_top
-        top_mask = (top_speeds_arr >= q1_top - 1.5 * iqr_top) & (top_speeds_arr <= q3_top + 1.5 * iqr_top)
-        
-        # Combine masks
-        valid_mask = avg_mask & top_mask
-        
-        if not np.any(valid_mask):
-            continue
-        
-        # Calculate final averages after removing outliers
-        final_avg_speed = np.mean(avg_speeds_arr[valid_mask])
-        final_top_speed = np.mean(top_speeds_arr[valid_mask])
-        
+        final_avg_speed, final_top_speed = summary
         team_data.append({
             'team': team_name,
             'avg_speed': final_avg_speed,
@@ -1128,8 +1003,7 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
         })
     
     if not team_data:
-        fig.update_layout(title="No telemetry data available for selected teams.", **empty_layout)
-        return fig
+        return empty_figure("No telemetry data available for selected teams.")
     
     # Calculate center point (average of all teams)
     avg_speeds = [d['avg_speed'] for d in team_data]
@@ -1145,7 +1019,9 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
     diag_length = max(x_max - x_min, y_max - y_min) * 1.5
     
     # Diagonal line 1 (top-left to bottom-right)
-    fig.add_trace(go.Scatter(
+    traces = []
+    traces.append(dict(
+        type='scatter',
         x=[center_x - diag_length, center_x + diag_length],
         y=[center_y + diag_length, center_y - diag_length],
         mode='lines',
@@ -1155,7 +1031,8 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
     ))
     
     # Diagonal line 2 (bottom-left to top-right)
-    fig.add_trace(go.Scatter(
+    traces.append(dict(
+        type='scatter',
         x=[center_x - diag_length, center_x + diag_length],
         y=[center_y - diag_length, center_y + diag_length],
         mode='lines',
@@ -1165,7 +1042,8 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
     ))
     
     # Add vertical line at center
-    fig.add_trace(go.Scatter(
+    traces.append(dict(
+        type='scatter',
         x=[center_x, center_x],
         y=[y_min - 5, y_max + 5],
         mode='lines',
@@ -1175,7 +1053,8 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
     ))
     
     # Add horizontal line at center
-    fig.add_trace(go.Scatter(
+    traces.append(dict(
+        type='scatter',
         x=[x_min - 5, x_max + 5],
         y=[center_y, center_y],
         mode='lines',
@@ -1186,7 +1065,8 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
     
     # Add scatter points for each team
     for data in team_data:
-        fig.add_trace(go.Scatter(
+        traces.append(dict(
+            type='scatter',
             x=[data['avg_speed']],
             y=[data['top_speed']],
             mode='markers+text',
@@ -1264,38 +1144,13 @@ def create_aero_performance_graph(session, teams, race, year, team_colors, empty
              showarrow=False, font=dict(color='rgba(255,255,255,0.7)', size=12), xanchor='center', yanchor='bottom'),
     ])
     
-    fig.update_layout(
-        title=dict(
-            text=f"Aero Performance - {race} {year} ({session_name})",
-            font=dict(color='white', size=20)
-        ),
+    return make_figure(
+        traces,
+        f"Aero Performance - {race} {year} ({session_name})",
         xaxis_title='Mean Speed (km/h)',
         yaxis_title='Top Speed (km/h)',
         legend_title="Team",
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.05)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white'),
-            range=[x_min, x_max]
-        ),
-        yaxis=dict(
-            color='white',
-            gridcolor='rgba(255,255,255,0.05)',
-            linecolor='white',
-            tickfont=dict(color='white'),
-            title_font=dict(color='white'),
-            range=[y_min, y_max]
-        ),
-        legend=dict(
-            font=dict(color='white'),
-            title_font=dict(color='white')
-        ),
+        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', range=[x_min, x_max]),
+        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', range=[y_min, y_max]),
         annotations=annotations
     )
-    
-    return fig
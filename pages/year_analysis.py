@@ -1,15 +1,17 @@
 # In pages/year_analysis.py
 
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
 import fastf1
 from fastf1 import plotting
-from fastf1.ergast import Ergast
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
 from app_instance import app
+from utils.cancellation import CancelToken, RequestCancelled, request_generations
+from utils.data_loader import get_season, SEASON_REFRESH_SECONDS
+from utils.figure_cache import figure_cache, figure_key
+from utils.visuals import empty_figure, make_figure
 
 # --- Reusable Navbar Component ---
 navbar = dbc.NavbarSimple(
@@ -123,42 +125,24 @@ def update_driver_options(selected_year):
     if not selected_year:
         return [], {}
     try:
-        # Get driver standings to get list of drivers for the year
-        ergast = Ergast()
-        standings = ergast.get_driver_standings(season=selected_year)
+        # Standings come from the local season store, not a live Ergast request
+        standings = get_season(selected_year)['standings']
         
-        # ErgastMultiResponse has content as list of DataFrames
-        if hasattr(standings, 'content') and standings.content:
-            drivers_df = standings.content[0] if isinstance(standings.content, list) else standings.content
-        else:
-            return [], {}
-        
-        if drivers_df is None or drivers_df.empty:
+        if not standings['driver_id']:
             return [], {}
         
         driver_colors = {}
         options = []
         
-        for _, row in drivers_df.iterrows():
-            driver_code = row['driverCode']
-            # Try to get team color
-            try:
-                constructor = row.get('constructorNames', [])
-                if isinstance(constructor, str):
-                    team_name = constructor
-                elif isinstance(constructor, list) and len(constructor) > 0:
-                    team_name = constructor[0]
-                else:
-                    team_name = 'Unknown'
-                
-                # Get approximate team colors
-                color = get_team_color_by_name(team_name)
-                driver_colors[driver_code] = color
-            except:
-                driver_colors[driver_code] = '#FFFFFF'
+        # Drivers are identified by their Ergast id, older seasons have no driver codes
+        for driver_id, driver_code, given_name, family_name, team_name in zip(
+                standings['driver_id'], standings['code'], standings['given_name'],
+                standings['family_name'], standings['team']):
+            # Get approximate team colors
+            driver_colors[driver_id] = get_team_color_by_name(team_name)
             
-            driver_name = f"{row['givenName']} {row['familyName']}"
-            options.append({'label': f"{driver_code} - {driver_name}", 'value': driver_code})
+            driver_name = f"{given_name} {family_name}"
+            options.append({'label': f"{driver_code} - {driver_name}", 'value': driver_id})
         
         # Add "All Drivers" option at the top
         all_drivers_option = {'label': '⭐ All Drivers', 'value': 'ALL_DRIVERS'}
@@ -192,6 +176,12 @@ def handle_all_drivers_selection(selected_drivers, options):
     return selected_drivers
 
 
+def driver_codes(year):
+    """Display code of every driver in a season's standings, by driver id."""
+    standings = get_season(year)['standings']
+    return dict(zip(standings['driver_id'], standings['code']))
+
+
 def get_team_color_by_name(team_name):
     """Get team color by constructor name."""
     team_colors = {
@@ -220,18 +210,20 @@ def get_team_color_by_name(team_name):
 @app.callback(
     Output('year-analysis-driver-tags-display', 'children'),
     Input('year-analysis-driver-dropdown', 'value'),
-    State('year-analysis-driver-colors-store', 'data')
+    State('year-analysis-driver-colors-store', 'data'),
+    State('year-analysis-year-dropdown', 'value')
 )
-def display_driver_tags(selected_drivers, driver_colors):
-    if not selected_drivers or not driver_colors:
+def display_driver_tags(selected_drivers, driver_colors, year):
+    if not selected_drivers or not driver_colors or not year:
         return []
     
+    codes = driver_codes(year)
     tags = []
     for driver in selected_drivers:
         color = driver_colors.get(driver, '#ffffff')
         tags.append(
             html.Span(
-                driver,
+                codes.get(driver, driver),
                 className='driver-tag',
                 style={
                     'backgroundColor': '#000000',
@@ -251,17 +243,10 @@ def display_driver_tags(selected_drivers, driver_colors):
     State('year-analysis-driver-dropdown', 'value'),
     State('year-analysis-year-dropdown', 'value'),
     State('year-analysis-chart-dropdown', 'value'),
-    State('year-analysis-driver-colors-store', 'data')
+    State('year-analysis-driver-colors-store', 'data'),
+    State('client-id', 'data')
 )
-def update_graph(n_clicks, drivers, year, chart_type, driver_colors):
-    empty_layout = dict(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        yaxis=dict(color='white', gridcolor='rgba(255,255,255,0.1)', linecolor='white', rangemode='tozero'),
-        font=dict(color='white')
-    )
-    
+def update_graph(n_clicks, drivers, year, chart_type, driver_colors, client_id=None):
     # Styles for showing/hiding
     graph_hidden = {'height': '80vh', 'display': 'none'}
     graph_visible = {'height': '80vh', 'display': 'block'}
@@ -269,150 +254,100 @@ def update_graph(n_clicks, drivers, year, chart_type, driver_colors):
     empty_visible = {}
     
     if n_clicks is None or n_clicks == 0:
-        fig = go.Figure()
-        fig.update_layout(title="", **empty_layout)
-        return fig, graph_hidden, empty_visible
+        return empty_figure(), graph_hidden, empty_visible
     
     if not drivers or not year:
-        fig = go.Figure()
-        fig.update_layout(title="Please select Year and at least one Driver to sketch the graph.", **empty_layout)
-        return fig, graph_visible, empty_hidden
+        return empty_figure("Please select Year and at least one Driver to sketch the graph."), graph_visible, empty_hidden
+    
+    key = figure_key('year-analysis', year, selection=drivers, chart=chart_type)
+    cached = figure_cache.get(key)
+    if cached is not None:
+        return cached, graph_visible, empty_hidden
     
+    # A newer sketch from this tab makes this one stale
+    token = request_generations.start(client_id, 'year-analysis')
     try:
         if chart_type == 'Points Graph':
-            result = create_points_graph(year, drivers, driver_colors, empty_layout)
+            result = create_points_graph(year, drivers, driver_colors, token, key)
             return result, graph_visible, empty_hidden
         else:
-            fig = go.Figure()
-            fig.update_layout(title="Unknown chart type selected.", **empty_layout)
-            return fig, graph_visible, empty_hidden
+            return empty_figure("Unknown chart type selected."), graph_visible, empty_hidden
             
+    except RequestCancelled:
+        # The browser discards this response anyway
+        return no_update, no_update, no_update
     except Exception as e:
         print(f"Error generating graph: {e}")
-        fig = go.Figure()
-        fig.update_layout(
-            title=f"Error sketching graph: {e}",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white')
-        )
-        return fig, graph_visible, empty_hidden
+        return empty_figure(f"Error sketching graph: {e}"), graph_visible, empty_hidden
 
 
-def create_points_graph(year, drivers, driver_colors, empty_layout):
-    """Create a cumulative points graph across the season."""
-    fig = go.Figure()
-    
+def create_points_graph(year, drivers, driver_colors, token=None, cache_key=None):
+    """Create a cumulative points graph across the season.
+
+    `token` (a CancelToken) is checked after loading the season and between drivers.
+    The figure is stored in the figure cache under `cache_key` when given.
+    """
+    token = token or CancelToken()
     try:
-        ergast = Ergast()
-        
-        # Get race schedule for the year
-        schedule = ergast.get_race_schedule(season=year)
-        
-        # ErgastSimpleResponse has content as DataFrame directly
-        if hasattr(schedule, 'content'):
-            races_df = schedule.content
-        else:
-            races_df = schedule
+        # Points matrix from the local season store (all rounds, independent of how many drivers are plotted)
+        season = get_season(year)
+        token.check()
         
-        if races_df is None or races_df.empty:
-            fig.update_layout(title="Could not load race schedule.", **empty_layout)
-            return fig
+        if not season['race_names']:
+            return empty_figure("Could not load race results.")
         
-        race_names = races_df['raceName'].tolist()
-        race_rounds = races_df['round'].tolist()
+        race_names = season['race_names']
+        cumulative = np.cumsum(season['points'], axis=1)
+        driver_rows = {driver_id: i for i, driver_id in enumerate(season['drivers'])}
+        codes = dict(zip(season['standings']['driver_id'], season['standings']['code']))
         
         # Track which team colors have been used (for dashed lines for teammates)
         team_color_used = {}
         
-        # Get results for each driver
-        for driver_code in drivers:
-            cumulative_points = []
-            total_points = 0
-            races_with_data = []
+        traces = []
+        for driver_id in drivers:
+            token.check()
+            row = driver_rows.get(driver_id)
+            # Drivers without a classified result still get a flat line at zero
+            cumulative_points = cumulative[row] if row is not None else np.zeros(len(race_names))
             
-            # Get race results for each round
-            for i, round_num in enumerate(race_rounds):
-                try:
-                    race_results = ergast.get_race_results(season=year, round=round_num)
-                    
-                    # ErgastMultiResponse has content as list of DataFrames
-                    if hasattr(race_results, 'content') and race_results.content:
-                        results_df = race_results.content[0] if isinstance(race_results.content, list) else race_results.content
-                    else:
-                        continue
-                    
-                    if results_df is not None and not results_df.empty:
-                        # Find this driver's points
-                        driver_result = results_df[results_df['driverCode'] == driver_code]
-                        if not driver_result.empty:
-                            points = driver_result['points'].values[0]
-                            total_points += float(points)
-                        
-                        cumulative_points.append(total_points)
-                        races_with_data.append(race_names[i])
-                except Exception as e:
-                    # If no data for this race yet (future race), continue checking
-                    print(f"No results for round {round_num}: {e}")
-                    continue
+            color = driver_colors.get(driver_id, '#FFFFFF')
             
-            if cumulative_points:
-                color = driver_colors.get(driver_code, '#FFFFFF')
-                
-                # Differentiate teammates with dashed lines
-                line_dash = 'solid'
-                if color in team_color_used:
-                    line_dash = 'dash'
-                else:
-                    team_color_used[color] = True
-                
-                fig.add_trace(go.Scatter(
-                    x=races_with_data,
-                    y=cumulative_points,
-                    mode='lines+markers',
-                    name=driver_code,
-                    line=dict(color=color, width=3, dash=line_dash),
-                    marker=dict(size=8, color=color)
-                ))
+            # Differentiate teammates with dashed lines
+            line_dash = 'solid'
+            if color in team_color_used:
+                line_dash = 'dash'
+            else:
+                team_color_used[color] = True
+            
+            traces.append(dict(
+                type='scatter',
+                x=race_names,
+                y=cumulative_points,
+                mode='lines+markers',
+                name=codes.get(driver_id, driver_id),
+                line=dict(color=color, width=3, dash=line_dash),
+                marker=dict(size=8, color=color)
+            ))
         
-        fig.update_layout(
-            title=dict(
-                text=f"Championship Points - {year}",
-                font=dict(color='white', size=20)
-            ),
+        fig = make_figure(
+            traces,
+            f"Championship Points - {year}",
             xaxis_title='Race',
             yaxis_title='Cumulative Points',
             legend_title="Driver",
-            showlegend=True,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(
-                color='white',
-                gridcolor='rgba(255,255,255,0.1)',
-                linecolor='white',
-                tickfont=dict(color='white'),
-                title_font=dict(color='white'),
-                tickangle=45
-            ),
-            yaxis=dict(
-                color='white',
-                gridcolor='rgba(255,255,255,0.1)',
-                linecolor='white',
-                tickfont=dict(color='white'),
-                title_font=dict(color='white')
-            ),
-            legend=dict(
-                font=dict(color='white'),
-                title_font=dict(color='white')
-            )
+            xaxis=dict(tickangle=45)
         )
         
+        # A season in progress gains rounds, so its figures expire with the season refresh
+        if cache_key is not None:
+            figure_cache.put(cache_key, fig, ttl=None if season.get('complete') else SEASON_REFRESH_SECONDS)
         return fig
         
+    except RequestCancelled:
+        raise
     except Exception as e:
         print(f"Error creating points graph: {e}")
         import traceback
         traceback.print_exc()
-        fig.update_layout(title=f"Error: {e}", **empty_layout)
-        return fig
-
+        return empty_figure(f"Error: {e}")
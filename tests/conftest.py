@@ -0,0 +1,18 @@
+# In tests/conftest.py
+
+import os
+import sys
+
+import pytest
+from fastf1 import plotting
+
+# The app is not an installed package; import its modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.synthetic import synthetic_team_color
+
+
+@pytest.fixture
+def team_colors(monkeypatch):
+    """Fixed team colors for synthetic sessions, in place of FastF1's per-season lookup."""
+    monkeypatch.setattr(plotting, 'get_team_color', synthetic_team_color)
@@ -0,0 +1,118 @@
+# In tests/synthetic.py
+"""Synthetic FastF1 sessions for the tests and benchmarks, built without network access.
+
+Laps follow a smooth speed profile around a 5 km circuit; car and position
+data are sampled at about 4 Hz on independent clocks, like the live feeds.
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from fastf1 import plotting
+from fastf1.core import Session, Laps, Telemetry
+
+
+TEAMS = ['Red Bull Racing', 'Ferrari', 'Mercedes', 'McLaren', 'Aston Martin',
+         'Alpine', 'Williams', 'Haas F1 Team', 'RB', 'Kick Sauber']
+COLORS = ['#3671C6', '#E8002D', '#27F4D2', '#FF8000', '#229971', '#FF87BC', '#64C4FF', '#B6BABD', '#6692FF', '#52E252']
+TRACK_LEN = 5000.0
+
+
+def synthetic_team_color(team, session=None, **kwargs):
+    """Stand-in for plotting.get_team_color, which looks colors up by season."""
+    return COLORS[TEAMS.index(team)] if team in TEAMS else '#ffffff'
+
+
+@contextmanager
+def synthetic_team_colors():
+    """Serve the fixed synthetic team colors from plotting.get_team_color while active."""
+    original = plotting.get_team_color
+    plotting.get_team_color = synthetic_team_color
+    try:
+        yield
+    finally:
+        plotting.get_team_color = original
+
+
+def _speed_profile(frac, skill):
+    return 180 + 110 * np.sin(2 * np.pi * 5 * frac) ** 2 + 20 * np.cos(2 * np.pi * 3 * frac) + skill
+
+
+def make_session(n_drivers=20, n_laps=15, name='Qualifying', hz=4.0, seed=0):
+    """A loaded-looking Session with laps, results, car data and position data."""
+    rng = np.random.default_rng(seed)
+    s = Session.__new__(Session)
+    s.name = name
+    s.f1_api_support = True
+    s.event = pd.Series({'EventName': 'Synthetic Grand Prix', 'RoundNumber': 1,
+                         'EventDate': pd.Timestamp('2024-06-01'), 'Location': 'Synth'})
+    s.date = pd.Timestamp('2024-06-01 14:00')
+    s._t0_date = pd.Timestamp('2024-06-01 13:00')
+    abbrs = [f"D{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(n_drivers)]
+    numbers = [str(i + 1) for i in range(n_drivers)]
+    teams = [TEAMS[i // 2 % len(TEAMS)] for i in range(n_drivers)]
+    s._results = pd.DataFrame({'DriverNumber': numbers, 'Abbreviation': abbrs,
+                               'FullName': [f"Driver {a}" for a in abbrs], 'TeamName': teams})
+
+    lap_rows = []
+    horizon = 700 + n_laps * 130
+    car_grid = np.cumsum(rng.uniform(0.8, 1.2, int(horizon * hz)) / hz)
+    pos_grid = np.cumsum(rng.uniform(0.8, 1.2, int(horizon * hz)) / hz)
+    car, pos = {}, {}
+    for i, (num, abbr, team) in enumerate(zip(numbers, abbrs, teams)):
+        skill = rng.normal(0, 3)
+        t = 600.0 + rng.uniform(0, 30)
+        lap_tt, lap_d, lap_v = [], [], []
+        best = np.inf
+        for lap in range(1, n_laps + 1):
+            slow = rng.uniform(0, 25) if rng.random() < 0.2 else 0
+            # Lap clock from integrating the speed profile over distance
+            d = np.linspace(0, TRACK_LEN, 2000)
+            v = np.maximum(_speed_profile(d / TRACK_LEN, skill + rng.normal(0, 1)) - slow, 60) / 3.6
+            dt = np.diff(d) / (0.5 * (v[1:] + v[:-1]))
+            tt = np.concatenate([[0], np.cumsum(dt)])
+            lap_time = tt[-1]
+            s1, s2 = np.interp(TRACK_LEN / 3, d, tt), np.interp(2 * TRACK_LEN / 3, d, tt)
+            pb = lap_time < best
+            best = min(best, lap_time)
+            lap_rows.append(dict(
+                Time=pd.Timedelta(seconds=t + lap_time), Driver=abbr, DriverNumber=num,
+                LapTime=pd.Timedelta(seconds=lap_time), LapNumber=float(lap), Stint=float(1 + lap // 8),
+                PitOutTime=pd.NaT, PitInTime=pd.NaT,
+                Sector1Time=pd.Timedelta(seconds=s1), Sector2Time=pd.Timedelta(seconds=s2 - s1),
+                Sector3Time=pd.Timedelta(seconds=lap_time - s2),
+                SpeedI1=float(v.max() * 3.6 - 5), SpeedI2=float(v.max() * 3.6 - 8), SpeedFL=float(v.max() * 3.6 - 3),
+                SpeedST=float(v.max() * 3.6),
+                IsPersonalBest=bool(pb), Compound=['SOFT', 'MEDIUM', 'HARD'][lap // 8 % 3], TyreLife=float(lap % 8 + 1),
+                FreshTyre=True, Team=team, LapStartTime=pd.Timedelta(seconds=t),
+                LapStartDate=s._t0_date + pd.Timedelta(seconds=t), TrackStatus='1', Position=np.nan,
+                Deleted=False, DeletedReason='', FastF1Generated=False, IsAccurate=True))
+            lap_tt.append(t + tt)
+            lap_d.append(d + (lap - 1) * TRACK_LEN)
+            lap_v.append(v)
+            t += lap_time
+        T = np.concatenate(lap_tt); D = np.concatenate(lap_d); V = np.concatenate(lap_v)
+        order = np.argsort(T, kind='stable'); T, D, V = T[order], D[order], V[order]
+        for store, grid, kind in ((car, car_grid, 'car'), (pos, pos_grid, 'pos')):
+            ts = grid[(grid >= T[0]) & (grid <= T[-1])]
+            dist = np.interp(ts, T, D)
+            frac = (dist % TRACK_LEN) / TRACK_LEN
+            if kind == 'car':
+                spd = np.interp(ts, T, V) * 3.6
+                df = pd.DataFrame({'SessionTime': ts, 'Speed': spd, 'RPM': 8000 + 40 * spd,
+                                   'nGear': np.clip(spd // 45 + 1, 1, 8), 'Throttle': np.clip(spd / 3, 0, 100),
+                                   'Brake': np.gradient(spd) < -1, 'DRS': 0, 'Source': 'car'})
+            else:
+                th = 2 * np.pi * frac
+                r = 3000 + 600 * np.sin(3 * th)
+                df = pd.DataFrame({'SessionTime': ts, 'X': r * np.cos(th), 'Y': r * np.sin(th),
+                                   'Z': 0.0, 'Status': 'OnTrack', 'Source': 'pos'})
+            df['SessionTime'] = pd.to_timedelta(df['SessionTime'], unit='s')
+            df['Date'] = s._t0_date + df['SessionTime']
+            df['Time'] = df['SessionTime'] - df['SessionTime'].iloc[0]
+            store[num] = Telemetry(df, session=s, driver=num, drop_unknown_channels=True)
+    s._laps = Laps(pd.DataFrame(lap_rows), session=s)
+    s._car_data = car
+    s._pos_data = pos
+    return s
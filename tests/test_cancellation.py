@@ -0,0 +1,70 @@
+# In tests/test_cancellation.py
+
+import threading
+
+import pytest
+
+from utils.cancellation import CancelToken, RequestCancelled, RequestGenerations
+
+
+def test_newer_request_aborts_older_one():
+    generations = RequestGenerations()
+    started, resume = threading.Event(), threading.Event()
+    outcome = {}
+
+    def build(token):
+        # Stands in for a graph builder checking its token between drivers
+        token.check()
+        started.set()
+        resume.wait(5)
+        try:
+            token.check()
+            outcome['older'] = 'finished'
+        except RequestCancelled:
+            outcome['older'] = 'cancelled'
+
+    older = threading.Thread(target=build, args=(generations.start('client', 'graph'),))
+    older.start()
+    assert started.wait(5)
+
+    newer = generations.start('client', 'graph')
+    resume.set()
+    older.join(5)
+
+    assert outcome['older'] == 'cancelled'
+    newer.check()
+    assert generations.stats() == {'clients': 1, 'started': 2, 'cancelled': 1}
+
+
+def test_requests_of_other_clients_and_graphs_are_independent():
+    generations = RequestGenerations()
+    token = generations.start('client', 'graph')
+    generations.start('client', 'other-graph')
+    generations.start('other-client', 'graph')
+    assert not token.cancelled()
+
+    generations.start('client', 'graph')
+    assert token.cancelled()
+    with pytest.raises(RequestCancelled):
+        token.check()
+
+
+def test_requests_without_client_are_never_cancelled():
+    generations = RequestGenerations()
+    token = generations.start(None, 'graph')
+    generations.start(None, 'graph')
+    token.check()
+    CancelToken().check()
+    assert generations.stats()['started'] == 0
+
+
+def test_forgotten_clients_can_no_longer_cancel():
+    generations = RequestGenerations(max_entries=2)
+    token = generations.start('first', 'graph')
+    generations.start('second', 'graph')
+    generations.start('third', 'graph')
+
+    assert generations.stats()['clients'] == 2
+    # 'first' was evicted, so its next request restarts at generation 1
+    generations.start('first', 'graph')
+    assert not token.cancelled()
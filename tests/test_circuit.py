@@ -0,0 +1,63 @@
+# In tests/test_circuit.py
+
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastf1.events import Event
+from fastf1.mvapi import CircuitInfo
+
+import utils.circuit as circuit
+from tests.synthetic import make_session
+from utils.lap_tensor import build_lap_tensor
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path, team_colors):
+    monkeypatch.setattr(circuit, 'CIRCUIT_DIR', str(tmp_path))
+    monkeypatch.setattr(circuit, '_layouts', {})
+    session = make_session(n_drivers=3, n_laps=2)
+    session.event = Event(session.event.to_dict(), year=2024)
+    session._session_info = {'Meeting': {'Circuit': {'Key': 7, 'ShortName': 'Synth'}}}
+    return session
+
+
+def corners_at(x, y):
+    frame = pd.DataFrame({'X': x, 'Y': y, 'Number': np.arange(1, len(x) + 1), 'Letter': '',
+                          'Angle': 0.0, 'Distance': np.nan})
+    return CircuitInfo(corners=frame, marshal_lights=frame.iloc[:0], marshal_sectors=frame.iloc[:0], rotation=0.0)
+
+
+def test_corners_are_placed_on_the_centreline(session, monkeypatch):
+    tensor = build_lap_tensor(session)
+    distance, x, y = circuit._reference_path(tensor, circuit._reference_row(tensor))
+    picks = [len(x) // 4, len(x) // 2]
+    requested = []
+
+    def get_circuit_info(year, circuit_key):
+        requested.append((year, circuit_key))
+        return corners_at(x[picks], y[picks])
+
+    monkeypatch.setattr(circuit, 'get_circuit_info', get_circuit_info)
+    geometry = circuit.get_circuit_geometry(session, tensor, '2024_synthetic_Q')
+
+    # No telemetry of the session is needed, only its circuit key
+    assert requested == [(2024, 7)]
+    assert geometry.corners_loaded
+    assert list(geometry.corner_labels) == ['1', '2']
+    np.testing.assert_allclose(geometry.corner_distance, distance[picks])
+    assert len(glob.glob(os.path.join(circuit.CIRCUIT_DIR, '*.npz'))) == 1
+
+
+def test_geometry_without_circuit_info_is_not_stored(session, monkeypatch):
+    monkeypatch.setattr(circuit, 'get_circuit_info', lambda year, circuit_key: None)
+    tensor = build_lap_tensor(session)
+    geometry = circuit.get_circuit_geometry(session, tensor, '2024_synthetic_Q')
+
+    assert geometry is not None and not geometry.corners_loaded
+    assert len(geometry.corner_labels) == 0
+    assert glob.glob(os.path.join(circuit.CIRCUIT_DIR, '*.npz')) == []
+    # The next session at the circuit builds its own geometry instead of reusing this one
+    assert circuit._layouts.get('synth', []) == []
@@ -0,0 +1,100 @@
+# In tests/test_figure_cache.py
+
+import os
+
+import utils.figure_cache as fc
+from utils.figure_cache import FigureCache, figure_key
+
+
+def figure(n):
+    """A graph output of roughly n bytes of JSON."""
+    return {'data': [{'type': 'scatter', 'name': 'x' * n}], 'layout': {}}
+
+
+def test_key_keeps_selection_order_and_ignores_event_case():
+    assert figure_key('page', 2024, 'Monaco', 'Q', ['VER', 'HAM']) == \
+        figure_key('page', 2024, ' monaco ', 'Q', ('VER', 'HAM'))
+    assert figure_key('page', 2024, 'Monaco', 'Q', ['VER', 'HAM']) != \
+        figure_key('page', 2024, 'Monaco', 'Q', ['HAM', 'VER'])
+    assert figure_key('page', 2024, 'Monaco', 'Q', ['VER'], render_mode='full') != \
+        figure_key('page', 2024, 'Monaco', 'Q', ['VER'], render_mode='fast')
+
+
+def test_round_trip_and_miss():
+    cache = FigureCache(disk_bytes=0)
+    assert cache.get('a') is None
+    cache.put('a', (figure(10), {'view': 1}))
+    assert cache.get('a') == [figure(10), {'view': 1}]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_lru_evicts_by_bytes(tmp_path):
+    cache = FigureCache(max_bytes=2500, disk_dir=str(tmp_path), disk_bytes=0)
+    for key in 'abc':
+        cache.put(key, figure(1000))
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    # 'b' was just used, so 'c' is now the least recently used
+    cache.put('d', figure(1000))
+    assert cache.get('c') is None
+    assert cache.get('b') is not None and cache.get('d') is not None
+    assert cache.stats()['bytes'] <= 2500
+
+
+def test_evicted_entries_spill_to_disk_and_are_promoted(tmp_path):
+    cache = FigureCache(max_bytes=1500, disk_dir=str(tmp_path), disk_bytes=1024 * 1024)
+    cache.put('a', figure(1000))
+    cache.put('b', figure(1000))
+    assert cache.stats()['spills'] == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    assert cache.get('a') == figure(1000)
+    stats = cache.stats()
+    assert stats['disk_hits'] == 1
+    # Promoting 'a' back into memory spills 'b'
+    assert 'a' in cache._entries and 'b' not in cache._entries
+    assert cache.get('a') == figure(1000)
+    assert cache.stats()['hits'] == 1
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = FigureCache(max_bytes=1, disk_dir=str(tmp_path), disk_bytes=2500)
+    for key in 'abcd':
+        cache.put(key, figure(1000))
+    # 'd' stays in memory, the disk keeps only the newest spills within its budget
+    assert len(os.listdir(tmp_path)) == 2
+    assert cache.get('a') is None
+    assert cache.get('c') is not None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fc.time, 'time', lambda: now[0])
+    cache = FigureCache(max_bytes=1500, disk_dir=str(tmp_path), disk_bytes=1024 * 1024)
+    cache.put('a', figure(10), ttl=60)
+    cache.put('b', figure(10))
+    now[0] += 30
+    assert cache.get('a') is not None
+    now[0] += 31
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+
+    # Expiry survives a spill to disk
+    cache.put('c', figure(1000), ttl=60)
+    cache.put('d', figure(1000))
+    assert 'c' not in cache._entries
+    now[0] += 61
+    assert cache.get('c') is None
+
+
+def test_forked_jobs_write_through_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(fc, '_forked', True)
+    job_cache = FigureCache(disk_dir=str(tmp_path))
+    job_cache.put('a', figure(10))
+    assert job_cache.stats()['figures'] == 0
+
+    # Another process sharing the directory serves the job's output
+    monkeypatch.setattr(fc, '_forked', False)
+    web_cache = FigureCache(disk_dir=str(tmp_path))
+    assert web_cache.get('a') == figure(10)
+    assert web_cache.stats()['disk_hits'] == 1
@@ -0,0 +1,125 @@
+# In tests/test_lap_deltas.py
+
+import numpy as np
+import pytest
+
+from tests.synthetic import make_session, synthetic_team_colors
+from utils.lap_tensor import build_lap_tensor
+from utils.telemetry import DELTA_RESOLUTIONS, compute_lap_deltas
+
+
+# --- Reference: the per-driver delta loop and sector correction before vectorization ---
+
+def apply_sector_corrections(raw_delta, common_distance, ref_sectors, drv_sectors, sector_distances, drv_laptime, ref_laptime):
+    """Piecewise linear correction so the delta matches the official gaps at S1, S2 and the lap end."""
+    n_points = len(common_distance)
+    correction_points = [(0, 0)]
+    for name in ('S1', 'S2'):
+        if name in sector_distances and name in drv_sectors and name in ref_sectors:
+            correction_points.append((sector_distances[name], drv_sectors[name] - ref_sectors[name]))
+    correction_points.append((common_distance[-1], drv_laptime - ref_laptime))
+    correction_points.sort(key=lambda x: x[0])
+
+    corrections_at_points = []
+    for dist, expected in correction_points:
+        idx = min(np.searchsorted(common_distance, dist), n_points - 1)
+        corrections_at_points.append((dist, expected - raw_delta[idx]))
+
+    correction_array = np.zeros(n_points)
+    for (dist_start, corr_start), (dist_end, corr_end) in zip(corrections_at_points, corrections_at_points[1:]):
+        idx_start = np.searchsorted(common_distance, dist_start)
+        idx_end = np.searchsorted(common_distance, dist_end)
+        if idx_end > idx_start:
+            correction_array[idx_start:idx_end] = np.linspace(corr_start, corr_end, idx_end - idx_start)
+    correction_array[-1] = corrections_at_points[-1][1]
+    return raw_delta + correction_array
+
+
+def reference_lap_deltas(tensor, drivers, n_points):
+    """Deltas of `drivers` to the fastest of them, computed one driver at a time."""
+    telemetry, lap_times, sectors = {}, {}, {}
+    for abbr in drivers:
+        row = tensor.rows([abbr])[0]
+        distance, clock = tensor.driver_channel(abbr, 'Time')
+        telemetry[abbr] = (np.asarray(distance, dtype=float), np.asarray(clock, dtype=float))
+        lap_times[abbr] = tensor.lap_time[row]
+        s1, s2, s3 = tensor.sector_times[row]
+        sectors[abbr] = None if np.isnan([s1, s2, s3]).any() else {'S1': s1, 'S2': s2, 'S3': s3}
+
+    ref = min(lap_times, key=lap_times.get)
+    ref_distance, ref_clock = telemetry[ref]
+    common_distance = np.linspace(0, min(t[0][-1] for t in telemetry.values()), n_points)
+    ref_time = np.interp(common_distance, ref_distance, ref_clock)
+
+    sector_distances = {}
+    if sectors[ref]:
+        for name, sector_time in sectors[ref].items():
+            idx = np.searchsorted(ref_clock, sector_time)
+            if idx < len(ref_distance):
+                sector_distances[name] = ref_distance[idx]
+
+    deltas = []
+    for abbr in drivers:
+        raw = ref_time - np.interp(common_distance, *telemetry[abbr])
+        if sectors[ref] and sectors[abbr] and sector_distances:
+            deltas.append(apply_sector_corrections(raw, common_distance, sectors[ref], sectors[abbr],
+                                                   sector_distances, lap_times[abbr], lap_times[ref]))
+        else:
+            deltas.append(raw + np.linspace(0, (lap_times[abbr] - lap_times[ref]) - raw[-1], n_points))
+    return common_distance, np.array(deltas)
+
+
+def vectorized_lap_deltas(tensor, drivers, n_points):
+    rows = tensor.rows(drivers)
+    lap_time = tensor.lap_time[rows]
+    common_distance, deltas, _ = compute_lap_deltas(tensor.step, tensor.channel('Time', rows), tensor.lap_distance[rows],
+                                                    lap_time, tensor.sector_times[rows], int(np.argmin(lap_time)), n_points)
+    return common_distance, deltas
+
+
+def grid_points(tensor):
+    """Grid points of the shortest lap, where requested resolutions are capped."""
+    return int(tensor.last_index(tensor.rows(tensor.drivers)).min()) + 1
+
+
+# --- Tests ---
+
+@pytest.fixture(scope='module')
+def tensor():
+    with synthetic_team_colors():
+        return build_lap_tensor(make_session(20, 6, 'Qualifying'))
+
+
+@pytest.mark.parametrize('n_points', DELTA_RESOLUTIONS)
+def test_matches_sector_correction(tensor, n_points):
+    n_points = min(n_points, grid_points(tensor))
+    common, expected = reference_lap_deltas(tensor, tensor.drivers, n_points)
+    got_common, got = vectorized_lap_deltas(tensor, tensor.drivers, n_points)
+    np.testing.assert_allclose(got_common, common, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(got, expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('n_points', DELTA_RESOLUTIONS)
+def test_missing_sector_ramps_to_lap_time_gap(tensor, n_points):
+    n_points = min(n_points, grid_points(tensor))
+    # Drivers without an S2 time only get the linear ramp to their lap time gap
+    rows = tensor.rows(tensor.drivers)
+    saved = tensor.sector_times.copy()
+    missing = [row for row in rows if tensor.lap_time[row] > tensor.lap_time[rows].min()][:3]
+    try:
+        tensor.sector_times[missing, 1] = np.nan
+        common, expected = reference_lap_deltas(tensor, tensor.drivers, n_points)
+        _, got = vectorized_lap_deltas(tensor, tensor.drivers, n_points)
+    finally:
+        tensor.sector_times[:] = saved
+    np.testing.assert_allclose(got, expected, rtol=0, atol=1e-9)
+
+    lap_gap = tensor.lap_time[rows] - tensor.lap_time[rows].min()
+    np.testing.assert_allclose(got[:, -1], lap_gap, rtol=0, atol=1e-9)
+
+
+def test_resolution_is_capped_at_the_grid(tensor):
+    n_grid = grid_points(tensor)
+    common, deltas = vectorized_lap_deltas(tensor, tensor.drivers, n_grid * 4)
+    assert len(common) == n_grid and deltas.shape == (len(tensor.drivers), n_grid)
+    np.testing.assert_allclose(np.diff(common), tensor.step)
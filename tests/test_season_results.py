@@ -0,0 +1,225 @@
+# In tests/test_season_results.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.data_loader as dl
+from utils.data_loader import build_points_matrix, fetch_season_results, fetch_standings, merge_points_matrices
+
+
+# --- Local Ergast stand-in ---
+
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1] + [0] * 10
+IDS = [f"driver_{i:02d}" for i in range(20)]
+
+
+def season_rows(n_rounds, seed=0, codes=True):
+    """One row per driver per round: round, raceName, driverId, driverCode, points."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for rnd in range(1, n_rounds + 1):
+        for position, driver_id in enumerate(rng.permutation(IDS)):
+            code = f"D{driver_id[-2:]}" if codes else np.nan
+            rows.append((rnd, f"Race {rnd}", driver_id, code, float(POINTS[position])))
+    return pd.DataFrame(rows, columns=['round', 'raceName', 'driverId', 'driverCode', 'points'])
+
+
+class FakeResponse:
+    """One page of race results, grouped by round like Ergast's multi-response."""
+
+    def __init__(self, ergast, rows, offset, limit):
+        self._ergast, self._rows, self._offset, self._limit = ergast, rows, offset, limit
+        page = rows.iloc[offset:offset + limit]
+        groups = list(page.groupby('round', sort=True))
+        self.description = pd.DataFrame({
+            'round': [rnd for rnd, _ in groups],
+            'raceName': [group['raceName'].iloc[0] for _, group in groups],
+        })
+        self.content = [group[['driverId', 'driverCode', 'points']].reset_index(drop=True) for _, group in groups]
+
+    def get_next_result_page(self):
+        if self._offset + self._limit >= len(self._rows):
+            raise ValueError("no more pages")
+        return self._ergast._page(self._rows, self._offset + self._limit, self._limit)
+
+
+class FakeStandings:
+    def __init__(self, rows):
+        drivers = rows.drop_duplicates('driverId')
+        self.content = [pd.DataFrame({
+            'driverId': drivers['driverId'].to_numpy(),
+            'driverCode': drivers['driverCode'].to_numpy(),
+            'givenName': 'Given',
+            'familyName': [f"O'Family{driver_id[-2:]}" for driver_id in drivers['driverId']],
+            'constructorNames': [['Ferrari']] * len(drivers),
+        })] if len(drivers) else []
+
+
+class FakeErgast:
+    """Ergast stand-in serving the given rows; `raced` is how many rounds have been run."""
+
+    def __init__(self, rows, raced=None):
+        self.rows = rows
+        self.raced = rows['round'].max() if raced is None and len(rows) else (raced or 0)
+        self.pages = 0
+        self.standings_calls = 0
+
+    def _page(self, rows, offset, limit):
+        self.pages += 1
+        return FakeResponse(self, rows, offset, limit)
+
+    def get_race_results(self, season=None, round=None, limit=30):
+        rows = self.rows[self.rows['round'] <= self.raced]
+        rows = rows if round is None else rows[rows['round'] == round]
+        return self._page(rows.reset_index(drop=True), 0, limit)
+
+    def get_driver_standings(self, season=None):
+        self.standings_calls += 1
+        return FakeStandings(self.rows[self.rows['round'] <= self.raced])
+
+    def get_race_schedule(self, season=None):
+        n_rounds = int(self.rows['round'].max())
+        today = pd.Timestamp.now().normalize()
+        return pd.DataFrame({
+            'round': range(1, n_rounds + 1),
+            'raceDate': [today + pd.Timedelta(days=7 * (rnd - self.raced)) for rnd in range(1, n_rounds + 1)],
+        })
+
+
+# --- Tests ---
+
+def test_rounds_split_across_pages_are_merged():
+    rows = season_rows(24)
+    ergast = FakeErgast(rows)
+    results = fetch_season_results(2024, ergast)
+
+    # 480 rows in pages of 100: rounds 5, 10, 15 and 20 straddle a page boundary
+    assert ergast.pages == 5
+    assert len(results) == len(rows)
+    assert results['round'].is_monotonic_increasing
+
+    matrix = build_points_matrix(results)
+    expected = rows.groupby('driverId')['points'].sum()
+    totals = dict(zip(matrix['drivers'], matrix['points'].sum(axis=1)))
+    assert totals == pytest.approx(expected.to_dict())
+    assert list(matrix['rounds']) == list(range(1, 25))
+    assert matrix['race_names'] == [f"Race {rnd}" for rnd in range(1, 25)]
+
+
+def test_cumulative_points_per_round():
+    rows = season_rows(6, seed=1)
+    matrix = build_points_matrix(fetch_season_results(2024, FakeErgast(rows)))
+    by_round = rows.pivot_table(index='driverId', columns='round', values='points', aggfunc='sum')
+    np.testing.assert_allclose(np.cumsum(matrix['points'], axis=1),
+                               np.cumsum(by_round.loc[matrix['drivers']].to_numpy(), axis=1))
+
+
+def test_selected_rounds_only():
+    rows = season_rows(10)
+    results = fetch_season_results(2024, FakeErgast(rows), rounds=[3, 7])
+    assert sorted(results['round'].unique()) == [3, 7]
+    assert len(results) == 2 * len(IDS)
+
+
+def test_empty_season():
+    results = fetch_season_results(2025, FakeErgast(season_rows(0)))
+    assert results.empty
+    assert list(results.columns) == ['round', 'raceName', 'driverId', 'driverCode', 'points']
+
+
+def test_drivers_without_codes_are_kept():
+    # Ergast has no driver codes before 2005
+    rows = season_rows(3, codes=False)
+    matrix = build_points_matrix(fetch_season_results(1998, FakeErgast(rows)))
+    assert matrix['drivers'] == IDS
+    assert matrix['points'].sum() == rows['points'].sum()
+
+    standings = fetch_standings(1998, FakeErgast(rows))
+    assert sorted(standings['driver_id']) == IDS
+    assert set(standings['code']) == {'OFA'}
+
+
+def test_merge_points_matrices():
+    old = {'drivers': ['a', 'b'], 'rounds': np.array([1, 2]), 'race_names': ['R1', 'R2'],
+           'points': np.array([[25.0, 18.0], [18.0, 25.0]])}
+    new = {'drivers': ['a', 'c'], 'rounds': np.array([2, 3]), 'race_names': ['R2 (corrected)', 'R3'],
+           'points': np.array([[15.0, 25.0], [25.0, 18.0]])}
+    merged = merge_points_matrices(old, new)
+
+    assert merged['drivers'] == ['a', 'b', 'c']
+    assert list(merged['rounds']) == [1, 2, 3]
+    assert merged['race_names'] == ['R1', 'R2 (corrected)', 'R3']
+    # Round 2 is taken from `new` only, so 'b' loses its old round 2 result
+    np.testing.assert_array_equal(merged['points'], [[25, 15, 25], [18, 0, 0], [0, 25, 18]])
+
+    empty = {'drivers': [], 'rounds': np.array([], dtype=int), 'race_names': [], 'points': np.zeros((0, 0))}
+    np.testing.assert_array_equal(merge_points_matrices(empty, old)['points'], old['points'])
+
+
+# --- Season store ---
+
+@pytest.fixture
+def season_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(dl, 'SEASON_STORE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_completed_season_is_stored_once(season_store):
+    rows = season_rows(5)
+    data = dl._refresh_season(2020, FakeErgast(rows))
+    assert data['complete']
+    assert data['points'].sum() == rows['points'].sum()
+
+    # Served from the store without asking Ergast again
+    ergast = FakeErgast(rows)
+    stored = dl._refresh_season(2020, ergast)
+    assert stored['complete'] and ergast.pages == 0 and ergast.standings_calls == 0
+    assert stored['drivers'] == data['drivers']
+    np.testing.assert_allclose(stored['points'], data['points'])
+    assert stored['standings'] == data['standings']
+
+
+def test_current_season_is_topped_up_with_new_rounds(season_store):
+    year = pd.Timestamp.now().year
+    rows = season_rows(6)
+    data = dl._refresh_season(year, FakeErgast(rows, raced=3))
+    assert list(data['rounds']) == [1, 2, 3] and not data['complete']
+
+    ergast = FakeErgast(rows, raced=5)
+    data = dl._refresh_season(year, ergast)
+    assert list(data['rounds']) == [1, 2, 3, 4, 5]
+    # Only the two new rounds were fetched
+    assert ergast.pages == 2 and ergast.standings_calls == 1
+    expected = rows[rows['round'] <= 5].groupby('driverId')['points'].sum()
+    assert dict(zip(data['drivers'], data['points'].sum(axis=1))) == pytest.approx(expected.to_dict())
+
+    ergast = FakeErgast(rows, raced=5)
+    dl._refresh_season(year, ergast)
+    assert ergast.pages == 0 and ergast.standings_calls == 0
+
+
+def test_empty_standings_are_not_stored_as_complete(season_store, monkeypatch):
+    rows = season_rows(4)
+    failing = FakeErgast(rows)
+    monkeypatch.setattr(failing, 'get_driver_standings', lambda season=None: None)
+    data = dl._refresh_season(2020, failing)
+    assert not data['complete'] and data['standings']['driver_id'] == []
+
+    # The next refresh retries the standings and completes the season
+    ergast = FakeErgast(rows)
+    data = dl._refresh_season(2020, ergast)
+    assert data['complete'] and ergast.standings_calls == 1
+    assert sorted(data['standings']['driver_id']) == IDS
+    assert dl._read_season(2020)['complete']
+
+
+def test_stale_store_versions_are_rebuilt(season_store, monkeypatch):
+    rows = season_rows(2)
+    dl._refresh_season(2020, FakeErgast(rows))
+    monkeypatch.setattr(dl, 'SEASON_STORE_VERSION', dl.SEASON_STORE_VERSION + 1)
+    assert dl._read_season(2020) is None
+
+    ergast = FakeErgast(rows)
+    assert dl._refresh_season(2020, ergast)['complete']
+    assert ergast.pages == 1
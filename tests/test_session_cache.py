@@ -0,0 +1,194 @@
+# In tests/test_session_cache.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.data_loader as dl
+from utils.data_loader import LOAD_FULL, LOAD_LAPS, LOAD_TELEMETRY, SessionCache, SingleFlight
+
+
+# --- FastF1 stand-in ---
+
+class FakeSession:
+    """Records which FastF1 loaders ran; every table holds `rows` float rows."""
+
+    f1_api_support = True
+
+    def __init__(self, event, rows=1000, gate=None):
+        self.event = event
+        self.rows = rows
+        self.gate = gate
+        self.calls = []
+
+    def _frame(self):
+        return pd.DataFrame({'value': np.zeros(self.rows)})
+
+    def load(self, laps=True, telemetry=False, weather=False, messages=False):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append(('load', telemetry, weather, messages))
+        self._laps = self._frame()
+        if telemetry:
+            self._load_telemetry()
+        if weather:
+            self._load_weather_data()
+        if messages:
+            self._load_race_control_messages()
+
+    def _load_telemetry(self):
+        self.calls.append('telemetry')
+        self._car_data = {'1': self._frame()}
+        self._pos_data = {'1': self._frame()}
+
+    def _load_weather_data(self):
+        self.calls.append('weather')
+        self._weather_data = self._frame()
+
+    def _load_race_control_messages(self):
+        self.calls.append('messages')
+        self._race_control_messages = self._frame()
+
+    def _set_laps_deleted_from_rcm(self):
+        self.calls.append('deleted laps')
+
+    def _calculate_quali_like_session_results(self):
+        pass
+
+    def _calculate_race_like_session_results(self):
+        pass
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Every FakeSession handed out by fastf1.get_session, by event."""
+    created = {}
+    gate = {}
+
+    def get_session(year, event, session_type):
+        session = FakeSession(event, gate=gate.get('event'))
+        created.setdefault(event, []).append(session)
+        return session
+
+    monkeypatch.setattr(dl.fastf1, 'get_session', get_session)
+    # Event names are used as given, without fetching the schedule
+    monkeypatch.setattr(dl, 'resolve_event', lambda year, event: event)
+    created['gate'] = gate
+    return created
+
+
+# --- SessionCache ---
+
+def test_sessions_are_loaded_once_per_level(sessions):
+    cache = SessionCache()
+    laps = cache.get(2024, 'Monaco', 'Q', LOAD_LAPS)
+    assert cache.get(2024, 'monaco', 'q', LOAD_LAPS) is laps
+    assert laps.calls == [('load', False, False, False)]
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['loads']) == (1, 1, 1)
+    assert stats['bytes'] == dl._estimate_session_bytes(laps) > 0
+
+
+def test_cached_session_is_upgraded_in_place(sessions):
+    cache = SessionCache()
+    session = cache.get(2024, 'Monaco', 'Q', LOAD_LAPS)
+    laps_bytes = cache.stats()['bytes']
+
+    assert cache.get(2024, 'Monaco', 'Q', LOAD_TELEMETRY) is session
+    assert cache.get(2024, 'Monaco', 'Q', LOAD_FULL) is session
+    # A lower level is served by the upgraded session
+    assert cache.get(2024, 'Monaco', 'Q', LOAD_LAPS) is session
+
+    assert len(sessions['Monaco']) == 1
+    assert session.calls == [('load', False, False, False), 'telemetry', 'weather', 'messages', 'deleted laps']
+    stats = cache.stats()
+    assert stats['upgrades'] == 2
+    # The entry is re-sized with the telemetry, weather and messages it gained
+    assert stats['bytes'] == dl._estimate_session_bytes(session) > laps_bytes
+
+
+def test_least_recently_used_sessions_are_evicted(sessions):
+    sized = FakeSession('size')
+    sized.load()
+    size = dl._estimate_session_bytes(sized)
+    cache = SessionCache(max_bytes=int(2.5 * size))
+    monaco = cache.get(2024, 'Monaco', 'R')
+    cache.get(2024, 'Monza', 'R')
+    assert cache.get(2024, 'Monaco', 'R') is monaco
+    cache.get(2024, 'Suzuka', 'R')
+
+    stats = cache.stats()
+    assert stats['sessions'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= cache.max_bytes
+    # Monza was the least recently used, so it is loaded again
+    assert cache.get(2024, 'Monaco', 'R') is monaco
+    cache.get(2024, 'Monza', 'R')
+    assert len(sessions['Monza']) == 2 and len(sessions['Monaco']) == 1
+
+
+def test_concurrent_callers_share_one_load(sessions):
+    gate = threading.Event()
+    sessions['gate']['event'] = gate
+    cache = SessionCache()
+    results = []
+
+    def load():
+        results.append(cache.get(2024, 'Monaco', 'Q'))
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every caller reach the cache before the leader's load finishes
+    while cache.stats()['misses'] < len(threads):
+        threading.Event().wait(0.001)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(sessions['Monaco']) == 1
+    assert len(results) == len(threads) and all(r is results[0] for r in results)
+    stats = cache.stats()
+    assert stats['loads'] == 1 and stats['coalesced'] == len(threads) - 1
+
+
+# --- SingleFlight ---
+
+def test_single_flight_shares_result_and_error():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise ValueError("load failed")
+
+    errors = []
+
+    def run(fn):
+        try:
+            flights.do('key', fn)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=run, args=(fail,))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=run, args=(fail,))
+    follower.start()
+    while flights.coalesced < 1:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert len(errors) == 2 and errors[0] is errors[1]
+
+    # A finished flight is not remembered
+    assert flights.do('key', lambda: 42) == 42
+    assert flights.executed == 2
@@ -0,0 +1,53 @@
+# In utils/aero.py
+# Pure NumPy speed statistics for the aero performance chart.
+
+import numpy as np
+
+
+def lap_speed_stats(speeds, offsets):
+    """Mean and max speed of each lap in a packed array (NaN samples ignored).
+
+    Lap i is speeds[offsets[i]:offsets[i + 1]]; laps without samples are NaN.
+    """
+    starts, ends = offsets[:-1], offsets[1:]
+    values = np.append(speeds.astype(np.float64), np.nan)
+    present = ~np.isnan(values)
+    bounds = np.column_stack((starts, ends)).ravel()
+    if len(bounds) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    count = np.add.reduceat(present.astype(np.int64), bounds)[::2]
+    total = np.add.reduceat(np.where(present, values, 0.0), bounds)[::2]
+    top = np.fmax.reduceat(values, bounds)[::2]
+    # reduceat returns the first sample for empty ranges, mask those out
+    count = np.where(ends == starts, 0, count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, total / count, np.nan)
+    return mean, np.where(count > 0, top, np.nan)
+
+
+def _iqr_mask(values):
+    q1, q3 = np.percentile(values, [25, 75])
+    iqr = q3 - q1
+    return (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+
+
+def team_speed_summary(avg_speeds, top_speeds):
+    """Average and top speed of a team from its per-lap values, or None without usable laps.
+
+    Laps without speed data and IQR outliers on either axis are dropped
+    before averaging.
+    """
+    avg_speeds = np.asarray(avg_speeds, dtype=float)
+    top_speeds = np.asarray(top_speeds, dtype=float)
+    valid = (avg_speeds > 0) & (top_speeds > 0)
+    avg_speeds, top_speeds = avg_speeds[valid], top_speeds[valid]
+    if len(avg_speeds) == 0:
+        return None
+
+    # Remove outliers on both axes using the IQR method
+    valid_mask = _iqr_mask(avg_speeds) & _iqr_mask(top_speeds)
+    if not np.any(valid_mask):
+        return None
+
+    return float(np.mean(avg_speeds[valid_mask])), float(np.mean(top_speeds[valid_mask]))
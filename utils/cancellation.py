@@ -0,0 +1,83 @@
+# In utils/cancellation.py
+
+import threading
+from collections import OrderedDict
+
+
+# Number of (client, graph) generations remembered; older clients can no longer cancel
+REQUEST_GENERATION_ENTRIES = 10000
+
+
+class RequestCancelled(Exception):
+    """A newer request from the same client superseded the one being built."""
+
+
+class CancelToken:
+    """Cancellation check handed to one graph request's builders."""
+
+    def __init__(self, generations=None, key=None, generation=None):
+        self._generations = generations
+        self._key = key
+        self._generation = generation
+
+    def cancelled(self):
+        """Whether a newer request from the same client has started."""
+        return self._generations is not None and self._generations.is_stale(self._key, self._generation)
+
+    def check(self):
+        """Raise RequestCancelled when the request is stale; call between drivers and load stages."""
+        if self.cancelled():
+            self._generations.record_cancel()
+            raise RequestCancelled()
+
+
+class RequestGenerations:
+    """Latest request generation of every client for every graph.
+
+    Every request a graph callback starts for a client gets the next number of
+    a server-side counter, so a newer request always supersedes an older one,
+    even after a page reload resets the Sketch button's n_clicks. The browser
+    only shows the newest response, so work for an older generation is abandoned.
+
+    The counters live in this process: requests handled by another gunicorn
+    worker never cancel each other. The app is deployed with one gthread
+    worker, so a client's overlapping requests run on threads of the same
+    process and a newer one aborts the older at its next check().
+    """
+
+    def __init__(self, max_entries=REQUEST_GENERATION_ENTRIES):
+        self.max_entries = max_entries
+        self._latest = OrderedDict()  # (client, graph) -> generation
+        self._lock = threading.Lock()
+        self.started = 0
+        self.cancelled = 0
+
+    def start(self, client, graph):
+        """CancelToken of a new request; requests without a client id are never cancelled."""
+        if client is None:
+            return CancelToken()
+        key = (client, graph)
+        with self._lock:
+            generation = self._latest.get(key, 0) + 1
+            self._latest[key] = generation
+            self._latest.move_to_end(key)
+            while len(self._latest) > self.max_entries:
+                self._latest.popitem(last=False)
+            self.started += 1
+        return CancelToken(self, key, generation)
+
+    def is_stale(self, key, generation):
+        with self._lock:
+            return self._latest.get(key, generation) > generation
+
+    def record_cancel(self):
+        with self._lock:
+            self.cancelled += 1
+
+    def stats(self):
+        with self._lock:
+            return {'clients': len(self._latest), 'started': self.started, 'cancelled': self.cancelled}
+
+
+# Shared by every graph page in this process
+request_generations = RequestGenerations()
@@ -0,0 +1,269 @@
+# In utils/circuit.py
+
+import glob
+import os
+import re
+import threading
+
+import numpy as np
+from fastf1.mvapi import get_circuit_info
+
+from utils.data_loader import CACHE_DIR, SingleFlight, is_session_final, memoize_on_session
+
+
+# Circuit geometries live next to the FastF1 cache, shared by every session held at the circuit
+CIRCUIT_DIR = os.path.join(CACHE_DIR, 'circuits')
+
+# Bump when the stored fields or their meaning change so stale files are rebuilt
+CIRCUIT_GEOMETRY_VERSION = 1
+
+# A session reuses a stored layout when its reference lap never strays further than
+# this from the stored centreline (position units are 1/10 m, so 50 m)
+LAYOUT_MATCH_TOLERANCE = 500.0
+
+# Spacing of the points compared when matching layouts, in grid points
+_MATCH_STRIDE = 4
+
+
+class CircuitGeometry:
+    """Reference centreline of one circuit layout with its sector boundaries and corners.
+
+    `distance`, `x` and `y` sample the centreline from the timing line.
+    `sector_distances` holds the S1/S2 end distances (NaN when unknown), and
+    corners come from FastF1's circuit info with their distance along the
+    centreline (empty when it is unavailable). `corners_loaded` is False when
+    the circuit info could not be fetched, so the geometry is not stored.
+    """
+
+    def __init__(self, location, distance, x, y, sector_distances, corner_labels, corner_x, corner_y, corner_distance,
+                 corners_loaded=True):
+        self.location = location
+        self.corners_loaded = corners_loaded
+        self.distance = np.asarray(distance, dtype=np.float32)
+        self.x = np.asarray(x, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.float32)
+        self.sector_distances = np.asarray(sector_distances, dtype=float)
+        self.corner_labels = np.asarray(corner_labels, dtype=str)
+        self.corner_x = np.asarray(corner_x, dtype=float)
+        self.corner_y = np.asarray(corner_y, dtype=float)
+        self.corner_distance = np.asarray(corner_distance, dtype=float)
+        self.length = float(self.distance[-1])
+
+        # Unit normals of the centreline, for lines drawn across the track
+        dx = np.gradient(self.x)
+        dy = np.gradient(self.y)
+        norm = np.hypot(dx, dy)
+        norm[norm == 0] = np.nan
+        self.normal_x = -dy / norm
+        self.normal_y = dx / norm
+
+        self._mini_sectors = {}
+
+    def indices_at(self, distances):
+        """Index of the first centreline point at or after each distance."""
+        return np.minimum(np.searchsorted(self.distance, distances), len(self.distance) - 1)
+
+    def mini_sectors(self, num_sectors):
+        """Centreline indices of the boundaries of `num_sectors` equal-length mini-sectors."""
+        indices = self._mini_sectors.get(num_sectors)
+        if indices is None:
+            indices = self.indices_at(np.linspace(0, self.length, num_sectors + 1))
+            self._mini_sectors[num_sectors] = indices
+        return indices
+
+    def matches(self, x, y):
+        """Whether a lap path (X/Y samples) runs along this layout, in both directions."""
+        x, y = x[::_MATCH_STRIDE], y[::_MATCH_STRIDE]
+        ref_x, ref_y = self.x[::_MATCH_STRIDE], self.y[::_MATCH_STRIDE]
+        if len(x) == 0:
+            return False
+        squared = (x[:, None] - ref_x[None, :]) ** 2 + (y[:, None] - ref_y[None, :]) ** 2
+        limit = LAYOUT_MATCH_TOLERANCE ** 2
+        return squared.min(axis=1).max() <= limit and squared.min(axis=0).max() <= limit
+
+
+# --- Building ---
+
+def _reference_row(tensor):
+    """Tensor row of the fastest lap with position data, or None."""
+    best_row, best_time = None, np.inf
+    for row, abbr in enumerate(tensor.drivers):
+        _, x_values = tensor.driver_channel(abbr, 'X')
+        lap_time = tensor.lap_time[row]
+        if np.isnan(x_values).all():
+            continue
+        if best_row is None or (np.isfinite(lap_time) and lap_time < best_time):
+            best_row, best_time = row, lap_time
+    return best_row
+
+
+def _reference_path(tensor, row):
+    abbr = tensor.drivers[row]
+    distance, x_values = tensor.driver_channel(abbr, 'X')
+    _, y_values = tensor.driver_channel(abbr, 'Y')
+    valid = ~(np.isnan(x_values) | np.isnan(y_values))
+    return distance[valid], x_values[valid], y_values[valid]
+
+
+def _circuit_corners(session):
+    """Corner table of the session's circuit, or None when it cannot be fetched.
+
+    Reads the circuit info directly rather than through Session.get_circuit_info,
+    which also measures marker distances on the fastest lap's telemetry that
+    a laps-only session does not have; distances are measured on the centreline instead.
+    """
+    try:
+        circuit = session.session_info['Meeting']['Circuit']
+        circuit_key = circuit['Key']
+        # Same correction as Session.get_circuit_info: Mugello shares its key with another circuit
+        if circuit_key == 149 and circuit.get('ShortName') == 'Mugello':
+            circuit_key = 146
+        circuit_info = get_circuit_info(year=session.event.year, circuit_key=circuit_key)
+    except Exception as e:
+        print(f"Error loading circuit info: {e}")
+        return None
+    return None if circuit_info is None else circuit_info.corners
+
+
+def _corners(session, distance, x, y):
+    """Corner labels, positions and distances along the centreline, and whether the circuit info loaded."""
+    corners = _circuit_corners(session)
+    if corners is None or len(corners) == 0:
+        return np.zeros(0, dtype=str), np.zeros(0), np.zeros(0), np.zeros(0), corners is not None
+
+    corner_x = corners['X'].to_numpy(dtype=float)
+    corner_y = corners['Y'].to_numpy(dtype=float)
+    labels = [f"{int(number)}{letter}" for number, letter in zip(corners['Number'], corners['Letter'].fillna(''))]
+    # Distance of the closest centreline point to each corner marker
+    nearest = np.argmin((corner_x[:, None] - x[None, :]) ** 2 + (corner_y[:, None] - y[None, :]) ** 2, axis=1)
+    return np.asarray(labels, dtype=str), corner_x, corner_y, distance[nearest], True
+
+
+def build_circuit_geometry(session, tensor):
+    """CircuitGeometry from the fastest lap in a session's LapTensor, or None without position data."""
+    row = _reference_row(tensor)
+    if row is None:
+        return None
+    distance, x, y = _reference_path(tensor, row)
+    if len(distance) < 2:
+        return None
+
+    # Sector ends are where the reference lap clock passes its cumulative sector times
+    lap_clock = tensor.channel('Time', [row])[0]
+    n_points = int(tensor.last_index([row])[0]) + 1
+    sector_distances = np.full(2, np.nan)
+    for i, sector_time in enumerate(tensor.sector_times[row, :2]):
+        if np.isfinite(sector_time):
+            idx = min(np.searchsorted(lap_clock[:n_points], sector_time), n_points - 1)
+            sector_distances[i] = idx * tensor.step
+
+    location = str(session.event.get('Location', '') or session.event.get('EventName', ''))
+    return CircuitGeometry(location, distance, x, y, sector_distances, *_corners(session, distance, x, y))
+
+
+# --- Persistence ---
+# One file per layout: '<location>.<key of the session it was built from>.npz'
+
+def _location_slug(location):
+    return re.sub(r'[^a-z0-9]+', '_', location.strip().lower()) or 'unknown'
+
+
+def _read_geometry(path):
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            if int(f['version']) != CIRCUIT_GEOMETRY_VERSION:
+                return None
+            return CircuitGeometry(
+                str(f['location']), f['distance'], f['x'], f['y'], f['sector_distances'],
+                f['corner_labels'], f['corner_x'], f['corner_y'], f['corner_distance'],
+            )
+    except Exception as e:
+        print(f"Error reading circuit geometry {path}: {e}")
+        return None
+
+
+def _write_geometry(geometry, layout_key):
+    os.makedirs(CIRCUIT_DIR, exist_ok=True)
+    path = os.path.join(CIRCUIT_DIR, f"{_location_slug(geometry.location)}.{layout_key}.npz")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            version=np.asarray(CIRCUIT_GEOMETRY_VERSION),
+            location=np.asarray(geometry.location),
+            distance=geometry.distance,
+            x=geometry.x,
+            y=geometry.y,
+            sector_distances=geometry.sector_distances,
+            corner_labels=geometry.corner_labels,
+            corner_x=geometry.corner_x,
+            corner_y=geometry.corner_y,
+            corner_distance=geometry.corner_distance,
+        )
+    os.replace(tmp_path, path)
+
+
+# --- Access ---
+
+_layouts = {}  # location slug -> [CircuitGeometry], every layout seen at that location
+_layouts_lock = threading.Lock()
+_layout_flights = SingleFlight()
+
+
+def _known_layouts(slug):
+    with _layouts_lock:
+        layouts = _layouts.get(slug)
+    if layouts is None:
+        paths = sorted(glob.glob(os.path.join(CIRCUIT_DIR, f"{glob.escape(slug)}.*.npz")))
+        layouts = [g for g in (_read_geometry(path) for path in paths) if g is not None]
+        with _layouts_lock:
+            layouts = _layouts.setdefault(slug, layouts)
+    return layouts
+
+
+def _find_or_build(session, tensor, layout_key):
+    location = str(session.event.get('Location', '') or session.event.get('EventName', ''))
+    slug = _location_slug(location)
+
+    def find():
+        row = _reference_row(tensor)
+        if row is None:
+            return None
+        _, x, y = _reference_path(tensor, row)
+        for geometry in _known_layouts(slug):
+            if geometry.matches(x, y):
+                return geometry
+
+        geometry = build_circuit_geometry(session, tensor)
+        if geometry is None:
+            return None
+        if not geometry.corners_loaded:
+            # Kept for this session only, so the next one tries the circuit info again
+            return geometry
+        if is_session_final(session):
+            _write_geometry(geometry, layout_key)
+        with _layouts_lock:
+            _layouts.setdefault(slug, []).append(geometry)
+        return geometry
+
+    return _layout_flights.do(layout_key, find)
+
+
+def get_circuit_geometry(session, tensor, layout_key):
+    """CircuitGeometry of the layout a session ran on, or None without position data.
+
+    Reuses any stored layout at the same location whose centreline the
+    session's fastest lap follows, so Q/R sessions and other years on an
+    unchanged layout share one geometry. Otherwise it is built from `tensor`
+    and stored under `layout_key` (the session's store key).
+    """
+    return memoize_on_session(session, 'circuit_geometry', lambda: _find_or_build(session, tensor, layout_key))
+
+
+def _after_fork_in_child():
+    """A forked background job must not inherit a lock held by a parent thread."""
+    global _layouts_lock
+    _layouts_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,724 @@
+# In utils/data_loader.py
+
+import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+import fastf1
+import numpy as np
+import pandas as pd
+from fastf1 import plotting
+from fastf1.ergast import Ergast
+
+from utils.visuals import get_secondary_color
+
+
+# FastF1 cache directory - use /tmp for cloud deployments, local folder otherwise
+CACHE_DIR = '/tmp/f1_cache' if os.environ.get('RENDER') else 'data/cache'
+
+# --- Session load levels ---
+# Each level includes everything loaded by the levels below it.
+LOAD_LAPS = 1        # laps, results and session status
+LOAD_TELEMETRY = 2   # + car data and position data
+LOAD_FULL = 3        # + weather data and race control messages
+
+# Largest page size the Ergast-compatible API accepts
+ERGAST_PAGE_LIMIT = 100
+
+# On-disk store of per-season standings and points matrices
+SEASON_STORE_DIR = os.path.join(CACHE_DIR, 'seasons')
+# Bump when the stored arrays or their meaning change so stale files are rebuilt
+SEASON_STORE_VERSION = 1
+# How often the current season is checked for new results
+SEASON_REFRESH_SECONDS = 600
+# After a failed schedule fetch, lookups fail fast for this long before fetching again
+SCHEDULE_RETRY_SECONDS = 60
+
+# Upper bound for the in-memory session cache (defaults to 256 MB on Render's small instances, 1 GB elsewhere)
+SESSION_CACHE_MAX_BYTES = int(os.environ.get('SESSION_CACHE_MB', 256 if os.environ.get('RENDER') else 1024)) * 1024 * 1024
+
+# Data derived from a session is only written to disk once the session is this old,
+# so live timing is never frozen
+SESSION_FINAL_AFTER = pd.Timedelta(hours=6)
+
+
+def _estimate_session_bytes(session):
+    """Rough in-memory size of a loaded session, used for LRU eviction."""
+    total = 0
+    frames = []
+    for attr in ('_laps', '_weather_data', '_race_control_messages', '_results'):
+        frame = getattr(session, attr, None)
+        if frame is not None:
+            frames.append(frame)
+    for attr in ('_car_data', '_pos_data'):
+        per_driver = getattr(session, attr, None)
+        if per_driver:
+            frames.extend(per_driver.values())
+    for frame in frames:
+        try:
+            # deep=True counts the strings held by object columns (Driver, Team, Compound, ...)
+            total += int(frame.memory_usage(index=True, deep=True).sum())
+        except Exception:
+            continue
+    return total
+
+
+def _upgrade_session(session, current_level, level):
+    """Load the missing data for a cached session without reloading its laps.
+
+    Runs the same steps as Session.load for that data, so an upgraded session
+    matches one loaded at `level` directly.
+    """
+    try:
+        # Sessions without F1 live timing support have no telemetry, weather or messages to load
+        if session.f1_api_support:
+            if current_level < LOAD_TELEMETRY <= level:
+                session._load_telemetry()
+            if current_level < LOAD_FULL <= level:
+                session._load_weather_data()
+                session._load_race_control_messages()
+        if current_level < LOAD_FULL <= level:
+            # Deleted laps come from race control messages, and the results are derived from the laps
+            session._set_laps_deleted_from_rcm()
+            session._calculate_quali_like_session_results()
+            session._calculate_race_like_session_results()
+    except AttributeError:
+        # Private loaders not available in this FastF1 version, do a full load
+        session.load(laps=True, telemetry=level >= LOAD_TELEMETRY,
+                     weather=level >= LOAD_FULL, messages=level >= LOAD_FULL)
+
+
+# Every SingleFlight, so a forked child can drop flights led by threads it did not inherit
+_flight_groups = weakref.WeakSet()
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution.
+
+    The first caller runs the function; callers arriving while it is in flight
+    wait for it and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        _flight_groups.add(self)
+
+    def _reset_after_fork(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result']
+
+
+def _reset_flights_after_fork():
+    """Background callback jobs fork the web worker; in-flight loads there would never finish here."""
+    for flights in list(_flight_groups):
+        flights._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_flights_after_fork)
+
+
+class SessionCache:
+    """Process-wide LRU cache of loaded FastF1 sessions, bounded by size in bytes."""
+
+    def __init__(self, max_bytes=SESSION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> {'session', 'level', 'nbytes'}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.upgrades = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(year, event, session_type):
+        return int(year), event_key(year, event), str(session_type).upper()
+
+    def get(self, year, event, session_type, level=LOAD_LAPS):
+        """Return a session loaded to at least `level`, loading or upgrading it if needed.
+
+        Concurrent requests for the same session share one in-flight load.
+        Event names are resolved to round numbers, so FastF1 skips its fuzzy match.
+        """
+        key = self.make_key(year, event, session_type)
+        event = resolve_event(year, event)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry['level'] >= level:
+                    self.hits += 1
+                    return entry['session']
+            else:
+                self.misses += 1
+
+        while True:
+            entry = self._flights.do(key, lambda: self._load(key, year, event, session_type, level))
+            # We may have joined a flight loading a lower level; go round again to upgrade it
+            if entry['level'] >= level:
+                return entry['session']
+
+    def _load(self, key, year, event, session_type, level):
+        """Load a session or upgrade a cached one in place. Runs once per in-flight key."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry['level'] >= level:
+            return entry
+
+        if entry is None:
+            session = fastf1.get_session(year, event, session_type)
+            session.load(laps=True, telemetry=level >= LOAD_TELEMETRY,
+                         weather=level >= LOAD_FULL, messages=level >= LOAD_FULL)
+            entry = {'session': session, 'level': level, 'nbytes': 0}
+        else:
+            # Cached at a lower level: upgrade the existing session instead of reloading it
+            _upgrade_session(entry['session'], entry['level'], level)
+            entry['level'] = level
+            self.upgrades += 1
+
+        # Sizing walks every DataFrame of the session, keep it out of the shared lock
+        nbytes = _estimate_session_bytes(entry['session'])
+        with self._lock:
+            self._store(key, entry, nbytes)
+        return entry
+
+    def _store(self, key, entry, nbytes):
+        """Insert or resize an entry and evict least-recently-used sessions. Caller holds the lock."""
+        entry['nbytes'] = nbytes
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def total_bytes(self):
+        return sum(e['nbytes'] for e in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _reset_after_fork(self):
+        # The lock may have been held by a parent thread that does not exist in the child
+        self._lock = threading.Lock()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._entries),
+                'bytes': self.total_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'upgrades': self.upgrades,
+                'evictions': self.evictions,
+                'loads': self._flights.executed,
+                'coalesced': self._flights.coalesced,
+            }
+
+
+# Shared by every page in this process
+session_cache = SessionCache()
+
+
+def load_session(year, event, session_type, level=LOAD_LAPS):
+    """Get a FastF1 session from the shared cache, loaded to at least `level`."""
+    return session_cache.get(year, event, session_type, level)
+
+
+# --- Per-session derived data ---
+
+_session_memos = weakref.WeakKeyDictionary()  # session -> {name: value}
+_session_memos_lock = threading.Lock()
+
+
+def memoize_on_session(session, name, build):
+    """Return `build()` computed once per session object and kept while the session lives.
+
+    Used for indexes derived from a cached session (roster, telemetry index, ...).
+    """
+    with _session_memos_lock:
+        memo = _session_memos.setdefault(session, {})
+        if name in memo:
+            return memo[name]
+    value = build()
+    with _session_memos_lock:
+        return _session_memos[session].setdefault(name, value)
+
+
+# --- Driver roster index ---
+
+DriverInfo = namedtuple('DriverInfo', ['number', 'abbreviation', 'full_name', 'team', 'color', 'secondary_color'])
+
+
+class Roster:
+    """Driver and team metadata for one session, built once from its results table."""
+
+    def __init__(self, session):
+        results = session.results
+        team_colors = {}
+        self.drivers = {}        # abbreviation -> DriverInfo, in session order
+        self.team_drivers = {}   # team -> [abbreviations]
+        by_number = {}
+
+        for number, abbr, full_name, team in zip(results['DriverNumber'], results['Abbreviation'],
+                                                 results['FullName'], results['TeamName']):
+            if abbr in self.drivers:
+                continue
+            if team not in team_colors:
+                team_colors[team] = plotting.get_team_color(team, session)
+            info = DriverInfo(str(number), abbr, full_name, team, team_colors[team], get_secondary_color(team))
+            self.drivers[abbr] = info
+            by_number[info.number] = info
+            self.team_drivers.setdefault(team, []).append(abbr)
+
+        self.team_colors = team_colors
+        self._by_number = by_number
+
+    def get(self, identifier):
+        """DriverInfo for an abbreviation or driver number, or None if not in the session."""
+        return self.drivers.get(identifier) or self._by_number.get(str(identifier))
+
+    @property
+    def abbreviations(self):
+        return list(self.drivers)
+
+    @property
+    def teams(self):
+        return list(self.team_drivers)
+
+
+def get_roster(session):
+    """Roster index for a loaded session, built on first use and kept while the session lives."""
+    return memoize_on_session(session, 'roster', lambda: Roster(session))
+
+
+# --- Event schedule index ---
+
+_event_indexes = {}  # year -> {'index', 'checked'}
+_event_indexes_lock = threading.Lock()
+_schedule_flights = SingleFlight()
+
+
+def _build_event_index(year):
+    schedule = fastf1.get_event_schedule(year)
+    names = schedule['EventName'].tolist()
+    events = {}
+    for name, rnd, event_format in zip(names, schedule['RoundNumber'], schedule['EventFormat']):
+        events[name] = {
+            'round': int(rnd),
+            'format': str(event_format),
+            'is_sprint': 'sprint' in str(event_format).lower(),
+        }
+    index = {
+        'names': names,
+        'events': events,
+        'by_lower': {name.strip().lower(): name for name in names},
+    }
+    with _event_indexes_lock:
+        _event_indexes[year] = {'index': index, 'checked': time.monotonic()}
+    return index
+
+
+def get_event_index(year):
+    """Season schedule as a lookup table, loaded once per season.
+
+    Returns a dict with `names` (event names in schedule order) and `events`
+    mapping each event name to its round number, format and sprint flag.
+    """
+    year = int(year)
+    now = time.monotonic()
+    with _event_indexes_lock:
+        cached = _event_indexes.get(year)
+    if cached is not None:
+        if cached['index'] is not None:
+            fresh = now - cached['checked'] < SEASON_REFRESH_SECONDS
+            if fresh or _is_completed_season(year):
+                return cached['index']
+        if now - cached.get('failed', -SCHEDULE_RETRY_SECONDS) < SCHEDULE_RETRY_SECONDS:
+            # Recently failed: serve the previous schedule if there is one, without fetching again
+            if cached['index'] is not None:
+                return cached['index']
+            raise cached['error']
+    try:
+        return _schedule_flights.do(year, lambda: _build_event_index(year))
+    except Exception as e:
+        with _event_indexes_lock:
+            cached = _event_indexes.setdefault(year, {'index': None, 'checked': now})
+            cached['failed'] = now
+            cached['error'] = e
+        if cached['index'] is None:
+            raise
+        print(f"Error refreshing event schedule {year}, keeping the previous one: {e}")
+        return cached['index']
+
+
+def get_event_info(year, event_name):
+    """Round number, format and sprint flag for an event name, or None if unknown."""
+    index = get_event_index(year)
+    name = index['by_lower'].get(str(event_name).strip().lower())
+    return index['events'].get(name) if name else None
+
+
+def resolve_event(year, event):
+    """Map an event name to its round number so sessions can be opened without fuzzy matching.
+
+    Testing events (round 0), unknown names and schedule errors fall back to the given value.
+    """
+    if not isinstance(event, str):
+        return event
+    try:
+        info = get_event_info(year, event)
+    except Exception as e:
+        print(f"Error resolving event {event} ({year}): {e}")
+        return event
+    if info is None or info['round'] < 1:
+        return event
+    return info['round']
+
+
+def event_key(year, event):
+    """Canonical form of an event in cache keys: its lower-case name.
+
+    Names need no schedule lookup, so a session gets the same key whether
+    or not the schedule can be fetched. Round numbers are mapped to their
+    event name when the schedule is available.
+    """
+    if isinstance(event, str):
+        return event.strip().lower()
+    try:
+        index = get_event_index(year)
+    except Exception:
+        return event
+    for name in index['names']:
+        if index['events'][name]['round'] == event:
+            return name.strip().lower()
+    return event
+
+
+def session_store_key(year, event, session_type):
+    """File-name safe key for data derived from a session, e.g. '2024_bahrain_grand_prix_R'."""
+    event = re.sub(r'[^a-z0-9]+', '_', str(event_key(year, event)))
+    return f"{int(year)}_{event}_{str(session_type).upper()}"
+
+
+def is_session_final(session):
+    """Whether a session is old enough for its derived data to be persisted."""
+    try:
+        return pd.Timestamp(session.date) + SESSION_FINAL_AFTER < pd.Timestamp.now()
+    except Exception:
+        return False
+
+
+# --- Season results (Ergast) ---
+
+def _collect_results(response, frames):
+    """Append every round of an Ergast results response (and its next pages) to `frames`."""
+    while True:
+        description = response.description
+        for rnd, race_name, results in zip(description['round'], description['raceName'], response.content):
+            if results is None or results.empty:
+                continue
+            frames.append(pd.DataFrame({
+                'round': int(rnd),
+                'raceName': race_name,
+                'driverId': results['driverId'].values,
+                'driverCode': results['driverCode'].values,
+                'points': results['points'].astype(float).values,
+            }))
+        # A round can be split across two pages, the rows are simply concatenated
+        try:
+            response = response.get_next_result_page()
+        except ValueError:
+            break
+
+
+def fetch_season_results(year, ergast=None, rounds=None):
+    """Fetch race results for a season, page by page.
+
+    Fetches every round in bulk, or only the given `rounds` if provided.
+    Returns a DataFrame with one row per classified driver per round
+    (columns: round, raceName, driverId, driverCode, points), ordered by
+    round. driverCode is missing for drivers who raced before codes existed.
+    `ergast` can be any object with Ergast's `get_race_results` interface.
+    """
+    ergast = ergast or Ergast()
+
+    frames = []
+    if rounds is None:
+        _collect_results(ergast.get_race_results(season=year, limit=ERGAST_PAGE_LIMIT), frames)
+    else:
+        for rnd in rounds:
+            _collect_results(ergast.get_race_results(season=year, round=int(rnd), limit=ERGAST_PAGE_LIMIT), frames)
+
+    if not frames:
+        return pd.DataFrame(columns=['round', 'raceName', 'driverId', 'driverCode', 'points'])
+    return pd.concat(frames, ignore_index=True).sort_values('round', kind='stable')
+
+
+def build_points_matrix(results):
+    """Turn season results into a drivers x rounds points matrix.
+
+    Returns a dict with `drivers` (Ergast driver ids, which unlike codes
+    exist for every season), `rounds`, `race_names` and `points`, a float
+    array where points[i, j] is what drivers[i] scored in rounds[j].
+    Cumulative standings are np.cumsum(points, axis=1).
+    """
+    results = results[results['driverId'].notna()]
+    race_names = results.drop_duplicates('round')
+    rounds = race_names['round'].to_numpy(dtype=int)
+    drivers = np.unique(results['driverId'].to_numpy(dtype=str))
+
+    points = np.zeros((len(drivers), len(rounds)))
+    rows = np.searchsorted(drivers, results['driverId'].to_numpy(dtype=str))
+    cols = np.searchsorted(rounds, results['round'].to_numpy(dtype=int))
+    np.add.at(points, (rows, cols), results['points'].to_numpy(dtype=float))
+
+    return {
+        'drivers': drivers.tolist(),
+        'rounds': rounds,
+        'race_names': race_names['raceName'].tolist(),
+        'points': points,
+    }
+
+
+def load_season_points(year, ergast=None):
+    """Fetch a season's results in bulk and return its points matrix."""
+    return build_points_matrix(fetch_season_results(year, ergast))
+
+
+def merge_points_matrices(old, new):
+    """Combine two points matrices, rounds in `new` replace the same rounds in `old`."""
+    drivers = np.union1d(np.asarray(old['drivers'], dtype=str), np.asarray(new['drivers'], dtype=str))
+    names = dict(zip(old['rounds'].tolist(), old['race_names']))
+    names.update(zip(new['rounds'].tolist(), new['race_names']))
+    rounds = np.array(sorted(names), dtype=int)
+
+    points = np.zeros((len(drivers), len(rounds)))
+    for part in (old, new):
+        if not len(part['rounds']):
+            continue
+        cols = np.searchsorted(rounds, part['rounds'])
+        # A replaced round drops the old results of drivers missing from the new one
+        points[:, cols] = 0.0
+        if len(part['drivers']):
+            rows = np.searchsorted(drivers, np.asarray(part['drivers'], dtype=str))
+            points[np.ix_(rows, cols)] = part['points']
+
+    return {
+        'drivers': drivers.tolist(),
+        'rounds': rounds,
+        'race_names': [names[r] for r in rounds.tolist()],
+        'points': points,
+    }
+
+
+def fetch_standings(year, ergast=None):
+    """Fetch a season's driver standings as columnar arrays.
+
+    Drivers are identified by `driver_id`; `code` is their label, the first
+    three letters of the family name for drivers without an official code.
+    """
+    ergast = ergast or Ergast()
+    response = ergast.get_driver_standings(season=year)
+    content = getattr(response, 'content', None)
+    if not content:
+        return {'driver_id': [], 'code': [], 'given_name': [], 'family_name': [], 'team': []}
+
+    df = content[0]
+    teams = [t[0] if isinstance(t, list) and t else (t if isinstance(t, str) else 'Unknown')
+             for t in df['constructorNames']]
+    fallback = df['familyName'].astype(str).str.replace(r'[^A-Za-z]', '', regex=True).str[:3].str.upper()
+    return {
+        'driver_id': df['driverId'].astype(str).tolist(),
+        'code': df['driverCode'].where(df['driverCode'].notna(), fallback).astype(str).tolist(),
+        'given_name': df['givenName'].astype(str).tolist(),
+        'family_name': df['familyName'].astype(str).tolist(),
+        'team': teams,
+    }
+
+
+# --- Persistent season store ---
+# One .npz file of columnar arrays per season. Completed seasons are written
+# once; the current season is topped up with rounds raced since the last write.
+# A season only counts as complete once its results and standings were fetched.
+
+_seasons = {}  # year -> {'data', 'checked'}
+_seasons_lock = threading.Lock()
+_season_flights = SingleFlight()
+
+
+def _season_path(year):
+    return os.path.join(SEASON_STORE_DIR, f"{int(year)}.npz")
+
+
+def _read_season(year):
+    path = _season_path(year)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            if 'version' not in f.files or int(f['version']) != SEASON_STORE_VERSION:
+                return None
+            return {
+                'drivers': f['drivers'].tolist(),
+                'rounds': f['rounds'].astype(int),
+                'race_names': f['race_names'].tolist(),
+                'points': f['points'],
+                'complete': bool(f['complete']),
+                'standings': {
+                    'driver_id': f['standings_driver_id'].tolist(),
+                    'code': f['standings_code'].tolist(),
+                    'given_name': f['standings_given_name'].tolist(),
+                    'family_name': f['standings_family_name'].tolist(),
+                    'team': f['standings_team'].tolist(),
+                },
+            }
+    except Exception as e:
+        print(f"Error reading season store for {year}: {e}")
+        return None
+
+
+def _write_season(year, data):
+    os.makedirs(SEASON_STORE_DIR, exist_ok=True)
+    path = _season_path(year)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    standings = data['standings']
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            version=np.asarray(SEASON_STORE_VERSION),
+            drivers=np.asarray(data['drivers'], dtype=str),
+            rounds=np.asarray(data['rounds'], dtype=np.int16),
+            race_names=np.asarray(data['race_names'], dtype=str),
+            points=np.asarray(data['points'], dtype=np.float32),
+            complete=np.asarray(data['complete']),
+            standings_driver_id=np.asarray(standings['driver_id'], dtype=str),
+            standings_code=np.asarray(standings['code'], dtype=str),
+            standings_given_name=np.asarray(standings['given_name'], dtype=str),
+            standings_family_name=np.asarray(standings['family_name'], dtype=str),
+            standings_team=np.asarray(standings['team'], dtype=str),
+        )
+    os.replace(tmp_path, path)
+
+
+def _is_completed_season(year):
+    return int(year) < time.localtime().tm_year
+
+
+def _due_rounds(year, stored_rounds, ergast):
+    """Rounds of the season that have been raced but are not in the store yet."""
+    schedule = ergast.get_race_schedule(season=year)
+    schedule = getattr(schedule, 'content', schedule)
+    if schedule is None or schedule.empty:
+        return []
+    raced = schedule[pd.to_datetime(schedule['raceDate']) <= pd.Timestamp.now().normalize()]
+    return sorted(set(raced['round'].astype(int)) - set(np.asarray(stored_rounds).tolist()))
+
+
+def _is_complete(year, data):
+    """Whether a stored season can be served without checking Ergast again."""
+    return _is_completed_season(year) and len(data['rounds']) > 0 and len(data['standings']['driver_id']) > 0
+
+
+def _refresh_season(year, ergast=None):
+    ergast = ergast or Ergast()
+    data = _read_season(year)
+
+    if data is None:
+        data = load_season_points(year, ergast)
+        data['standings'] = fetch_standings(year, ergast)
+        data['complete'] = _is_complete(year, data)
+        _write_season(year, data)
+    elif not data['complete']:
+        # Checked once more after the season ends, so late rounds are not missed
+        due = _due_rounds(year, data['rounds'], ergast)
+        new_results = fetch_season_results(year, ergast, rounds=due) if due else None
+        updated = new_results is not None and not new_results.empty
+        standings = data['standings']
+        if updated:
+            data = merge_points_matrices(data, build_points_matrix(new_results))
+        # Standings change with every round, and an earlier empty response is retried
+        if updated or not standings['driver_id']:
+            fetched = fetch_standings(year, ergast)
+            if fetched['driver_id']:
+                standings, updated = fetched, True
+        data['standings'] = standings
+        complete = _is_complete(year, data)
+        if updated or complete:
+            data['complete'] = complete
+            _write_season(year, data)
+
+    with _seasons_lock:
+        _seasons[year] = {'data': data, 'checked': time.monotonic()}
+    return data
+
+
+def get_season(year, ergast=None):
+    """Standings and points matrix for a season, served from the local store.
+
+    Returns a dict with `drivers`, `rounds`, `race_names`, `points`
+    (drivers x rounds) and `standings` (columnar driver info). Completed
+    seasons are fetched once and reused; the current season is checked for
+    newly raced rounds at most every SEASON_REFRESH_SECONDS.
+    """
+    year = int(year)
+    with _seasons_lock:
+        cached = _seasons.get(year)
+    if cached is not None:
+        fresh = time.monotonic() - cached['checked'] < SEASON_REFRESH_SECONDS
+        if fresh or cached['data']['complete']:
+            return cached['data']
+    return _season_flights.do(year, lambda: _refresh_season(year, ergast))
+
+
+def _after_fork_in_child():
+    """Replace the locks a forked background job inherits, in case a parent thread held one.
+
+    Per-session memos are dropped too: the indexes stored there carry their own locks
+    and are rebuilt on first use.
+    """
+    global _session_memos, _session_memos_lock, _event_indexes_lock, _seasons_lock
+    session_cache._reset_after_fork()
+    _session_memos = weakref.WeakKeyDictionary()
+    _session_memos_lock = threading.Lock()
+    _event_indexes_lock = threading.Lock()
+    _seasons_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,207 @@
+# In utils/figure_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from plotly.io.json import to_json_plotly
+
+from utils.data_loader import CACHE_DIR
+
+
+# In-memory budget for serialized graph outputs (defaults to 64 MB)
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get('FIGURE_CACHE_MB', 64)) * 1024 * 1024
+
+# Outputs evicted from memory spill to disk up to this budget (defaults to 256 MB, 0 disables the disk tier)
+FIGURE_CACHE_DISK_BYTES = int(os.environ.get('FIGURE_CACHE_DISK_MB', 256)) * 1024 * 1024
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, 'figures')
+
+# True in processes forked from a web worker (background callback jobs), whose memory is discarded
+_forked = False
+
+
+def figure_key(page, year, event=None, session_type=None, selection=(), chart=None, **options):
+    """Cache key of a graph request.
+
+    The case of the event name does not matter. The selected drivers or teams
+    keep their order, since trace order and teammate dashes follow it;
+    `options` holds the chart's render settings.
+    """
+    if isinstance(event, str):
+        event = event.strip().lower()
+    return json.dumps([page, year, event, session_type, list(selection or ()), chart, options],
+                      sort_keys=True, default=str)
+
+
+class FigureCache:
+    """LRU of serialized graph outputs, bounded by size in bytes, with an optional disk tier.
+
+    Values are stored as the JSON Dash would send, so they are independent
+    of FastF1 objects and cheap to hold. Entries evicted from memory are
+    written to `disk_dir` (oldest files removed past `disk_bytes`) and
+    promoted back on their next hit. Entries can expire after a TTL.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES, disk_dir=FIGURE_CACHE_DIR, disk_bytes=FIGURE_CACHE_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()  # key -> (json text, expiry time or None)
+        self._bytes = 0
+        self._disk_files = None  # path -> size, oldest first; listed on first use
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.spills = 0
+
+    def get(self, key):
+        """The cached value for `key`, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        from_disk = entry is None
+        if from_disk:
+            entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if from_disk:
+                self.disk_hits += 1
+            else:
+                self.hits += 1
+        if from_disk:
+            self._insert(key, entry)
+        return json.loads(entry[0])
+
+    def put(self, key, value, ttl=None):
+        """Store a graph output (figure dicts, store data, ...), expiring after `ttl` seconds when given."""
+        entry = (to_json_plotly(value), time.time() + ttl if ttl else None)
+        with self._lock:
+            self.stores += 1
+        if _forked:
+            # A background job's memory dies with it: hand the output to the web workers through disk
+            self._write_disk(key, entry)
+        else:
+            self._insert(key, entry)
+
+    def _insert(self, key, entry):
+        spilled = []
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(entry[0])
+            while len(self._entries) > 1 and self._bytes > self.max_bytes:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._bytes -= len(old_entry[0])
+                spilled.append((old_key, old_entry))
+            self.spills += len(spilled)
+        for old_key, old_entry in spilled:
+            self._write_disk(old_key, old_entry)
+
+    def _remove(self, key):
+        """Drop a memory entry. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    # --- Disk tier ---
+    # One file per key: the expiry time (empty for none) on the first line, then the JSON.
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def _read_disk(self, key, now):
+        if not self.disk_bytes:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                expiry = f.readline().strip()
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cached figure {path}: {e}")
+            return None
+        expiry = float(expiry) if expiry else None
+        if expiry is not None and expiry <= now:
+            return None
+        return text, expiry
+
+    def _write_disk(self, key, entry):
+        if not self.disk_bytes:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f"{'' if entry[1] is None else entry[1]}\n")
+                f.write(entry[0])
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error spilling cached figure {path}: {e}")
+            return
+        with self._lock:
+            files = self._list_disk()
+            files.pop(path, None)
+            files[path] = len(entry[0])
+            # Other processes share the directory, so the size is an estimate from this process's view
+            stale = []
+            while len(files) > 1 and sum(files.values()) > self.disk_bytes:
+                stale.append(files.popitem(last=False)[0])
+        for stale_path in stale:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+    def _list_disk(self):
+        """Files of the disk tier, oldest first. Caller holds the lock."""
+        if self._disk_files is None:
+            entries = []
+            if os.path.isdir(self.disk_dir):
+                for entry in os.scandir(self.disk_dir):
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.path, stat.st_size))
+            self._disk_files = OrderedDict((path, size) for _, path, size in sorted(entries))
+        return self._disk_files
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'figures': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else None,
+                'stores': self.stores,
+                'spills': self.spills,
+            }
+
+
+def _after_fork_in_child():
+    global _forked
+    _forked = True
+    figure_cache._lock = threading.Lock()
+
+
+# Shared by every graph page in this process
+figure_cache = FigureCache()
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,237 @@
+# In utils/lap_table.py
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps
+
+from utils.aero import lap_speed_stats
+from utils.data_loader import (
+    CACHE_DIR, LOAD_LAPS, LOAD_TELEMETRY, SingleFlight, is_session_final, load_session, session_store_key,
+)
+from utils.telemetry import get_telemetry_index
+
+
+# Per-session lap tables live next to the FastF1 cache
+LAP_TABLE_DIR = os.path.join(CACHE_DIR, 'laps')
+
+# Bump when columns or their meaning change so stale files are rebuilt
+LAP_TABLE_VERSION = 1
+
+# Number of lap tables kept in memory
+LAP_TABLE_MEMORY_ENTRIES = 64
+
+TIME_COLUMNS = ['LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']
+SPEED_TRAP_COLUMNS = ['SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST']
+TEXT_COLUMNS = ['Driver', 'Team', 'Compound']
+
+
+# --- Building ---
+
+def _text_column(laps, column):
+    values = laps[column]
+    return values.where(values.notna(), '').astype(str).to_numpy()
+
+
+def _add_speed_columns(session, table):
+    """Average and top speed of every lap from the car telemetry."""
+    telemetry_index = get_telemetry_index(session)
+    rows, packed = [], []
+    for abbr in pd.unique(table['Driver']):
+        driver_index = telemetry_index.driver(abbr)
+        if driver_index is None:
+            continue
+        driver_rows = np.flatnonzero(table['Driver'].to_numpy() == abbr)
+        rows.append(driver_rows)
+        packed.append(driver_index.pack_laps('Speed', table['LapNumber'].to_numpy()[driver_rows]))
+
+    avg_speed = np.full(len(table), np.nan, dtype=np.float32)
+    top_speed = np.full(len(table), np.nan, dtype=np.float32)
+    for driver_rows, (speeds, offsets) in zip(rows, packed):
+        mean, top = lap_speed_stats(speeds, offsets)
+        avg_speed[driver_rows] = mean
+        top_speed[driver_rows] = top
+    table['AvgSpeed'] = avg_speed
+    table['TopSpeed'] = top_speed
+
+
+def build_lap_table(session, with_speeds=True):
+    """One row per lap of the session with the values the race charts need.
+
+    Times are in seconds. IsQuickLap matches Laps.pick_quicklaps applied per
+    driver. AvgSpeed/TopSpeed come from telemetry and are NaN when
+    `with_speeds` is False or a lap has no car data.
+    """
+    laps = session.laps
+    table = pd.DataFrame({
+        'Driver': _text_column(laps, 'Driver'),
+        'Team': _text_column(laps, 'Team'),
+        'LapNumber': laps['LapNumber'].to_numpy(dtype=float),
+        'Stint': laps['Stint'].to_numpy(dtype=float),
+        'Compound': _text_column(laps, 'Compound'),
+    })
+    for column in TIME_COLUMNS:
+        table[column] = laps[column].dt.total_seconds().to_numpy()
+    for column in SPEED_TRAP_COLUMNS:
+        table[column] = laps[column].to_numpy(dtype=float)
+
+    best = table.groupby('Driver')['LapTime'].transform('min')
+    table['IsQuickLap'] = (table['LapTime'] < best * Laps.QUICKLAP_THRESHOLD).to_numpy()
+
+    if with_speeds:
+        _add_speed_columns(session, table)
+    else:
+        table['AvgSpeed'] = np.full(len(table), np.nan, dtype=np.float32)
+        table['TopSpeed'] = np.full(len(table), np.nan, dtype=np.float32)
+    return table
+
+
+# Quick laps of one driver as contiguous arrays, in lap order
+DriverLaps = namedtuple('DriverLaps', ['lap_numbers', 'lap_times', 'compounds'])
+
+
+def group_quick_laps(table):
+    """Split the quick laps of a lap table by driver in one pass: {abbreviation: DriverLaps}."""
+    quick = table['IsQuickLap'].to_numpy(dtype=bool)
+    lap_numbers = table['LapNumber'].to_numpy()[quick]
+    lap_times = table['LapTime'].to_numpy()[quick]
+    compounds = table['Compound'].to_numpy()[quick]
+    groups = pd.Series(lap_times).groupby(table['Driver'].to_numpy()[quick], sort=False).indices
+    return {
+        abbr: DriverLaps(lap_numbers[rows], lap_times[rows], compounds[rows])
+        for abbr, rows in groups.items()
+    }
+
+
+# --- Persistence ---
+
+def _table_path(key):
+    return os.path.join(LAP_TABLE_DIR, f"{key}.npz")
+
+
+def _read_table(key):
+    path = _table_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            if int(f['version']) != LAP_TABLE_VERSION:
+                return None
+            columns = [name for name in f.files if name not in ('version', 'has_speeds')]
+            table = pd.DataFrame({name: f[name] for name in columns})
+            return {'table': table, 'has_speeds': bool(f['has_speeds'])}
+    except Exception as e:
+        print(f"Error reading lap table {key}: {e}")
+        return None
+
+
+def _write_table(key, table, has_speeds):
+    os.makedirs(LAP_TABLE_DIR, exist_ok=True)
+    path = _table_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    columns = {}
+    for name in table.columns:
+        values = table[name].to_numpy()
+        columns[name] = values.astype(str) if name in TEXT_COLUMNS else values
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, version=np.asarray(LAP_TABLE_VERSION), has_speeds=np.asarray(has_speeds), **columns)
+    os.replace(tmp_path, path)
+
+
+# --- Access ---
+
+_tables = OrderedDict()  # key -> {'table', 'has_speeds', 'quick_laps' once grouped}
+_tables_lock = threading.Lock()
+_table_flights = SingleFlight()
+_warming = set()
+
+
+def _remember(key, entry):
+    """Keep a table in memory unless one with speeds is already there; returns whether it was kept."""
+    with _tables_lock:
+        current = _tables.get(key)
+        if current is not None and current['has_speeds'] and not entry['has_speeds']:
+            return False
+        _tables[key] = entry
+        _tables.move_to_end(key)
+        while len(_tables) > LAP_TABLE_MEMORY_ENTRIES:
+            _tables.popitem(last=False)
+        return True
+
+
+def _load_table(key, year, event, session_type, with_speeds):
+    entry = _read_table(key)
+    if entry is None or (with_speeds and not entry['has_speeds']):
+        session = load_session(year, event, session_type, LOAD_TELEMETRY if with_speeds else LOAD_LAPS)
+        entry = {'table': build_lap_table(session, with_speeds), 'has_speeds': with_speeds}
+        # A table with speeds built meanwhile by the warm-up wins, in memory and on disk
+        if _remember(key, entry) and is_session_final(session):
+            _write_table(key, entry['table'], with_speeds)
+    else:
+        _remember(key, entry)
+
+
+def get_lap_table(year, event, session_type, with_speeds=False):
+    """Per-lap summary table of a session, from memory, disk or built on demand.
+
+    Pass `with_speeds=True` when AvgSpeed/TopSpeed are needed; a table built
+    without them is rebuilt from telemetry once. Callers must not modify the
+    returned DataFrame.
+    """
+    key = session_store_key(year, event, session_type)
+    while True:
+        with _tables_lock:
+            entry = _tables.get(key)
+            if entry is not None:
+                _tables.move_to_end(key)
+        if entry is not None and (entry['has_speeds'] or not with_speeds):
+            return entry['table']
+        # Keyed on with_speeds too: a chart that needs no speeds never waits for a telemetry warm-up
+        _table_flights.do((key, with_speeds), lambda: _load_table(key, year, event, session_type, with_speeds))
+
+
+def get_quick_laps(year, event, session_type):
+    """Quick laps of a session grouped by driver (see group_quick_laps), cached with its lap table."""
+    table = get_lap_table(year, event, session_type)
+    key = session_store_key(year, event, session_type)
+    with _tables_lock:
+        entry = _tables.get(key)
+    if entry is None or entry['table'] is not table:
+        return group_quick_laps(table)
+    if 'quick_laps' not in entry:
+        entry['quick_laps'] = group_quick_laps(table)
+    return entry['quick_laps']
+
+
+def warm_lap_table(year, event, session_type):
+    """Build the full lap table (with telemetry speeds) in the background."""
+    key = session_store_key(year, event, session_type)
+    with _tables_lock:
+        entry = _tables.get(key)
+        if (entry is not None and entry['has_speeds']) or key in _warming:
+            return
+        _warming.add(key)
+
+    def warm():
+        try:
+            get_lap_table(year, event, session_type, with_speeds=True)
+        except Exception as e:
+            print(f"Error warming lap table {key}: {e}")
+        finally:
+            with _tables_lock:
+                _warming.discard(key)
+
+    threading.Thread(target=warm, name=f"warm-{key}", daemon=True).start()
+
+
+def _after_fork_in_child():
+    """A forked background job must not inherit a lock or warm-up held by a parent thread."""
+    global _tables_lock, _warming
+    _tables_lock = threading.Lock()
+    _warming = set()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,231 @@
+# In utils/lap_tensor.py
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import (
+    CACHE_DIR, LOAD_TELEMETRY, SingleFlight, get_roster, is_session_final, load_session, session_store_key,
+)
+from utils.telemetry import get_fastest_lap_telemetry
+
+
+# Per-session fastest-lap tensors live next to the FastF1 cache
+LAP_TENSOR_DIR = os.path.join(CACHE_DIR, 'tensors')
+
+# Bump when channels, grid or their meaning change so stale files are rebuilt
+LAP_TENSOR_VERSION = 1
+
+# Spacing of the distance grid in metres (about 3x denser than 4 Hz car data at corner speeds)
+TENSOR_GRID_STEP = 5.0
+
+# Number of tensors kept open in memory
+LAP_TENSOR_MEMORY_ENTRIES = 16
+
+TENSOR_CHANNELS = ('Time', 'Speed', 'Throttle', 'Brake', 'nGear', 'RPM', 'X', 'Y')
+
+# Discrete channels take the last sample instead of being interpolated
+STEP_CHANNELS = frozenset({'Brake', 'nGear'})
+
+
+class LapTensor:
+    """Fastest lap of every driver in a session resampled onto one distance grid.
+
+    `values` is a float32 array of shape drivers x grid points x channels
+    (possibly a read-only memmap). Points past a driver's lap distance are NaN.
+    Per-driver metadata: `lap_distance`, `lap_time` and cumulative
+    `sector_times` (S1, S1+S2, lap) in seconds, NaN when missing.
+    """
+
+    def __init__(self, drivers, values, lap_distance, lap_time, sector_times, step=TENSOR_GRID_STEP):
+        self.drivers = list(drivers)
+        self.values = values
+        self.lap_distance = np.asarray(lap_distance, dtype=float)
+        self.lap_time = np.asarray(lap_time, dtype=float)
+        self.sector_times = np.asarray(sector_times, dtype=float).reshape(len(self.drivers), 3)
+        self.step = float(step)
+        self.distance = (np.arange(values.shape[1]) * self.step).astype(np.float32)
+        self._rows = {abbr: i for i, abbr in enumerate(self.drivers)}
+        self._channels = {name: i for i, name in enumerate(TENSOR_CHANNELS)}
+
+    def __contains__(self, abbr):
+        return abbr in self._rows
+
+    def rows(self, drivers):
+        """Row indices of the given drivers that are in the tensor, in the given order."""
+        return [self._rows[d] for d in drivers if d in self._rows]
+
+    def channel(self, name, rows=None):
+        """2D view (drivers x grid points) of one channel, optionally for selected rows."""
+        values = self.values[:, :, self._channels[name]]
+        return values if rows is None else values[rows]
+
+    def last_index(self, rows=None):
+        """Index of the last grid point inside each driver's lap."""
+        lap_distance = self.lap_distance if rows is None else self.lap_distance[rows]
+        return np.searchsorted(self.distance, lap_distance, side='right') - 1
+
+    def driver_channel(self, abbr, name):
+        """One driver's channel up to the end of their lap, with the matching distances."""
+        row = self._rows[abbr]
+        n_points = int(self.last_index([row])[0]) + 1
+        return self.distance[:n_points], self.values[row, :n_points, self._channels[name]]
+
+
+def _resample(distance, values, grid, step_channel):
+    if step_channel:
+        idx = np.clip(np.searchsorted(distance, grid, side='right') - 1, 0, len(distance) - 1)
+        return values[idx]
+    return np.interp(grid, distance, values)
+
+
+def build_lap_tensor(session):
+    """Build the LapTensor of a session loaded with telemetry."""
+    roster = get_roster(session)
+    extracted = get_fastest_lap_telemetry(session, roster.abbreviations, ('X', 'Y'))
+
+    drivers, samples, lap_time, sector_times = [], [], [], []
+    for abbr, fastest, telemetry in extracted:
+        distance = telemetry['Distance'].to_numpy(dtype=float)
+        lap_clock = telemetry['Time'].dt.total_seconds().to_numpy()
+        # Edge samples can lack a distance or time when the lap is cut out of the session data
+        valid = ~(np.isnan(distance) | np.isnan(lap_clock))
+        if valid.sum() < 2:
+            continue
+        # Measure every lap from the timing line so drivers line up on the grid
+        distance = distance[valid] - distance[valid][0]
+        channels = {'Time': lap_clock[valid]}
+        for name in TENSOR_CHANNELS[1:]:
+            if name in telemetry.columns:
+                channels[name] = telemetry[name].to_numpy(dtype=float)[valid]
+        drivers.append(abbr)
+        samples.append((distance, channels))
+        lap_time.append(fastest['LapTime'].total_seconds() if pd.notna(fastest['LapTime']) else np.nan)
+        sectors = [fastest[f"Sector{i}Time"] for i in (1, 2, 3)]
+        sectors = [s.total_seconds() if pd.notna(s) else np.nan for s in sectors]
+        sector_times.append(np.cumsum(sectors))
+
+    lap_distance = np.array([distance[-1] for distance, _ in samples])
+    n_points = int(np.floor(lap_distance.max() / TENSOR_GRID_STEP)) + 1 if len(samples) else 0
+    grid = np.arange(n_points) * TENSOR_GRID_STEP
+
+    values = np.full((len(drivers), n_points, len(TENSOR_CHANNELS)), np.nan, dtype=np.float32)
+    for row, (distance, channels) in enumerate(samples):
+        inside = grid <= distance[-1]
+        for col, name in enumerate(TENSOR_CHANNELS):
+            if name in channels:
+                values[row, inside, col] = _resample(distance, channels[name], grid[inside], name in STEP_CHANNELS)
+
+    return LapTensor(drivers, values, lap_distance, lap_time, np.reshape(sector_times, (-1, 3)))
+
+
+# --- Persistence ---
+# The tensor is a plain .npy file so it can be memory-mapped; metadata sits in a small .npz.
+
+def _tensor_paths(key):
+    return os.path.join(LAP_TENSOR_DIR, f"{key}.npy"), os.path.join(LAP_TENSOR_DIR, f"{key}.meta.npz")
+
+
+def _read_tensor(key):
+    values_path, meta_path = _tensor_paths(key)
+    if not (os.path.exists(values_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with np.load(meta_path, allow_pickle=False) as meta:
+            if int(meta['version']) != LAP_TENSOR_VERSION:
+                return None
+            values = np.load(values_path, mmap_mode='r')
+            return LapTensor(meta['drivers'].tolist(), values, meta['lap_distance'], meta['lap_time'],
+                             meta['sector_times'], float(meta['step']))
+    except Exception as e:
+        print(f"Error reading lap tensor {key}: {e}")
+        return None
+
+
+def _write_tensor(key, tensor):
+    os.makedirs(LAP_TENSOR_DIR, exist_ok=True)
+    values_path, meta_path = _tensor_paths(key)
+    tmp_suffix = f".{os.getpid()}.tmp"
+    with open(values_path + tmp_suffix, 'wb') as f:
+        np.save(f, np.ascontiguousarray(tensor.values, dtype=np.float32))
+    with open(meta_path + tmp_suffix, 'wb') as f:
+        np.savez(
+            f,
+            version=np.asarray(LAP_TENSOR_VERSION),
+            drivers=np.asarray(tensor.drivers, dtype=str),
+            lap_distance=tensor.lap_distance,
+            lap_time=tensor.lap_time,
+            sector_times=tensor.sector_times,
+            step=np.asarray(tensor.step),
+        )
+    # Values first: a meta file always points at a complete tensor
+    os.replace(values_path + tmp_suffix, values_path)
+    os.replace(meta_path + tmp_suffix, meta_path)
+
+
+# --- Access ---
+
+_tensors = OrderedDict()  # key -> LapTensor
+_tensors_lock = threading.Lock()
+_tensor_flights = SingleFlight()
+_warming = set()
+
+
+def _load_tensor(key, year, event, session_type):
+    tensor = _read_tensor(key)
+    if tensor is None:
+        session = load_session(year, event, session_type, LOAD_TELEMETRY)
+        tensor = build_lap_tensor(session)
+        if is_session_final(session):
+            _write_tensor(key, tensor)
+            # Serve the memory-mapped copy so the built array can be freed
+            tensor = _read_tensor(key) or tensor
+    with _tensors_lock:
+        _tensors[key] = tensor
+        while len(_tensors) > LAP_TENSOR_MEMORY_ENTRIES:
+            _tensors.popitem(last=False)
+    return tensor
+
+
+def get_lap_tensor(year, event, session_type):
+    """Fastest-lap LapTensor of a session, from memory, disk or built on demand."""
+    key = session_store_key(year, event, session_type)
+    with _tensors_lock:
+        tensor = _tensors.get(key)
+        if tensor is not None:
+            _tensors.move_to_end(key)
+            return tensor
+    return _tensor_flights.do(key, lambda: _load_tensor(key, year, event, session_type))
+
+
+def warm_lap_tensor(year, event, session_type):
+    """Build the session's LapTensor in the background."""
+    key = session_store_key(year, event, session_type)
+    with _tensors_lock:
+        if key in _tensors or key in _warming:
+            return
+        _warming.add(key)
+
+    def warm():
+        try:
+            get_lap_tensor(year, event, session_type)
+        except Exception as e:
+            print(f"Error warming lap tensor {key}: {e}")
+        finally:
+            with _tensors_lock:
+                _warming.discard(key)
+
+    threading.Thread(target=warm, name=f"warm-tensor-{key}", daemon=True).start()
+
+
+def _after_fork_in_child():
+    """A forked background job must not inherit a lock or warm-up held by a parent thread."""
+    global _tensors_lock, _warming
+    _tensors_lock = threading.Lock()
+    _warming = set()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
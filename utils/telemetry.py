@@ -0,0 +1,306 @@
+# In utils/telemetry.py
+
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.data_loader import get_roster, memoize_on_session
+
+
+# Channels that only exist in position data; everything else comes from car data
+POSITION_CHANNELS = frozenset({'X', 'Y', 'Z', 'Status'})
+
+# Size of the process-wide pool used for per-driver telemetry extraction
+TELEMETRY_WORKERS = int(os.environ.get('TELEMETRY_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Delta chart resolutions (points along the lap) offered in the UI. The lap tensor
+# samples a lap every 5 m, about 700-1400 points, so finer resolutions would only interpolate
+DELTA_RESOLUTIONS = (250, 500, 1000)
+DEFAULT_DELTA_RESOLUTION = 500
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _after_fork_in_child():
+    """Drop the parent's pool: its threads do not exist in a forked background job."""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _get_executor():
+    # Created on first use so it is never inherited across a gunicorn fork
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TELEMETRY_WORKERS, thread_name_prefix='telemetry')
+        return _executor
+
+
+def map_parallel(fn, items):
+    """Apply `fn` to every item on the shared worker pool, returning results in input order.
+
+    All requests share one bounded pool, so concurrent users queue for
+    workers instead of each spawning their own. Must not be called from
+    inside a pool task.
+    """
+    items = list(items)
+    if TELEMETRY_WORKERS <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(_get_executor().map(fn, items))
+
+
+def get_lap_telemetry(lap, channels=None):
+    """Get telemetry for a single lap containing at least the requested channels.
+
+    Car data channels (Speed, Throttle, Brake, RPM, nGear, DRS) plus Distance
+    and Time are returned straight from the car data. Position data is only
+    merged in when X/Y/Z/Status are requested, and FastF1's driver-ahead
+    calculation (the most expensive part of Lap.get_telemetry) is skipped.
+    """
+    channels = set(channels or ())
+
+    if channels & POSITION_CHANNELS:
+        # Same merge as Lap.get_telemetry, minus DriverAhead/RelativeDistance
+        car_data = lap.get_car_data(pad=1, pad_side='both').add_distance()
+        pos_data = lap.get_pos_data(pad=1, pad_side='both')
+        return pos_data.merge_channels(car_data).slice_by_lap(lap, interpolate_edges=True)
+
+    return lap.get_car_data(interpolate_edges=True).add_distance()
+
+
+def get_fastest_lap_telemetry(session, drivers, channels=None):
+    """Fastest lap and its telemetry for each driver, extracted on the shared worker pool.
+
+    Returns a list of (abbreviation, fastest_lap, telemetry) in the order of
+    `drivers`, skipping drivers without a usable lap or telemetry.
+    """
+    roster = get_roster(session)
+
+    def extract(d_abbr):
+        if roster.get(d_abbr) is None:
+            return None
+        laps = session.laps.pick_drivers(d_abbr)
+        if laps.empty:
+            return None
+        fastest = laps.pick_fastest()
+        if fastest is None or fastest.empty:
+            return None
+        telemetry = get_lap_telemetry(fastest, channels)
+        if telemetry.empty:
+            return None
+        return d_abbr, fastest, telemetry
+
+    return [result for result in map_parallel(extract, drivers) if result is not None]
+
+
+# --- Session-wide telemetry slicing index ---
+
+class DriverTelemetryIndex:
+    """Car data of one driver as plain arrays, with each lap located by sample offsets.
+
+    A lap's samples are the half-open range [start, end) of the sorted
+    SessionTime array, so lap data is a zero-copy view. Per-lap aggregates
+    are computed from pack_laps output by utils.aero.lap_speed_stats.
+    """
+
+    def __init__(self, car_data, laps):
+        self._car_data = car_data
+        self._arrays = {}  # channel -> float array
+        self.session_time = car_data['SessionTime'].dt.total_seconds().to_numpy()
+
+        laps = laps.sort_values('LapStartTime')
+        lap_start = laps['LapStartTime'].dt.total_seconds().to_numpy()
+        lap_end = laps['Time'].dt.total_seconds().to_numpy()
+        valid = ~(np.isnan(lap_start) | np.isnan(lap_end))
+
+        starts = np.searchsorted(self.session_time, np.where(valid, lap_start, 0), side='left')
+        ends = np.searchsorted(self.session_time, np.where(valid, lap_end, 0), side='left')
+        # Laps are sequential: keep ranges non-overlapping and empty for laps without timing
+        if len(starts):
+            starts = np.maximum(starts, np.concatenate(([0], np.maximum.accumulate(ends)[:-1])))
+        ends = np.where(valid, np.maximum(ends, starts), starts)
+
+        self.lap_numbers = laps['LapNumber'].to_numpy()
+        self.lap_starts = starts
+        self.lap_ends = ends
+        self._lap_rows = {n: i for i, n in enumerate(self.lap_numbers)}
+
+    def channel(self, channel):
+        """All samples of a channel for this driver."""
+        arr = self._arrays.get(channel)
+        if arr is None:
+            arr = self._car_data[channel].to_numpy(dtype=float)
+            self._arrays[channel] = arr
+        return arr
+
+    def lap_slice(self, lap_number):
+        row = self._lap_rows.get(lap_number)
+        if row is None:
+            return slice(0, 0)
+        return slice(self.lap_starts[row], self.lap_ends[row])
+
+    def pack_laps(self, channel, lap_numbers, dtype=np.float32):
+        """Samples of several laps concatenated into one compact array.
+
+        Returns (values, offsets) where lap i is values[offsets[i]:offsets[i + 1]];
+        unknown laps are empty. Cheap to pickle for worker processes.
+        """
+        slices = [self.lap_slice(n) for n in lap_numbers]
+        values = self.channel(channel)
+        packed = np.concatenate([values[s] for s in slices] or [values[:0]]).astype(dtype)
+        offsets = np.concatenate(([0], np.cumsum([s.stop - s.start for s in slices]))).astype(np.int64)
+        return packed, offsets
+
+
+class SessionTelemetryIndex:
+    """Per-driver telemetry indexes for a session, built lazily on first access."""
+
+    def __init__(self, session):
+        # Weak reference: this index is itself cached on the session
+        self._session = weakref.ref(session)
+        self._drivers = {}
+        self._lock = threading.Lock()
+
+    def driver(self, identifier):
+        """DriverTelemetryIndex for a driver abbreviation or number, or None without data."""
+        session = self._session()
+        info = get_roster(session).get(identifier) if session is not None else None
+        if info is None:
+            return None
+        with self._lock:
+            index = self._drivers.get(info.number)
+            if index is None:
+                car_data = session.car_data.get(info.number)
+                if car_data is None or car_data.empty:
+                    return None
+                laps = session.laps.pick_drivers(info.number)
+                index = DriverTelemetryIndex(car_data, laps)
+                self._drivers[info.number] = index
+        return index
+
+
+def get_telemetry_index(session):
+    """Telemetry slicing index for a session loaded with telemetry, cached per session."""
+    return memoize_on_session(session, 'telemetry_index', lambda: SessionTelemetryIndex(session))
+
+
+# --- Delta engine ---
+
+def _hat_basis(x, xp):
+    """Piecewise-linear basis: row k is np.interp(x, xp, e_k), so fp @ basis interpolates each row of fp."""
+    return np.stack([np.interp(x, xp, unit) for unit in np.eye(len(xp))])
+
+
+def interp_grid_rows(grid_step, values, distances, last):
+    """Linear interpolation of every row of `values` (on a uniform distance grid) at `distances`.
+
+    Matches np.interp per row, holding each row at its last valid grid index
+    `last` (one index shared by all rows, or one per row).
+    """
+    position = np.asarray(distances, dtype=float) / grid_step
+    if np.ndim(last) == 0:
+        left = np.minimum(np.floor(position).astype(np.int64), last)
+        right = np.minimum(left + 1, last)
+        weight = position - left
+        # np.take is much faster than fancy indexing along the last axis
+        result = np.take(values, left, axis=1)
+        result += (np.take(values, right, axis=1) - result) * weight
+        return result
+
+    last = np.asarray(last)[:, None]
+    position = np.minimum(position[None, :], last)
+    left = np.floor(position).astype(np.int64)
+    right = np.minimum(left + 1, last)
+    weight = position - left
+    result = np.take_along_axis(values, left, axis=1).astype(float)
+    result += (np.take_along_axis(values, right, axis=1) - result) * weight
+    return result
+
+
+def compute_lap_deltas(grid_step, times, lap_distance, lap_time, sector_times, ref, n_points=DEFAULT_DELTA_RESOLUTION):
+    """Sector-corrected time delta of every driver to a reference lap, all drivers at once.
+
+    `times` holds each driver's lap clock on a uniform distance grid with
+    `grid_step` metres spacing (drivers x grid points, NaN past the lap end);
+    `lap_distance`, `lap_time` and cumulative `sector_times` (drivers x 3) are
+    per driver and `ref` is the reference row. The raw delta is corrected
+    piecewise-linearly so it equals the official S1, S2 and lap time gaps at
+    the reference's sector boundaries; drivers without sector times get a
+    linear correction to the lap time gap only.
+
+    `n_points` is capped at the number of grid points of the common lap.
+
+    Returns (common_distance, deltas of shape drivers x n_points, sector_distances).
+    """
+    times = np.asarray(times, dtype=float)
+    lap_time = np.asarray(lap_time, dtype=float)
+    sector_times = np.asarray(sector_times, dtype=float)
+    n_valid = np.minimum(np.floor(np.asarray(lap_distance) / grid_step).astype(np.int64) + 1, times.shape[1])
+
+    # Compare up to the shortest lap, so every driver has data on the whole common grid
+    last = int(n_valid.min()) - 1
+    n_points = min(n_points, last + 1)
+    common_distance = np.linspace(0, last * grid_step, n_points)
+    driver_times = interp_grid_rows(grid_step, times, common_distance, last)
+    raw_delta = driver_times[ref] - driver_times
+
+    # Sector boundary distances: where the reference's lap clock reaches each official sector time
+    ref_clock = times[ref, :n_valid[ref]]
+    sector_distances = {}
+    ref_sectors = sector_times[ref]
+    if not np.isnan(ref_sectors).any():
+        for name, sector_time in zip(('S1', 'S2', 'S3'), ref_sectors):
+            idx = np.searchsorted(ref_clock, sector_time)
+            if idx < len(ref_clock):
+                sector_distances[name] = idx * grid_step
+
+    # Knots: lap start, sector boundaries and lap end, with the official gap expected at each
+    knot_distances = [0.0]
+    expected = [np.zeros(len(times))]
+    for i, name in enumerate(('S1', 'S2')):
+        if name in sector_distances:
+            knot_distances.append(sector_distances[name])
+            expected.append(sector_times[:, i] - ref_sectors[i])
+    knot_distances.append(common_distance[-1])
+    expected.append(lap_time - lap_time[ref])
+    order = np.argsort(knot_distances, kind='stable')
+    knot_idx = np.minimum(np.searchsorted(common_distance, np.asarray(knot_distances)[order]), n_points)
+    expected = np.column_stack(expected)[:, order]
+
+    corrections = expected - raw_delta[:, np.minimum(knot_idx, n_points - 1)]
+
+    # Each segment ramps from its start knot to the next knot over its own samples,
+    # and the final sample takes the last knot's correction
+    xp, columns = [], []
+    for k in range(len(knot_idx) - 1):
+        start, end = knot_idx[k], knot_idx[k + 1]
+        if end > start:
+            xp.append(start)
+            columns.append(k)
+            if end - 1 > start:
+                xp.append(end - 1)
+                columns.append(k + 1)
+    xp.append(n_points - 1)
+    columns.append(len(knot_idx) - 1)
+    xp = np.asarray(xp, dtype=float)
+    # Knots may coincide at the lap end; the later one wins there
+    xp, keep = np.unique(xp[::-1], return_index=True)
+    columns = np.asarray(columns[::-1])[keep]
+    correction = corrections[:, columns] @ _hat_basis(np.arange(n_points, dtype=float), xp)
+
+    # Drivers without sector times: linear ramp to the lap time gap
+    no_sectors = np.isnan(sector_times).any(axis=1) | (len(sector_distances) == 0)
+    if no_sectors.any():
+        ramp = np.linspace(0.0, 1.0, n_points)
+        final_gap = (lap_time - lap_time[ref]) - raw_delta[:, -1]
+        correction[no_sectors] = final_gap[no_sectors, None] * ramp
+
+    return common_distance, raw_delta + correction, sector_distances
@@ -0,0 +1,311 @@
+# In utils/visuals.py
+
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+
+# Secondary team colors - distinct colors that don't clash with other teams
+SECONDARY_TEAM_COLORS = {
+    'Red Bull Racing': '#FFD700',       # Gold
+    'Red Bull': '#FFD700',              # Gold
+    'Ferrari': '#FFF200',               # Yellow
+    'Mercedes': '#00A19C',              # Petronas Teal variant
+    'McLaren': '#47C7FC',               # Cyan/Light Blue
+    'Aston Martin': '#00594F',          # Dark Teal
+    'Alpine': '#FF87BC',                # Pink
+    'Williams': '#64C4FF',              # Light Blue
+    'Haas F1 Team': '#B6BABD',          # Silver
+    'MoneyGram Haas F1 Team': '#B6BABD',
+    'RB': '#1E5BC6',                    # Different Blue
+    'Kick Sauber': '#00E701',           # Bright Green
+    'Sauber': '#00E701',
+    'Alfa Romeo': '#4CBB17',            # Kelly Green
+    'AlphaTauri': '#4E7C9B',            # Steel Blue
+}
+
+
+def get_secondary_color(team_name):
+    """Get secondary color for a team."""
+    for team_key, sec_color in SECONDARY_TEAM_COLORS.items():
+        if team_key.lower() in team_name.lower() or team_name.lower() in team_key.lower():
+            return sec_color
+    return '#FFFF00'  # Yellow as fallback
+
+
+# --- Figure factory ---
+# Charts are plain dict figures built on the shared layouts below. Dash serializes
+# dicts directly, skipping the validation go.Figure runs on every trace and update.
+
+GRID_COLOR = 'rgba(255,255,255,0.1)'
+TITLE_FONT = dict(color='white', size=20)
+
+# Axis styling shared by every chart
+DARK_AXIS = dict(
+    color='white',
+    gridcolor=GRID_COLOR,
+    linecolor='white',
+    tickfont=dict(color='white'),
+    title=dict(font=dict(color='white')),
+)
+
+# Plotly's default template, which go.Figure would attach to every figure
+_BASE_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
+
+# Layout every chart starts from: transparent background, white axes and legend text
+DARK_LAYOUT = dict(
+    template=_BASE_TEMPLATE,
+    showlegend=True,
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    xaxis=DARK_AXIS,
+    yaxis=DARK_AXIS,
+    legend=dict(font=dict(color='white'), title=dict(font=dict(color='white'))),
+)
+
+# Layout of placeholder figures (nothing sketched yet, messages and errors)
+EMPTY_LAYOUT = dict(
+    template=_BASE_TEMPLATE,
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    xaxis=dict(color='white', gridcolor=GRID_COLOR, linecolor='white', rangemode='tozero'),
+    yaxis=dict(color='white', gridcolor=GRID_COLOR, linecolor='white', rangemode='tozero'),
+    font=dict(color='white'),
+)
+
+# Scatter rendering: 'auto' switches a figure to WebGL above WEBGL_POINT_THRESHOLD points
+RENDER_MODES = ('auto', 'svg', 'webgl')
+WEBGL_POINT_THRESHOLD = 5000
+
+# Validate the shared layouts once at import instead of on every figure
+go.Layout(DARK_LAYOUT)
+go.Layout(EMPTY_LAYOUT)
+
+
+# plotly.js typed-array codes for the NumPy dtypes charts send
+_TYPED_ARRAY_CODES = {
+    'float64': 'f8', 'float32': 'f4', 'int32': 'i4', 'int16': 'i2', 'int8': 'i1',
+    'uint32': 'u4', 'uint16': 'u2', 'uint8': 'u1',
+}
+
+
+def encode_arrays(props):
+    """Copy of a trace dict with 1D numeric NumPy arrays as base64 typed arrays, as go.Figure sends them."""
+    encoded = {}
+    for key, value in props.items():
+        if isinstance(value, dict):
+            value = encode_arrays(value)
+        elif isinstance(value, np.ndarray) and value.ndim == 1 and value.size:
+            if value.dtype == np.int64:
+                # plotly.js has no 64-bit integers: use the smallest type that holds the values
+                for int_type in (np.int8, np.int16, np.int32):
+                    if np.iinfo(int_type).min <= value.min() and value.max() <= np.iinfo(int_type).max:
+                        value = value.astype(int_type)
+                        break
+            code = _TYPED_ARRAY_CODES.get(str(value.dtype))
+            if code is not None:
+                value = {'dtype': code, 'bdata': base64.b64encode(np.ascontiguousarray(value)).decode('ascii')}
+        encoded[key] = value
+    return encoded
+
+
+def _merge(base, overrides):
+    """Copy of `base` with `overrides` applied, merging nested dicts instead of replacing them."""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def use_webgl(n_points, render_mode):
+    """Whether a figure with `n_points` scatter points is drawn with WebGL under `render_mode`."""
+    if render_mode == 'webgl':
+        return True
+    if render_mode == 'svg':
+        return False
+    return n_points > WEBGL_POINT_THRESHOLD
+
+
+def _use_webgl(traces, render_mode):
+    points = sum(len(trace.get('x', ())) for trace in traces if trace.get('type') == 'scatter')
+    return use_webgl(points, render_mode)
+
+
+def empty_figure(title=""):
+    """Placeholder figure showing only a title."""
+    return {'data': [], 'layout': _merge(EMPTY_LAYOUT, {'title': {'text': title}})}
+
+
+def make_figure(data, title, xaxis_title=None, yaxis_title=None, legend_title=None, render_mode='auto', **layout):
+    """Dict figure on the dark layout; `layout` entries are merged into it.
+
+    Traces are plain dicts with a 'type' key, e.g. dict(type='scatter', x=..., y=...);
+    their NumPy arrays are sent in binary form. Plotly's underscore shorthands
+    (line_color, title_font, ...) are not expanded, so spell nested
+    properties out as dicts. Untouched layout parts are shared with the
+    template: replace them rather than modifying them in place.
+
+    `render_mode` (one of RENDER_MODES) decides whether scatter traces are
+    drawn as SVG or WebGL. All of a figure's scatter traces switch together,
+    since WebGL traces are always drawn above SVG ones.
+    """
+    overrides = {'title': {'text': title, 'font': TITLE_FONT}}
+    if xaxis_title is not None:
+        overrides['xaxis'] = {'title': {'text': xaxis_title}}
+    if yaxis_title is not None:
+        overrides['yaxis'] = {'title': {'text': yaxis_title}}
+    if legend_title is not None:
+        overrides['legend'] = {'title': {'text': legend_title}}
+    data = list(data)
+    if _use_webgl(data, render_mode):
+        data = [dict(trace, type='scattergl') if trace.get('type') == 'scatter' else trace for trace in data]
+    return {'data': [encode_arrays(trace) for trace in data], 'layout': _merge(_merge(DARK_LAYOUT, overrides), layout)}
+
+
+# --- Incremental updates ---
+# A figure with one trace per driver is tracked as the list of drivers it plots, in
+# trace order. Changing the selection deletes and appends traces with a dash.Patch
+# instead of sending the whole figure again.
+
+def teammate_dashes(teams):
+    """Line dash of each trace given its team: solid for a team's first driver, dashed after."""
+    seen = set()
+    dashes = []
+    for team in teams:
+        dashes.append('dash' if team in seen else 'solid')
+        seen.add(team)
+    return dashes
+
+
+def patched_order(plotted, selected):
+    """Keys plotted after patching from `plotted` to `selected`: kept ones in place, then added ones."""
+    selected_set, plotted_set = set(selected), set(plotted)
+    kept = [key for key in plotted if key in selected_set]
+    return kept + [key for key in selected if key not in plotted_set]
+
+
+def patch_keyed_list(patched, plotted, selected, added_items):
+    """Delete the entries of keys no longer selected from a patched list and append `added_items`.
+
+    `patched` is a Patch location holding one entry per key of `plotted`
+    (e.g. patch['data']); `added_items` are the entries of the keys
+    `patched_order` puts at the end, in that order.
+    """
+    selected_set = set(selected)
+    removed = [i for i, key in enumerate(plotted) if key not in selected_set]
+    # From the end so earlier indices stay valid
+    for i in reversed(removed):
+        del patched[i]
+    for item in added_items:
+        patched.append(item)
+
+
+# --- Beeswarm layout ---
+
+# Candidate slots tried for a point, in multiples of the point radius: centre first, then alternating outwards
+BEESWARM_SLOTS = (0, -1, 1, -2, 2, -3, 3, -4, 4, -5, 5)
+
+
+def beeswarm_offsets(values, point_radius=0.03, tolerance_fraction=0.015):
+    """Deterministic horizontal offsets that spread points with similar values side by side.
+
+    Points are placed from the smallest value up. A point's neighbours are the
+    already placed points whose value is less than `tolerance_fraction` of the
+    value range below it; it takes the first slot in BEESWARM_SLOTS that is not
+    next to a neighbour's slot, or when all are taken the slot holding the
+    fewest neighbours. Runs in O(n log n): one sort plus a sliding window of slot
+    counts. Returns offsets in the input order.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    tolerance = (np.ptp(sorted_values) if n > 1 else 1) * tolerance_fraction
+    # First placed point inside each point's window
+    window_start = np.searchsorted(sorted_values, sorted_values - tolerance, side='right').tolist()
+
+    span = max(abs(s) for s in BEESWARM_SLOTS)
+    occupied = [0] * (2 * span + 3)  # slot counts inside the window, padded by one on each side
+    slots = [0] * n
+    left = 0
+    for i in range(n):
+        while left < min(window_start[i], i):
+            occupied[slots[left] + span + 1] -= 1
+            left += 1
+        for slot in BEESWARM_SLOTS:
+            k = slot + span + 1
+            if not (occupied[k - 1] or occupied[k] or occupied[k + 1]):
+                break
+        else:
+            slot = min(BEESWARM_SLOTS, key=lambda s: occupied[s + span + 1])
+        slots[i] = slot
+        occupied[slot + span + 1] += 1
+
+    offsets = np.empty(n)
+    offsets[order] = np.asarray(slots) * point_radius
+    return offsets
+
+
+# --- Downsampling ---
+
+def lttb_rows(x, values, lengths, n_out):
+    """Largest-Triangle-Three-Buckets indices for several series sharing one x axis.
+
+    Row i of `values` holds a series over x[:lengths[i]]. Returns one sorted
+    index array per row with at most `n_out` points, always keeping the first
+    and last; rows that already fit are returned whole. The bucket sweep is
+    sequential, but each step handles all rows at once.
+    """
+    x = np.asarray(x, dtype=float)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    result = [np.arange(n) for n in lengths]
+    rows = np.flatnonzero((lengths > n_out) & (n_out >= 3))
+    if len(rows) == 0:
+        return result
+
+    values = np.asarray(values, dtype=float)[rows]
+    n = lengths[rows]
+    n_buckets = n_out - 2
+    # Interior points 1..n-2 split into n_buckets ranges [edges[:, b], edges[:, b + 1])
+    edges = (np.arange(n_buckets + 1)[None, :] * (n[:, None] - 2)) // n_buckets + 1
+    sizes = np.diff(edges, axis=1)
+
+    # Average point of every bucket; the last bucket looks ahead to the final point
+    row_index = np.arange(len(rows))[:, None]
+    cumulative_x = np.concatenate(([0.0], np.cumsum(x)))
+    cumulative_y = np.concatenate((np.zeros((len(rows), 1)), np.nancumsum(values, axis=1)), axis=1)
+    mean_x = (cumulative_x[edges[:, 1:]] - cumulative_x[edges[:, :-1]]) / sizes
+    mean_y = (cumulative_y[row_index, edges[:, 1:]] - cumulative_y[row_index, edges[:, :-1]]) / sizes
+    next_x = np.column_stack((mean_x[:, 1:], x[n - 1]))
+    next_y = np.column_stack((mean_y[:, 1:], values[np.arange(len(rows)), n - 1]))
+
+    # Bucket members padded to the largest bucket, masked where past the bucket end
+    offsets = np.arange(sizes.max())
+    members = edges[:, :-1, None] + offsets
+    valid = offsets < sizes[:, :, None]
+    members = np.minimum(members, (n - 1)[:, None, None])
+    member_x = x[members]
+    member_y = values[row_index[:, :, None], members]
+
+    selected = np.empty((len(rows), n_out), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[np.arange(len(rows)), -1] = n - 1
+    anchor = np.zeros(len(rows), dtype=np.int64)
+    rows_range = np.arange(len(rows))
+    for b in range(n_buckets):
+        anchor_x = x[anchor][:, None]
+        anchor_y = values[rows_range, anchor][:, None]
+        area = np.abs((anchor_x - next_x[:, b, None]) * (member_y[:, b] - anchor_y)
+                      - (anchor_x - member_x[:, b]) * (next_y[:, b, None] - anchor_y))
+        area = np.where(valid[:, b] & ~np.isnan(area), area, -1.0)
+        anchor = members[rows_range, b, area.argmax(axis=1)]
+        selected[:, b + 1] = anchor
+
+    for row, indices in zip(rows, selected):
+        result[row] = indices
+    return result